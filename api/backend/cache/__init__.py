@@ -0,0 +1,195 @@
+#------------------------------------------------------------
+# Response cache for read-mostly GET endpoints.
+#
+# A view opts in with @response_cache.cached(tags=...). The JSON
+# body of a 200 response is stored under the request path + query
+# string, together with a set of entity tags ("template:12",
+# "client:3:program", ...). Write routes call
+# response_cache.invalidate(...) with the tags they touched after
+# committing, which drops exactly the entries built from that data.
+#
+# A reader that computes a value from the database before storing it
+# can pass generations=response_cache.generations(tags), taken before
+# its query: invalidate() bumps a generation per tag, and set() drops
+# the fresh entry again if any of them moved meanwhile, so a write that
+# commits during the query can't leave its old result behind.
+# @cached views name their tags only once the body exists, so they
+# snapshot ANY_TAG instead, which every invalidate() bumps as well: a
+# fill that overlaps any invalidation is dropped (the next request
+# refills it), never one that overlaps none.
+#
+# Backends:
+#   memory  in-process LRU with TTL (default; per worker process)
+#   redis   shared Redis-compatible server at REDIS_URL
+#   none    caching disabled
+#------------------------------------------------------------
+import hashlib
+import os
+import threading
+from functools import wraps
+
+from flask import current_app, make_response, request
+
+from .memory import MemoryCache
+from .redis_backend import RedisCache
+
+
+# a generation only has to outlive the reads that started before it moved
+GENERATION_TTL = 600
+
+# the parent of every tag: its generation moves on every invalidate()
+ANY_TAG = '*'
+
+
+def _generation_key(tag):
+    return f'generation:{tag}'
+
+
+class ResponseCache:
+    def __init__(self):
+        self.backend = None
+        self.default_ttl = 60
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def init_app(self, app, backend=None):
+        """Pick the backend from config, or use `backend` (e.g. a test stand-in)."""
+        app.config.setdefault('RESPONSE_CACHE_BACKEND', 'memory')
+        app.config.setdefault('RESPONSE_CACHE_TTL', 60)
+        app.config.setdefault('RESPONSE_CACHE_MAX_ENTRIES', 1024)
+        app.config.setdefault('REDIS_URL', 'redis://localhost:6379/0')
+
+        self.default_ttl = int(app.config['RESPONSE_CACHE_TTL'])
+        if backend is not None:
+            self.backend = backend
+            return
+
+        kind = app.config['RESPONSE_CACHE_BACKEND'].lower()
+        if kind == 'memory':
+            self.backend = MemoryCache(int(app.config['RESPONSE_CACHE_MAX_ENTRIES']), self.default_ttl)
+        elif kind == 'redis':
+            self.backend = RedisCache.from_url(app.config['REDIS_URL'], default_ttl=self.default_ttl)
+        elif kind == 'none':
+            self.backend = None
+        else:
+            raise ValueError(f'unknown RESPONSE_CACHE_BACKEND {kind!r}')
+
+    # ---------------------------------------------------------
+    # raw access
+    # ---------------------------------------------------------
+    def get(self, key):
+        if self.backend is None:
+            return None
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            # a cache outage must never take the API down with it
+            current_app.logger.warning(f'response cache get failed: {e}')
+            value = None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value, tags=(), ttl=None, generations=None):
+        if self.backend is None:
+            return
+        try:
+            self.backend.set(key, value, tags=tags, ttl=ttl)
+            # checked after storing: an invalidate() either shows up here
+            # or runs later and removes the entry itself
+            if generations is not None and self.generations(generations) != generations:
+                self.backend.delete(key)
+        except Exception as e:
+            current_app.logger.warning(f'response cache set failed: {e}')
+
+    def generations(self, tags):
+        """{tag: current generation} to pass to a later set()."""
+        if self.backend is None:
+            return {}
+        return {tag: self.backend.get(_generation_key(tag)) for tag in tags}
+
+    def invalidate(self, *tags):
+        if self.backend is None or not tags:
+            return 0
+        try:
+            token = os.urandom(8).hex()
+            for tag in (*tags, ANY_TAG):
+                self.backend.set(_generation_key(tag), token, ttl=GENERATION_TTL)
+            removed = self.backend.invalidate_tags(tags)
+        except Exception as e:
+            current_app.logger.warning(f'response cache invalidate failed: {e}')
+            return 0
+        with self._lock:
+            self.invalidations += removed
+        return removed
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "invalidated_entries": self.invalidations,
+            }
+        if self.backend is None:
+            stats["backend"] = "none"
+        else:
+            stats.update(self.backend.info())
+        stats["default_ttl"] = self.default_ttl
+        return stats
+
+    # ---------------------------------------------------------
+    # view decorator
+    # ---------------------------------------------------------
+    def cached(self, tags, ttl=None):
+        """
+        Cache the JSON body of a GET view.
+
+        `tags` is either a list of tags or a callable
+        tags(view_args, data) -> iterable of tags, where `data` is the
+        decoded response body, so tags can name the entities it contains.
+        """
+
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                key = 'response:' + request.path + '?' + '&'.join(
+                    f'{k}={v}' for k, v in sorted(request.args.items(multi=True)))
+
+                entry = self.get(key)
+                if entry is not None:
+                    # stored as '<etag> <body>' so a revalidation needs no hashing
+                    etag, _, body = entry.partition(' ')
+                    if request.if_none_match.contains(etag):
+                        response = current_app.response_class(status=304)
+                    else:
+                        response = current_app.response_class(body, mimetype='application/json')
+                    response.set_etag(etag)
+                    response.headers['X-Cache'] = 'HIT'
+                    return response
+
+                # before the view's queries; see ANY_TAG
+                generations = self.generations([ANY_TAG])
+                response = make_response(view(*args, **kwargs))
+                if (response.status_code == 200 and not response.is_streamed
+                        and response.mimetype == 'application/json'):
+                    body = response.get_data(as_text=True)
+                    etag = hashlib.sha1(response.get_data()).hexdigest()
+                    entry_tags = tags(kwargs, response.get_json()) if callable(tags) else tags
+                    self.set(key, f'{etag} {body}', tags=list(entry_tags), ttl=ttl, generations=generations)
+                    response.set_etag(etag)
+                    response.headers['X-Cache'] = 'MISS'
+                return response
+
+            return wrapper
+
+        return decorator
+
+
+response_cache = ResponseCache()
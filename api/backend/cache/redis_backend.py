@@ -0,0 +1,83 @@
+#------------------------------------------------------------
+# Redis-compatible cache backend.
+#
+# Works with any client exposing get/set(ex=)/delete/sadd/smembers/
+# expire(nx=, gt=)/scan_iter (redis-py against Redis/Valkey 7+, or an
+# in-memory stand-in in tests). Shared by every API worker process, so an
+# invalidation in one worker is seen by all of them.
+#------------------------------------------------------------
+
+
+class RedisCache:
+    def __init__(self, client, prefix='fitflow:cache:', default_ttl=60):
+        self.client = client
+        self.prefix = prefix
+        self.default_ttl = default_ttl
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis needs the 'redis' package (pip install redis)")
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def _key(self, key):
+        return self.prefix + key
+
+    def _tag(self, tag):
+        return self.prefix + 'tag:' + tag
+
+    def get(self, key):
+        value = self.client.get(self._key(key))
+        if isinstance(value, bytes):
+            value = value.decode('utf-8')
+        return value
+
+    def set(self, key, value, tags=(), ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        full_key = self._key(key)
+        self.client.set(full_key, value, ex=ttl)
+        for tag in tags:
+            tag_key = self._tag(tag)
+            self.client.sadd(tag_key, full_key)
+            # the tag set has to outlive every entry it points at, so its
+            # TTL is only ever extended: NX gives a new set one, GT moves
+            # it later but never earlier (EXPIRE NX/GT needs Redis 7+)
+            self.client.expire(tag_key, ttl, nx=True)
+            self.client.expire(tag_key, ttl, gt=True)
+
+    def delete(self, key):
+        self.client.delete(self._key(key))
+
+    def invalidate_tags(self, tags):
+        removed = 0
+        for tag in tags:
+            tag_key = self._tag(tag)
+            keys = list(self.client.smembers(tag_key))
+            if keys:
+                removed += self.client.delete(*keys)
+            self.client.delete(tag_key)
+        return removed
+
+    def clear(self, batch=500):
+        """Delete every key under this cache's prefix (entries and tag sets); other keys are left alone."""
+        removed, keys = 0, []
+        for key in self.client.scan_iter(match=self.prefix + '*', count=batch):
+            keys.append(key)
+            if len(keys) >= batch:
+                removed += self.client.delete(*keys)
+                keys = []
+        if keys:
+            removed += self.client.delete(*keys)
+        return removed
+
+    def info(self):
+        info = {"backend": "redis", "prefix": self.prefix}
+        try:
+            stats = self.client.info('stats')
+            info["evictions"] = stats.get('evicted_keys')
+            info["expirations"] = stats.get('expired_keys')
+        except Exception:
+            pass
+        return info
@@ -0,0 +1,216 @@
+#------------------------------------------------------------
+# Bulk workout-log ingestion (POST /client/client_workout_log/bulk)
+#
+# Items arrive as a JSON array or as NDJSON (one log per line) and
+# are processed CHUNK_SIZE at a time: validate the chunk, drop items
+# whose idempotency key was already ingested, insert the rest with
+# one multi-row executemany, update the rollups and commit. Memory
+# is bounded by the chunk size (plus one small result per item).
+# If the multi-row insert hits a constraint anyway (a client or
+# template deleted since the check), the chunk is retried row by
+# row and only the offending items come back with status "error".
+#------------------------------------------------------------
+import datetime
+import json
+import uuid
+
+from pymysql.err import IntegrityError
+
+from backend.cache import response_cache
+from backend.client.monthly_completion import completion_tags
+from backend.rollups import fetch_workout_logs, workout_logs_changed
+
+CHUNK_SIZE = 1000
+MAX_ITEMS = 100000
+MAX_KEY_LENGTH = 64
+# Client_Workout_Log.notes is a TEXT column
+MAX_NOTES_BYTES = 65535
+
+REQUIRED_FIELDS = ('client_id', 'workout_id', 'date', 'completion_status', 'duration_minutes')
+COMPLETION_STATUSES = ('not_started', 'partial', 'completed')
+
+INSERT_LOG = """
+    INSERT INTO Client_Workout_Log
+    (client_id, workout_id, workout_date, completion_status, duration_minutes, notes, idempotency_key)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+"""
+
+
+class BulkError(ValueError):
+    pass
+
+
+def iter_json_array(data):
+    if isinstance(data, dict):
+        data = data.get('logs')
+    if not isinstance(data, list):
+        raise BulkError('expected a JSON array of logs (or {"logs": [...]})')
+    return iter(data)
+
+
+def iter_ndjson(lines):
+    """Decode NDJSON lines; an undecodable line becomes a BulkError item."""
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield BulkError(f'invalid JSON: {e}')
+
+
+def chunks(items, size=CHUNK_SIZE):
+    chunk = []
+    for i, item in enumerate(items):
+        if i >= MAX_ITEMS:
+            raise BulkError(f'at most {MAX_ITEMS} logs per request')
+        chunk.append((i, item))
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _validate(item):
+    """Return (row tuple, None) or (None, error message) for one item."""
+    if isinstance(item, BulkError):
+        return None, str(item)
+    if not isinstance(item, dict):
+        return None, 'log must be a JSON object'
+    for field in REQUIRED_FIELDS:
+        if item.get(field) is None:
+            return None, f'Missing required field: {field}'
+    try:
+        client_id = int(item['client_id'])
+        workout_id = int(item['workout_id'])
+        duration = int(item['duration_minutes'])
+        workout_date = datetime.date.fromisoformat(str(item['date']))
+    except (TypeError, ValueError) as e:
+        return None, f'invalid value: {e}'
+    if item['completion_status'] not in COMPLETION_STATUSES:
+        return None, f"completion_status must be one of {', '.join(COMPLETION_STATUSES)}"
+    notes = item.get('notes', '')
+    if notes is not None and (not isinstance(notes, str) or len(notes.encode('utf-8')) > MAX_NOTES_BYTES):
+        return None, f'notes must be a string of at most {MAX_NOTES_BYTES} bytes'
+    key = item.get('idempotency_key')
+    if key is not None and (not isinstance(key, str) or not 0 < len(key) <= MAX_KEY_LENGTH):
+        return None, f'idempotency_key must be a string of 1-{MAX_KEY_LENGTH} characters'
+    return (client_id, workout_id, workout_date, item['completion_status'],
+            duration, notes, key or uuid.uuid4().hex), None
+
+
+def _existing(cursor, table, column, values):
+    if not values:
+        return set()
+    cursor.execute(f"SELECT {column} FROM {table} WHERE {column} IN ({', '.join(['%s'] * len(values))})",
+                   list(values))
+    return {row[column] for row in cursor.fetchall()}
+
+
+def _existing_keys(cursor, keys):
+    if not keys:
+        return {}
+    cursor.execute(f"""
+        SELECT idempotency_key, log_id FROM Client_Workout_Log
+        WHERE idempotency_key IN ({', '.join(['%s'] * len(keys))})
+    """, list(keys))
+    return {row['idempotency_key']: row['log_id'] for row in cursor.fetchall()}
+
+
+def _insert_each(cursor, rows, results):
+    """
+    Insert `rows` one at a time, each behind a savepoint. Returns the
+    (index, row) pairs that went in and the keys found already ingested;
+    other constraint failures become "error" results.
+    """
+    inserted, duplicates = [], []
+    for index, row in rows:
+        cursor.execute("SAVEPOINT bulk_item")
+        try:
+            cursor.execute(INSERT_LOG, row)
+        except IntegrityError as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT bulk_item")
+            if e.args[0] == 1062:
+                duplicates.append(row[6])
+            else:
+                # e.g. 1452: the client or template was deleted since the check
+                results[index] = {"index": index, "status": "error", "error": e.args[-1]}
+        else:
+            inserted.append((index, row))
+    return inserted, duplicates
+
+
+def ingest_chunk(conn, chunk, seen_keys):
+    """Validate, dedupe and insert one chunk in its own transaction. Returns per-item results."""
+    results = {}
+    valid = []
+    for index, item in chunk:
+        row, error = _validate(item)
+        if error:
+            results[index] = {"index": index, "status": "invalid", "error": error}
+        elif row[6] in seen_keys:
+            results[index] = {"index": index, "status": "duplicate", "idempotency_key": row[6],
+                              "error": "idempotency_key repeated in this request"}
+        else:
+            seen_keys.add(row[6])
+            valid.append((index, row))
+
+    cursor = conn.cursor()
+    try:
+        # foreign keys, checked for the whole chunk at once
+        clients = _existing(cursor, 'Client', 'client_id', {row[0] for _, row in valid})
+        workouts = _existing(cursor, 'Workout_Session_Template', 'workout_id', {row[1] for _, row in valid})
+        checked = []
+        for index, row in valid:
+            if row[0] not in clients:
+                results[index] = {"index": index, "status": "invalid", "error": f"unknown client_id {row[0]}"}
+            elif row[1] not in workouts:
+                results[index] = {"index": index, "status": "invalid", "error": f"unknown workout_id {row[1]}"}
+            else:
+                checked.append((index, row))
+
+        # a concurrent retry of the same keys can commit between our check and
+        # insert; the unique key then rejects the chunk and the re-check sees it.
+        # Anything else (or a second failure) falls back to row-by-row inserts.
+        for attempt in (1, 2):
+            done = _existing_keys(cursor, [row[6] for _, row in checked])
+            new = [(index, row) for index, row in checked if row[6] not in done]
+            try:
+                if new:
+                    cursor.executemany(INSERT_LOG, [row for _, row in new])
+                break
+            except IntegrityError as e:
+                conn.rollback()
+                if attempt == 2 or e.args[0] != 1062:
+                    new, duplicates = _insert_each(cursor, new, results)
+                    done.update(_existing_keys(cursor, duplicates))
+                    break
+
+        for index, row in checked:
+            if row[6] in done:
+                results[index] = {"index": index, "status": "duplicate",
+                                  "idempotency_key": row[6], "log_id": done[row[6]]}
+
+        created = []
+        if new:
+            keys = [row[6] for _, row in new]
+            ids = _existing_keys(cursor, keys)
+            created = fetch_workout_logs(cursor, f"idempotency_key IN ({', '.join(['%s'] * len(keys))})", keys)
+            workout_logs_changed(cursor, after=created)
+            for index, row in new:
+                results[index] = {"index": index, "status": "created",
+                                  "idempotency_key": row[6], "log_id": ids[row[6]]}
+        conn.commit()
+        # back-dated logs change the counts of already cached months
+        response_cache.invalidate(*completion_tags(created))
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    return [results[index] for index, _ in chunk]
@@ -1,6 +1,13 @@
 from flask import Blueprint, jsonify, request
 from backend.db_connection import db
+from backend.rollups import fetch_workout_logs, workout_logs_changed
+from backend.cache import response_cache
+from backend.conditional import validated_by
+from backend.versions import version_query
+from backend.client import bulk_logs, dashboard, monthly_completion
+from backend.programs import load_current_program
 from mysql.connector import Error
+from pymysql import MySQLError
 from flask import current_app
 
 # Create a Blueprint for Client routes
@@ -8,6 +15,7 @@ client = Blueprint('client', __name__)
 
 # Route 1: GET all completed workout logs for client
 @client.route("/client_workout_log", methods=["GET"])
+@validated_by(version_query("workout_logs", "templates"))
 def get_client_workout_logs():
     """Return all completed workout logs for the authenticated client (last 10)"""
     try:
@@ -77,10 +85,15 @@ def create_workout_log():
             data['duration_minutes'],
             data.get('notes', '')
         ))
-        
-        db.get_db().commit()
         log_id = cursor.lastrowid
+
+        # keep the analytics rollups in step, in the same transaction
+        after = fetch_workout_logs(cursor, "log_id = %s", (log_id,))
+        workout_logs_changed(cursor, after=after)
+
+        db.get_db().commit()
         cursor.close()
+        response_cache.invalidate(*monthly_completion.completion_tags(after))
         
         current_app.logger.info(f'Successfully created workout log {log_id}')
         return jsonify({"message": "Workout log created successfully", "log_id": log_id}), 201
@@ -90,6 +103,36 @@ def create_workout_log():
         return jsonify({"error": str(e)}), 500
 
 
+# Route 2b: POST - Bulk ingest workout logs (device / kiosk sync)
+# Body: JSON array (or {"logs": [...]}) or NDJSON (Content-Type: application/x-ndjson).
+# Each log takes the fields of Route 2 plus an optional idempotency_key;
+# a log whose key was already ingested is reported as a duplicate.
+@client.route("/client_workout_log/bulk", methods=["POST"])
+def bulk_create_workout_logs():
+    try:
+        if request.mimetype == 'application/x-ndjson':
+            items = bulk_logs.iter_ndjson(request.stream)
+        else:
+            items = bulk_logs.iter_json_array(request.get_json(silent=True))
+
+        conn = db.get_db()
+        results, seen_keys = [], set()
+        for chunk in bulk_logs.chunks(items):
+            results.extend(bulk_logs.ingest_chunk(conn, chunk, seen_keys))
+
+        counts = {status: sum(r["status"] == status for r in results)
+                  for status in ("created", "duplicate", "invalid", "error")}
+        current_app.logger.info(f'bulk_create_workout_logs: {counts}')
+        return jsonify({**counts, "results": results}), 200
+
+    except bulk_logs.BulkError as e:
+        # earlier chunks are committed; their items are safe to resend
+        return jsonify({"error": str(e)}), 400
+    except (Error, MySQLError) as e:
+        current_app.logger.error(f'Database error in bulk_create_workout_logs: {str(e)}')
+        return jsonify({"error": str(e)}), 500
+
+
 # Route 3: PUT - Update a workout log's duration or notes
 @client.route("/client_workout_log/<int:log_id>", methods=["PUT"])
 def update_workout_log(log_id):
@@ -115,6 +158,11 @@ def update_workout_log(log_id):
         values.append(log_id)
         
         cursor = db.get_db().cursor()
+        before = fetch_workout_logs(cursor, "log_id = %s", (log_id,))
+
+        if not before:
+            cursor.close()
+            return jsonify({"error": "Workout log not found"}), 404
         
         query = f"""
             UPDATE Client_Workout_Log
@@ -123,13 +171,11 @@ def update_workout_log(log_id):
         """
         
         cursor.execute(query, values)
+        after = fetch_workout_logs(cursor, "log_id = %s", (log_id,))
+        workout_logs_changed(cursor, before, after)
         db.get_db().commit()
-        
-        rows_affected = cursor.rowcount
         cursor.close()
-        
-        if rows_affected == 0:
-            return jsonify({"error": "Workout log not found"}), 404
+        response_cache.invalidate(*monthly_completion.completion_tags(before + after))
         
         current_app.logger.info(f'Successfully updated workout log {log_id}')
         return jsonify({"message": "Workout log updated successfully"}), 200
@@ -150,6 +196,8 @@ def delete_incomplete_logs():
             return jsonify({"error": "client_id is required"}), 400
         
         cursor = db.get_db().cursor()
+        before = fetch_workout_logs(
+            cursor, "client_id = %s AND completion_status = 'not_started'", (client_id,))
         
         query = """
             DELETE FROM Client_Workout_Log
@@ -158,9 +206,9 @@ def delete_incomplete_logs():
         """
         
         cursor.execute(query, (client_id,))
-        db.get_db().commit()
-        
         rows_deleted = cursor.rowcount
+        workout_logs_changed(cursor, before=before)
+        db.get_db().commit()
         cursor.close()
         
         current_app.logger.info(f'Successfully deleted {rows_deleted} incomplete logs')
@@ -174,33 +222,26 @@ def delete_incomplete_logs():
         return jsonify({"error": str(e)}), 500
 
 
-# Route 5: GET - Monthly completion rate comparison
+# Route 5: GET - Completed workouts per month
+# ?months=N (default 2: current vs previous) or ?from=YYYY-MM&to=YYYY-MM;
+# finished months come from a per-client cache (backend/client/monthly_completion)
 @client.route("/client_workout_log/completion_rate/monthly", methods=["GET"])
+@validated_by(version_query("workout_logs"))
 def get_monthly_completion_rate():
-    """Return workout completion count: current month vs previous month"""
+    """Return workout completion count per month, newest first"""
     try:
         client_id = request.args.get('client_id', type=int)
         
         if not client_id:
             return jsonify({"error": "client_id is required"}), 400
+
+        try:
+            first, last = monthly_completion.month_range(request.args)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         
         cursor = db.get_db().cursor()
-        
-        query = """
-            SELECT 
-                MONTH(workout_date) AS month,
-                COUNT(*) AS workouts_completed
-            FROM Client_Workout_Log
-            WHERE client_id = %s
-              AND workout_date >= '2025-10-01'
-              AND completion_status = 'completed'
-            GROUP BY MONTH(workout_date)
-            ORDER BY month DESC;
-        """
-        
-        current_app.logger.debug(f'Executing query with client_id={client_id}')
-        cursor.execute(query, (client_id,))
-        completion_data = cursor.fetchall()
+        completion_data = monthly_completion.monthly_completion(cursor, client_id, first, last)
         cursor.close()
         
         current_app.logger.info(f'Successfully retrieved monthly completion rate')
@@ -210,49 +251,52 @@ def get_monthly_completion_rate():
         current_app.logger.error(f'Database error in get_monthly_completion_rate: {str(e)}')
         return jsonify({"error": str(e)}), 500
     
-# ROUTE 6 GET - Get client's current workout program with exercises
+# Route 5b: GET - Dashboard summary in one round trip
+# ?months=N (default 6) and ?recent=N (default 10); see backend/client/dashboard
+@client.route("/dashboard", methods=["GET"])
+@validated_by(version_query("workout_logs", "templates"))
+def get_client_dashboard():
+    """Return recent completed logs, lifetime and monthly totals and the month-over-month change"""
+    try:
+        client_id = request.args.get('client_id', type=int)
+
+        if not client_id:
+            return jsonify({"error": "client_id is required"}), 400
+
+        try:
+            months = dashboard.positive_arg(request.args, 'months', dashboard.DEFAULT_MONTHS, dashboard.MAX_MONTHS)
+            recent = dashboard.positive_arg(request.args, 'recent', dashboard.DEFAULT_RECENT, dashboard.MAX_RECENT)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        cursor = db.get_db().cursor()
+        summary = dashboard.client_dashboard(cursor, client_id, months, recent)
+        cursor.close()
+
+        return jsonify(summary), 200
+
+    except Error as e:
+        current_app.logger.error(f'Database error in get_client_dashboard: {str(e)}')
+        return jsonify({"error": str(e)}), 500
+
+# ROUTE 6 GET - Get client's current workout program with exercises (backend/programs)
+# cached until the program, its template or one of its exercises changes
 @client.route("/client_specific_workout_program/exercises", methods=["GET"])
+@validated_by(version_query("programs", "templates"))
+@response_cache.cached(tags=lambda args, rows: {f"client:{request.args.get('client_id', type=int)}:program"}
+                       | {f"program:{r['program_id']}" for r in rows}
+                       | {f"template:{r['workout_id']}" for r in rows}
+                       | {f"exercise:{r['exercise_id']}" for r in rows})
 def get_client_program_exercises():
     try:
         client_id = request.args.get("client_id", type=int)
         if not client_id:
             return jsonify({"error": "client_id is required"}), 400
 
-        conn = db.get_db()
-        cursor = conn.cursor()
-
-        # Get ONLY the most recent program for the client
-        query = """
-            SELECT
-                p.program_id,
-                p.name AS program_name,
-                w.workout_id,
-                w.name AS workout_name,
-                w.description AS workout_description,
-                w.duration_minutes,
-                w.difficulty,
-                e.name AS exercise_name,
-                wse.sets,
-                wse.reps,
-                wse.rest_period
-            FROM Client_Specific_Workout_Program p
-            JOIN Workout_Session_Template w
-                ON p.workout_id = w.workout_id
-            JOIN Workout_Specific_Exercise wse
-                ON w.workout_id = wse.workout_id
-            JOIN Exercise e
-                ON wse.exercise_id = e.exercise_id
-            WHERE p.client_id = %s
-              AND p.program_id = (
-                    SELECT MAX(program_id)
-                    FROM Client_Specific_Workout_Program
-                    WHERE client_id = %s
-              )
-            ORDER BY wse.workout_exercise_id;
-        """
+        cursor = db.get_db().cursor()
 
-        cursor.execute(query, (client_id, client_id))
-        rows = cursor.fetchall()
+        # pointer -> program -> template document: three primary-key lookups
+        rows = load_current_program(cursor, client_id)
         cursor.close()
 
         # Return empty list → Streamlit shows "no program yet"
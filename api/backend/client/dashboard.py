@@ -0,0 +1,95 @@
+#------------------------------------------------------------
+# Everything the client dashboard shows, in one response.
+#
+# Monthly and lifetime figures come from Client_Monthly_Workout_Rollup
+# (one primary-key range read of the client's months, summed here for
+# the lifetime totals); the recent logs are a LIMIT read off
+# idx_cwl_client_status_date. Neither grows with the log history.
+#------------------------------------------------------------
+import datetime
+
+from backend.client.monthly_completion import add_months, month_key
+
+DEFAULT_MONTHS = 6
+MAX_MONTHS = 24
+DEFAULT_RECENT = 10
+MAX_RECENT = 50
+
+COUNT_FIELDS = ("total_workouts", "completed_workouts", "partial_workouts", "not_started_workouts",
+                "completed_duration_sum", "completed_duration_count")
+
+
+def positive_arg(args, name, default, most):
+    value = args.get(name, default)
+    if not str(value).isdigit() or not 1 <= int(value) <= most:
+        raise ValueError(f"{name} must be an integer between 1 and {most}")
+    return int(value)
+
+
+def _stats(counts):
+    total = counts["total_workouts"]
+    timed = counts["completed_duration_count"]
+    return {
+        "total_workouts": total,
+        "completed_workouts": counts["completed_workouts"],
+        "partial_workouts": counts["partial_workouts"],
+        "not_started_workouts": counts["not_started_workouts"],
+        "completion_rate": round(counts["completed_workouts"] / total * 100, 2) if total else None,
+        "total_minutes": counts["completed_duration_sum"],
+        "avg_duration": round(counts["completed_duration_sum"] / timed, 1) if timed else None,
+    }
+
+
+def client_dashboard(cursor, client_id, months=DEFAULT_MONTHS, recent=DEFAULT_RECENT, today=None):
+    """
+    {"recent": [...], "lifetime": {...}, "months": [...newest first],
+     "month_over_month": {...}}; minutes and durations count completed workouts.
+    """
+    cursor.execute("""
+        SELECT
+            cwl.log_id,
+            cwl.workout_date,
+            wst.name AS workout_name,
+            cwl.completion_status,
+            cwl.duration_minutes
+        FROM Client_Workout_Log cwl
+        JOIN Workout_Session_Template wst ON cwl.workout_id = wst.workout_id
+        WHERE cwl.client_id = %s
+          AND cwl.completion_status = 'completed'
+        ORDER BY cwl.workout_date DESC
+        LIMIT %s
+    """, (client_id, recent))
+    recent_logs = cursor.fetchall()
+
+    cursor.execute(f"""
+        SELECT month, {', '.join(COUNT_FIELDS)}
+        FROM Client_Monthly_Workout_Rollup
+        WHERE client_id = %s
+    """, (client_id,))
+    by_month = {row["month"]: row for row in cursor.fetchall()}
+
+    lifetime = {f: sum(int(row[f]) for row in by_month.values()) for f in COUNT_FIELDS}
+
+    def counts_for(month):
+        row = by_month.get(month)
+        return {f: int(row[f]) if row else 0 for f in COUNT_FIELDS}
+
+    current = month_key(today or datetime.date.today())
+    monthly = [{"year": month // 100, "month": month % 100, **_stats(counts_for(month))}
+               for month in (add_months(current, -n) for n in range(months))]
+
+    this_month = _stats(counts_for(current))
+    last_month = _stats(counts_for(add_months(current, -1)))
+    rates = (this_month["completion_rate"], last_month["completion_rate"])
+
+    return {
+        "client_id": client_id,
+        "recent": recent_logs,
+        "lifetime": _stats(lifetime),
+        "months": monthly,
+        "month_over_month": {
+            "completed_workouts": this_month["completed_workouts"] - last_month["completed_workouts"],
+            "total_minutes": this_month["total_minutes"] - last_month["total_minutes"],
+            "completion_rate": round(rates[0] - rates[1], 2) if None not in rates else None,
+        },
+    }
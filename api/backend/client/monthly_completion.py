@@ -0,0 +1,116 @@
+#------------------------------------------------------------
+# Completed workouts per calendar month for one client.
+#
+# A month that has ended only changes when a log is back-dated into
+# it, edited or deleted, so its count is kept in the response cache
+# per client and a request queries MySQL only for the months it is
+# missing, normally just the current one. The write paths drop the
+# months they touch with `response_cache.invalidate(*completion_tags(rows))`;
+# a count read while such a write commits is not kept (see the
+# generations check in backend/cache).
+#------------------------------------------------------------
+import datetime
+
+from backend.cache import response_cache
+from backend.rollups.common import as_date
+
+DEFAULT_MONTHS = 2           # current vs previous month
+MAX_MONTHS = 120
+CLOSED_MONTH_TTL = 24 * 3600
+
+
+def month_key(date):
+    return date.year * 100 + date.month
+
+
+def add_months(key, n):
+    index = (key // 100) * 12 + (key % 100 - 1) + n
+    return (index // 12) * 100 + index % 12 + 1
+
+
+def parse_month(text, name):
+    try:
+        date = datetime.datetime.strptime(text, '%Y-%m')
+    except ValueError:
+        raise ValueError(f"{name} must be a month like 2025-10") from None
+    return month_key(date)
+
+
+def month_range(args, today=None):
+    """(first, last) month keys from ?from=YYYY-MM&to=YYYY-MM or ?months=N (ending this month)."""
+    current = month_key(today or datetime.date.today())
+    if 'from' in args or 'to' in args:
+        first = parse_month(args['from'], 'from') if 'from' in args else None
+        last = parse_month(args['to'], 'to') if 'to' in args else current
+        if first is None:
+            first = add_months(last, -(DEFAULT_MONTHS - 1))
+    else:
+        months = args.get('months', DEFAULT_MONTHS)
+        if not str(months).isdigit() or int(months) < 1:
+            raise ValueError("months must be a positive integer")
+        last = current
+        first = add_months(current, -(int(months) - 1))
+
+    if first > last:
+        raise ValueError("from must not be after to")
+    if add_months(first, MAX_MONTHS - 1) < last:
+        raise ValueError(f"at most {MAX_MONTHS} months per request")
+    return first, last
+
+
+def _cache_key(client_id, month):
+    return f"monthly_completion:{client_id}:{month}"
+
+
+def _tag(client_id, month):
+    return f"client:{client_id}:month:{month}"
+
+
+def completion_tags(rows):
+    """Cache tags of the months whose completed count the given log rows contribute to."""
+    return {_tag(row['client_id'], month_key(as_date(row['workout_date'])))
+            for row in rows if row['completion_status'] == 'completed'}
+
+
+def monthly_completion(cursor, client_id, first, last, today=None):
+    """[{"year", "month", "workouts_completed"}, ...] newest month first, zero months included."""
+    current = month_key(today or datetime.date.today())
+
+    months = []
+    month = first
+    while month <= last:
+        months.append(month)
+        month = add_months(month, 1)
+
+    counts, missing = {}, []
+    for month in months:
+        cached = response_cache.get(_cache_key(client_id, month)) if month < current else None
+        if cached is not None:
+            counts[month] = int(cached)
+        else:
+            missing.append(month)
+
+    if missing:
+        closed = [_tag(client_id, month) for month in missing if month < current]
+        generations = response_cache.generations(closed)
+
+        # range scan of idx_cwl_client_status_month (client_id, completion_status, workout_month)
+        cursor.execute("""
+            SELECT workout_month, COUNT(*) AS workouts_completed
+            FROM Client_Workout_Log
+            WHERE client_id = %s
+              AND completion_status = 'completed'
+              AND workout_month BETWEEN %s AND %s
+            GROUP BY workout_month
+        """, (client_id, missing[0], missing[-1]))
+        found = {row['workout_month']: row['workouts_completed'] for row in cursor.fetchall()}
+
+        for month in missing:
+            counts[month] = found.get(month, 0)
+            if month < current:
+                tag = _tag(client_id, month)
+                response_cache.set(_cache_key(client_id, month), str(counts[month]), tags=[tag],
+                                   ttl=CLOSED_MONTH_TTL, generations={tag: generations.get(tag)})
+
+    return [{"year": month // 100, "month": month % 100, "workouts_completed": counts[month]}
+            for month in reversed(months)]
@@ -0,0 +1,81 @@
+#------------------------------------------------------------
+# Conditional GET (ETag / If-None-Match) for every blueprint.
+#
+# Views decorated with @validated_by(sql) take their ETag from a
+# one-row query on indexed columns (MAX(id) + COUNT(*) of an
+# insert-only table, or the Data_Version counters of
+# backend/versions), so an unchanged resource is answered with 304
+# before the view query runs or any JSON is built.
+#
+# Fallback: any other successful GET gets a strong ETag hashed from
+# its body by an after_request hook. That still saves the transfer on
+# a match, but the view has already run and serialised the body.
+#
+# No Last-Modified: every table behind these views can lose rows to a
+# delete or FK cascade, or have rows updated, without any date column
+# moving forward, so If-Modified-Since could answer 304 for a list
+# that has changed.
+#------------------------------------------------------------
+import hashlib
+from functools import wraps
+
+from flask import current_app, request
+
+from backend.db_connection import db
+
+
+def init_app(app):
+    app.after_request(_add_validators)
+
+
+# fallback for views without @validated_by (see the header)
+def _add_validators(response):
+    if request.method not in ('GET', 'HEAD') or response.status_code != 200:
+        return response
+    if response.is_streamed or response.direct_passthrough:
+        return response
+    if 'ETag' not in response.headers:
+        response.add_etag()
+    return response.make_conditional(request)
+
+
+def not_modified(etag=None):
+    response = current_app.response_class(status=304)
+    if etag:
+        response.set_etag(etag)
+    return response
+
+
+def validated_by(query, params=None):
+    """
+    Derive the validators of a view from a cheap query instead of its body.
+
+    `query` must return one row whose columns together change whenever
+    the underlying rows do (e.g. MAX of an auto-increment id plus
+    COUNT(*) on an insert-only table). `params` is a callable
+    view_args -> query params.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            cursor = db.get_db().cursor()
+            cursor.execute(query, params(kwargs) if params else ())
+            row = cursor.fetchone() or {}
+            cursor.close()
+
+            # per URL and per representation (JSON vs NDJSON/CSV export)
+            version = repr(sorted(row.items())) + request.full_path + request.headers.get('Accept', '')
+            etag = hashlib.sha1(version.encode('utf-8')).hexdigest()
+
+            if request.if_none_match and request.if_none_match.contains(etag):
+                return not_modified(etag)
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                response.set_etag(etag)
+            return response
+
+        return wrapper
+
+    return decorator
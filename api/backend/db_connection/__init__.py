@@ -1,10 +1,136 @@
 #------------------------------------------------------------
 # This file creates a shared DB connection resource
 #------------------------------------------------------------
-from flaskext.mysql import MySQL
+import threading
+from contextlib import contextmanager
+
+import pymysql
+from flask import g
 from pymysql import cursors
 
+from .instrumented import InstrumentedDictCursor, InstrumentedSSDictCursor
+from .pool import ConnectionPool, PoolTimeout
+
+
+class PooledMySQL:
+    """
+    Drop-in replacement for flaskext.mysql.MySQL backed by a ConnectionPool.
+
+    db.get_db() still returns a PyMySQL connection that lives for the
+    current app context, but the connection is borrowed from the pool and
+    returned to it on teardown instead of being closed.
+    """
+
+    def __init__(self, cursorclass=cursors.DictCursor):
+        self.cursorclass = cursorclass
+        self.app = None
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        app.config.setdefault('MYSQL_DATABASE_HOST', 'localhost')
+        app.config.setdefault('MYSQL_DATABASE_PORT', 3306)
+        app.config.setdefault('MYSQL_DATABASE_USER', None)
+        app.config.setdefault('MYSQL_DATABASE_PASSWORD', None)
+        app.config.setdefault('MYSQL_DATABASE_DB', None)
+        app.config.setdefault('MYSQL_DATABASE_CHARSET', 'utf8mb4')
+        app.config.setdefault('MYSQL_CONNECT_TIMEOUT', 10)
+
+        app.config.setdefault('MYSQL_POOL_MIN_SIZE', 1)
+        app.config.setdefault('MYSQL_POOL_MAX_SIZE', 10)
+        app.config.setdefault('MYSQL_POOL_WAIT_TIMEOUT', 5.0)      # seconds to wait when exhausted
+        app.config.setdefault('MYSQL_POOL_MAX_IDLE_TIME', 300.0)   # recycle connections idle this long
+        app.config.setdefault('MYSQL_POOL_PING_INTERVAL', 30.0)    # ping on checkout if idle this long
+
+        app.teardown_appcontext(self._teardown)
+
+    # ---------------------------------------------------------
+    # pool lifecycle
+    # ---------------------------------------------------------
+    @property
+    def pool(self):
+        # built on first use so every (forked) process opens its own sockets
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    config = self.app.config
+                    self._pool = ConnectionPool(
+                        self.connect,
+                        min_size=int(config['MYSQL_POOL_MIN_SIZE']),
+                        max_size=int(config['MYSQL_POOL_MAX_SIZE']),
+                        wait_timeout=float(config['MYSQL_POOL_WAIT_TIMEOUT']),
+                        max_idle_time=float(config['MYSQL_POOL_MAX_IDLE_TIME']),
+                        ping_interval=float(config['MYSQL_POOL_PING_INTERVAL']),
+                    )
+        return self._pool
+
+    def connect(self):
+        """Open a brand new (unpooled) connection using the app config."""
+        config = self.app.config
+        return pymysql.connect(
+            host=config['MYSQL_DATABASE_HOST'],
+            port=int(config['MYSQL_DATABASE_PORT']),
+            user=config['MYSQL_DATABASE_USER'],
+            password=config['MYSQL_DATABASE_PASSWORD'],
+            database=config['MYSQL_DATABASE_DB'],
+            charset=config['MYSQL_DATABASE_CHARSET'],
+            connect_timeout=config['MYSQL_CONNECT_TIMEOUT'],
+            cursorclass=self.cursorclass,
+        )
+
+    def close_pool(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+
+    def after_fork(self):
+        """
+        Forget a pool inherited from the parent process (call in the child).
+
+        The inherited sockets are shared with the parent, so they are not
+        closed here - that would tear down the parent's sessions. The child
+        opens its own pool on first use.
+        """
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def pool_stats(self):
+        if self._pool is None:
+            return {"initialized": False}
+        return {"initialized": True, **self._pool.stats()}
+
+    # ---------------------------------------------------------
+    # per app-context connection
+    # ---------------------------------------------------------
+    def get_db(self):
+        if 'mysql_conn' not in g:
+            g.mysql_conn = self.pool.checkout()
+        return g.mysql_conn
+
+    @contextmanager
+    def connection(self):
+        """Borrow a second connection outside of get_db(), e.g. for a parallel cursor."""
+        conn = self.pool.checkout()
+        try:
+            yield conn
+        except pymysql.err.OperationalError:
+            self.pool.checkin(conn, discard=True)
+            raise
+        except BaseException:
+            self.pool.checkin(conn)
+            raise
+        else:
+            self.pool.checkin(conn)
+
+    def _teardown(self, exception):
+        conn = g.pop('mysql_conn', None)
+        if conn is not None:
+            self.pool.checkin(conn)
+
 
-# the parameter instructs the connection to return data 
-# as a dictionary object. 
-db = MySQL(cursorclass=cursors.DictCursor)
\ No newline at end of file
+# the parameter instructs the connection to return data
+# as a dictionary object; the instrumented cursor also times
+# every statement for /metrics and the slow query log.
+db = PooledMySQL(cursorclass=InstrumentedDictCursor)
@@ -0,0 +1,51 @@
+#------------------------------------------------------------
+# Cursors that report every statement to backend.metrics: the
+# execution time, the rows read and (over SLOW_QUERY_MS) a slow
+# query log line with the route that issued it.
+#------------------------------------------------------------
+import time
+
+from pymysql import cursors
+
+from backend import metrics
+
+
+class InstrumentedDictCursor(cursors.DictCursor):
+    """Buffered DictCursor; the whole result is read during execute()."""
+
+    def execute(self, query, args=None):
+        started = time.perf_counter()
+        try:
+            return super().execute(query, args)
+        finally:
+            # executemany() comes through here once per batch
+            metrics.observe_query(query, time.perf_counter() - started, len(self._rows or ()))
+
+
+class InstrumentedSSDictCursor(cursors.SSDictCursor):
+    """Unbuffered DictCursor; execute() returns at the first row, rows are counted as they are read."""
+
+    _rows_read = 0
+
+    def execute(self, query, args=None):
+        self._flush_rows()
+        started = time.perf_counter()
+        try:
+            return super().execute(query, args)
+        finally:
+            metrics.observe_query(query, time.perf_counter() - started)
+
+    def read_next(self):
+        row = super().read_next()
+        if row is not None:
+            self._rows_read += 1
+        return row
+
+    def _flush_rows(self):
+        if self._rows_read:
+            metrics.count_rows(self._rows_read)
+            self._rows_read = 0
+
+    def close(self):
+        self._flush_rows()
+        super().close()
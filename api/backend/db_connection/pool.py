@@ -0,0 +1,224 @@
+#------------------------------------------------------------
+# A small thread-safe pool of PyMySQL connections.
+#
+# Connections are checked out for the lifetime of one Flask
+# app context (see PooledMySQL in __init__.py) and handed back
+# afterwards instead of being closed, so a request no longer
+# pays for the TCP + auth handshake with MySQL.
+#------------------------------------------------------------
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes free within wait_timeout seconds."""
+
+
+class ConnectionPool:
+    def __init__(self, connect, min_size=1, max_size=10, wait_timeout=5.0,
+                 max_idle_time=300.0, ping_interval=30.0):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("pool sizes must satisfy 0 <= min_size <= max_size, max_size >= 1")
+
+        # connect is a zero-argument callable returning a new connection
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.wait_timeout = wait_timeout
+        self.max_idle_time = max_idle_time
+        self.ping_interval = ping_interval
+
+        self._cond = threading.Condition()
+        # idle connections as (connection, returned_at); newest on the right
+        self._idle = deque()
+        self._size = 0
+        self._in_use = 0
+        self._closed = False
+
+        # statistics
+        self._created_at = time.monotonic()
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+        self._timeouts = 0
+        self._opened = 0
+        self._discarded = 0
+        self._recycled = 0
+        # (second, checkouts) pairs covering the last minute
+        self._recent = deque(maxlen=60)
+
+        for _ in range(min_size):
+            self._idle.append((self._open(), time.monotonic()))
+            self._size += 1
+
+    # ---------------------------------------------------------
+    # checkout / checkin
+    # ---------------------------------------------------------
+    def checkout(self):
+        """Return a live connection, blocking up to wait_timeout if the pool is exhausted."""
+        started = time.monotonic()
+        deadline = started + self.wait_timeout
+        waited = False
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolTimeout("connection pool is closed")
+
+                self._prune_idle()
+
+                if self._idle:
+                    conn, returned_at = self._idle.pop()
+                    self._in_use += 1
+                    break
+
+                if self._size < self.max_size:
+                    # reserve the slot, then connect outside the lock
+                    self._size += 1
+                    self._in_use += 1
+                    conn, returned_at = None, None
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeout(
+                        f"no database connection available after {self.wait_timeout:.1f}s "
+                        f"(max_size={self.max_size})"
+                    )
+                waited = True
+                self._cond.wait(remaining)
+
+            self._record_checkout(started, waited)
+
+        if conn is None:
+            try:
+                return self._open()
+            except Exception:
+                self._release_slot()
+                raise
+
+        # health check connections that sat idle for a while
+        if time.monotonic() - returned_at >= self.ping_interval:
+            try:
+                conn.ping(reconnect=False)
+            except Exception:
+                self._close_quietly(conn)
+                with self._cond:
+                    self._discarded += 1
+                try:
+                    return self._open()
+                except Exception:
+                    self._release_slot()
+                    raise
+        return conn
+
+    def checkin(self, conn, discard=False):
+        """Hand a connection back. Any open transaction is rolled back first."""
+        if not discard:
+            try:
+                # ends the transaction (and its read snapshot) the
+                # request may have left open
+                conn.rollback()
+            except Exception:
+                discard = True
+
+        with self._cond:
+            self._in_use -= 1
+            if discard or self._closed or not conn.open:
+                self._size -= 1
+                self._discarded += 1
+                self._cond.notify()
+            else:
+                self._idle.append((conn, time.monotonic()))
+                self._cond.notify()
+                return
+
+        self._close_quietly(conn)
+
+    def close(self):
+        """Close every idle connection; checked-out ones are closed on checkin."""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn, _ in idle:
+            self._close_quietly(conn)
+
+    # ---------------------------------------------------------
+    # statistics
+    # ---------------------------------------------------------
+    def stats(self):
+        with self._cond:
+            now = time.monotonic()
+            second = int(now)
+            last_minute = sum(count for sec, count in self._recent if second - sec < 60)
+            window = min(60.0, max(now - self._created_at, 1.0))
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "size": self._size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "checkouts": self._checkouts,
+                "checkouts_per_sec": round(last_minute / window, 3),
+                "waits": self._waits,
+                "wait_seconds_total": round(self._wait_seconds, 6),
+                "wait_seconds_avg": round(self._wait_seconds / self._waits, 6) if self._waits else 0.0,
+                "wait_seconds_max": round(self._max_wait_seconds, 6),
+                "timeouts": self._timeouts,
+                "connections_opened": self._opened,
+                "connections_discarded": self._discarded,
+                "connections_recycled": self._recycled,
+            }
+
+    # ---------------------------------------------------------
+    # helpers (_record_checkout and _prune_idle expect self._cond held)
+    # ---------------------------------------------------------
+    def _open(self):
+        conn = self._connect()
+        with self._cond:
+            self._opened += 1
+        return conn
+
+    def _release_slot(self):
+        with self._cond:
+            self._size -= 1
+            self._in_use -= 1
+            self._cond.notify()
+
+    def _record_checkout(self, started, waited):
+        self._checkouts += 1
+        second = int(time.monotonic())
+        if self._recent and self._recent[-1][0] == second:
+            self._recent[-1] = (second, self._recent[-1][1] + 1)
+        else:
+            self._recent.append((second, 1))
+
+        if waited:
+            elapsed = time.monotonic() - started
+            self._waits += 1
+            self._wait_seconds += elapsed
+            self._max_wait_seconds = max(self._max_wait_seconds, elapsed)
+
+    def _prune_idle(self):
+        # the oldest idle connections sit on the left; close the ones that
+        # have been unused longer than max_idle_time, keeping min_size open
+        now = time.monotonic()
+        while (self._idle and self._size > self.min_size
+               and now - self._idle[0][1] > self.max_idle_time):
+            conn, _ = self._idle.popleft()
+            self._size -= 1
+            self._recycled += 1
+            self._close_quietly(conn)
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
@@ -1,34 +1,147 @@
 from flask import Blueprint, jsonify, request, current_app
 from backend.db_connection import db
+from backend.pagination import page_args, keyset_predicate, page_response
+from backend.streaming import wants_stream, stream_query
+from backend.conditional import validated_by
+from backend.versions import version_query
+from backend.rollups import fetch_health_metrics, health_metrics_changed
+from backend.ml_models import model01
+from backend.ml_models.registry import ModelNotTrained
 from mysql.connector import Error
 
 health_analyst = Blueprint("health_analyst", __name__)
 
+def top_n_limit():
+    """Optional ?limit=N for the ranked reports; None means every row."""
+    limit = request.args.get("limit")
+    if limit is None:
+        return None
+    if not limit.isdigit() or int(limit) < 1:
+        raise ValueError("limit must be a positive integer")
+    return int(limit)
+
+
+def int_arg(name, low, high):
+    """Optional integer query parameter within [low, high]."""
+    value = request.args.get(name)
+    if value is None or value == "":
+        return None
+    if not value.lstrip("-").isdigit() or not low <= int(value) <= high:
+        raise ValueError(f"{name} must be an integer between {low} and {high}")
+    return int(value)
+
+
+def id_list_arg(name, most):
+    """Optional ?name=1,2,3; None when absent."""
+    value = request.args.get(name)
+    if value is None:
+        return None
+    try:
+        ids = sorted({int(i) for i in value.split(",") if i.strip()})
+    except ValueError:
+        raise ValueError(f"{name} must be a comma-separated list of integers") from None
+    if len(ids) > most:
+        raise ValueError(f"at most {most} {name} per request")
+    return ids
+
+
+def iso_week_arg(name):
+    """Optional ?name=YYYY-Www (ISO year and week, e.g. 2026-W03) as (year, week)."""
+    value = request.args.get(name)
+    if value is None or value == "":
+        return None
+    year, sep, week = value.upper().partition("-W")
+    if not (sep and year.isdigit() and week.isdigit() and 1 <= int(week) <= 53):
+        raise ValueError(f"{name} must be an ISO week like 2026-W03")
+    return int(year), int(week)
+
+
+MAX_FILTER_CLIENT_IDS = 1000
+
 # --------------------------------------------------------------------------------
 # 3.1 Average Workout Duration (Completed Workouts Only)
+# read from the client x ISO-week rollup maintained by backend/rollups.
+# Filters: ?from=2025-W50&to=2026-W03 (ISO weeks, either end optional)
+#          or ?year= with ?week= | ?week_from=&week_to= inside that year
+#          ?client_ids=1,2,3  ?fitness_level=  ?limit=N
+# Week bounds compare (iso_year, iso_week) pairs, spelled out so they
+# stay a range on idx_cwwr_week / the primary key; client_ids is a
+# primary-key lookup, so cost follows the slice asked for.
 # --------------------------------------------------------------------------------
 @health_analyst.route("/avg_duration", methods=["GET"])
+@validated_by(version_query("workout_logs", "people"))
 def get_average_workout_duration():
     try:
-        query = """
+        year = int_arg("year", 1970, 9999)
+        week = int_arg("week", 1, 53)
+        week_from = int_arg("week_from", 1, 53)
+        week_to = int_arg("week_to", 1, 53)
+        first = iso_week_arg("from")
+        last = iso_week_arg("to")
+        client_ids = id_list_arg("client_ids", MAX_FILTER_CLIENT_IDS)
+        fitness_level = request.args.get("fitness_level") or None
+        limit = top_n_limit()
+
+        weeks_given = (week, week_from, week_to) != (None, None, None)
+        if (first or last) and (year is not None or weeks_given):
+            raise ValueError("use either from/to or year with week/week_from/week_to, not both")
+        if weeks_given and year is None:
+            raise ValueError("week, week_from and week_to need a year (or use from=YYYY-Www&to=YYYY-Www)")
+        if week is not None and (week_from is not None or week_to is not None):
+            raise ValueError("use either week or week_from/week_to")
+        if year is not None:
+            first = (year, week or week_from or 1)
+            last = (year, week or week_to or 53)
+        if first and last and first > last:
+            raise ValueError("the week range ends before it starts")
+
+        join = ""
+        where, params = ["r.completed_workouts > 0"], []
+        if first:
+            where.append("r.iso_year >= %s AND (r.iso_year > %s OR r.iso_week >= %s)")
+            params.extend([first[0], first[0], first[1]])
+        if last:
+            where.append("r.iso_year <= %s AND (r.iso_year < %s OR r.iso_week <= %s)")
+            params.extend([last[0], last[0], last[1]])
+        if client_ids is not None:
+            if not client_ids:
+                return jsonify([]), 200
+            where.append(f"r.client_id IN ({', '.join(['%s'] * len(client_ids))})")
+            params.extend(client_ids)
+        if fitness_level is not None:
+            join = "JOIN Client c ON c.client_id = r.client_id"
+            where.append("c.fitness_level = %s")
+            params.append(fitness_level)
+        if limit:
+            params.append(limit)
+
+        query = f"""
             SELECT
-              c.client_id,
-              YEAR(cwl.date) AS year,
-              WEEK(cwl.date, 1) AS week,
-              AVG(cwl.duration_minutes) AS avg_duration
-            FROM Client c JOIN Client_Workout_Log cwl ON c.client_id = cwl.client_id
-            WHERE cwl.completion_status = 'completed'
-            GROUP BY c.client_id, YEAR(cwl.date), WEEK(cwl.date, 1)
-            ORDER BY c.client_id, year, week;
+              r.client_id,
+              r.iso_year AS year,
+              r.iso_week AS week,
+              r.completed_duration_sum / NULLIF(r.completed_duration_count, 0) AS avg_duration
+            FROM Client_Weekly_Workout_Rollup r
+            {join}
+            WHERE {' AND '.join(where)}
+            ORDER BY r.client_id, r.iso_year, r.iso_week
+            {"LIMIT %s" if limit else ""};
         """
 
+        # ?format=csv or Accept: application/x-ndjson streams the rows instead
+        fmt = wants_stream()
+        if fmt:
+            return stream_query(query, params, fmt=fmt, filename="avg_duration")
+
         cursor = db.get_db().cursor()
-        cursor.execute(query)
+        cursor.execute(query, params)
         data = cursor.fetchall()
         cursor.close()
 
         return jsonify(data), 200
 
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Error as e:
         current_app.logger.error(f"Error in avg_duration: {str(e)}")
         return jsonify({"error": str(e)}), 500
@@ -37,10 +150,19 @@ def get_average_workout_duration():
 # --------------------------------------------------------------------------------
 # 3.2 Client Demographic Information
 # --------------------------------------------------------------------------------
+# paginated by client_id: ?limit=N&after=<cursor>
 @health_analyst.route("/client_info", methods=["GET"])
+@validated_by(version_query("people"))
 def get_client_info():
     try:
-        query = """
+        limit, after = page_args(1)
+
+        where, params = "", []
+        if after:
+            where, params = keyset_predicate(["c.client_id"], after)
+            where = "WHERE " + where
+
+        query = f"""
             SELECT
              c.client_id,
              c.first_name,
@@ -50,15 +172,18 @@ def get_client_info():
              c.fitness_level,
              c.Age,
              c.join_date
-            FROM Client c;
+            FROM Client c
+            {where}
+            ORDER BY c.client_id
+            LIMIT %s;
         """
 
         cursor = db.get_db().cursor()
-        cursor.execute(query)
+        cursor.execute(query, (*params, limit + 1))
         data = cursor.fetchall()
         cursor.close()
 
-        return jsonify(data), 200
+        return jsonify(page_response(data, limit, ["client_id"])), 200
 
     except Error as e:
         current_app.logger.error(f"Error in client_info: {str(e)}")
@@ -67,32 +192,42 @@ def get_client_info():
 
 # --------------------------------------------------------------------------------
 # 3.3 Most Recent Health Metrics Per Client
+# one primary-key read per client from the snapshot kept by backend/rollups;
+# ?client_ids=1,2,3 restricts it to those clients
 # --------------------------------------------------------------------------------
 @health_analyst.route("/recent_metrics", methods=["GET"])
+@validated_by(version_query("health_metrics"))
 def get_recent_health_metrics():
     try:
-        query = """
+        where, params = "", []
+        ids = id_list_arg("client_ids", MAX_FILTER_CLIENT_IDS)
+        if ids is not None:
+            if not ids:
+                return jsonify([]), 200
+            where = f"WHERE client_id IN ({', '.join(['%s'] * len(ids))})"
+            params = ids
+
+        query = f"""
             SELECT
-              hm.client_id,
-              hm.record_date,
-              hm.weight_kg,
-              hm.body_fat_percentage,
-              hm.heart_rate
-            FROM Health_Metrics hm
-            WHERE hm.record_date = (
-              SELECT MAX(record_date)
-              FROM Health_Metrics
-              WHERE client_id = hm.client_id
-            );
+              client_id,
+              record_date,
+              weight_kg,
+              body_fat_percentage,
+              heart_rate
+            FROM Client_Latest_Health_Metric
+            {where}
+            ORDER BY client_id;
         """
 
         cursor = db.get_db().cursor()
-        cursor.execute(query)
+        cursor.execute(query, params)
         data = cursor.fetchall()
         cursor.close()
 
         return jsonify(data), 200
 
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Error as e:
         current_app.logger.error(f"Error in recent_metrics: {str(e)}")
         return jsonify({"error": str(e)}), 500
@@ -100,23 +235,36 @@ def get_recent_health_metrics():
 
 # --------------------------------------------------------------------------------
 # 3.4 Health Progression (Weight + Body Fat by Month)
+# read from the client x month rollup maintained by backend/rollups
 # --------------------------------------------------------------------------------
 @health_analyst.route("/health_progression", methods=["GET"])
-def get_health_progression():
+@health_analyst.route("/health_progression/<int:client_id>", methods=["GET"])
+@validated_by(version_query("health_metrics"))
+def get_health_progression(client_id=None):
     try:
-        query = """
+        where, params = "", ()
+        if client_id is not None:
+            where, params = "WHERE client_id = %s", (client_id,)
+
+        query = f"""
             SELECT
              client_id,
-             MONTH(hm.record_date) AS month,
-             AVG(weight_kg),
-             AVG(body_fat_percentage)
-            FROM Health_Metrics hm
-            GROUP BY client_id, MONTH(hm.record_date)
-            ORDER BY client_id, month;
+             year,
+             month,
+             weight_sum / NULLIF(weight_count, 0) AS avg_weight_kg,
+             body_fat_sum / NULLIF(body_fat_count, 0) AS avg_body_fat_percentage
+            FROM Client_Monthly_Health_Rollup
+            {where}
+            ORDER BY client_id, year, month;
         """
 
+        # ?format=csv or Accept: application/x-ndjson streams the rows instead
+        fmt = wants_stream()
+        if fmt:
+            return stream_query(query, params, fmt=fmt, filename="health_progression")
+
         cursor = db.get_db().cursor()
-        cursor.execute(query)
+        cursor.execute(query, params)
         data = cursor.fetchall()
         cursor.close()
 
@@ -127,36 +275,92 @@ def get_health_progression():
         return jsonify({"error": str(e)}), 500
 
 
+# --------------------------------------------------------------------------------
+# 3.4b Record Health Metrics (keeps the monthly rollup and latest snapshot in step)
+# --------------------------------------------------------------------------------
+@health_analyst.route("/health_metrics", methods=["POST"])
+def create_health_metric():
+    try:
+        data = request.get_json()
+
+        for field in ["client_id", "record_date"]:
+            if field not in data:
+                return jsonify({"error": f"Missing required field: {field}"}), 400
+
+        cursor = db.get_db().cursor()
+        cursor.execute("""
+            INSERT INTO Health_Metrics
+              (client_id, analyst_id, record_date, weight_kg, height_inches,
+               bmi, body_fat_percentage, heart_rate, notes)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """, (
+            data["client_id"],
+            data.get("analyst_id"),
+            data["record_date"],
+            data.get("weight_kg"),
+            data.get("height_inches"),
+            data.get("bmi"),
+            data.get("body_fat_percentage"),
+            data.get("heart_rate"),
+            data.get("notes"),
+        ))
+        metric_id = cursor.lastrowid
+
+        health_metrics_changed(cursor, after=fetch_health_metrics(cursor, "metric_id = %s", (metric_id,)))
+
+        db.get_db().commit()
+        cursor.close()
+
+        return jsonify({"message": "Health metrics recorded", "metric_id": metric_id}), 201
+
+    except Error as e:
+        current_app.logger.error(f"Error in create_health_metric: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+
 # --------------------------------------------------------------------------------
 # 3.5 Workout Program Completion Rates
+# one counter row per program from the (client, template) counters kept by
+# backend/rollups; ?limit=N returns the top N
 # --------------------------------------------------------------------------------
 @health_analyst.route("/completion_rates", methods=["GET"])
+@validated_by(version_query("workout_logs", "programs"))
 def get_program_completion_rates():
     try:
-        query = """
+        limit = top_n_limit()
+
+        query = f"""
             SELECT
               cswp.program_id,
               cswp.name AS program_name,
-              COUNT(cwl.log_id) AS total_workouts,
-              SUM(cwl.completion_status = 'completed') AS completed_workouts,
-              ROUND(
-                  SUM(cwl.completion_status = 'completed') / COUNT(cwl.log_id),
-                  3
-              ) AS completion_rate
-            FROM Client_Specific_Workout_Program cswp JOIN Client_Workout_Log cwl
-              ON cswp.workout_id = cwl.workout_id
-              AND cswp.client_id = cwl.client_id
-            GROUP BY cswp.program_id, cswp.name
-            ORDER BY completion_rate DESC;
+              c.total_workouts,
+              c.completed_workouts,
+              c.partial_workouts,
+              c.not_started_workouts,
+              ROUND(c.completed_workouts / c.total_workouts, 3) AS completion_rate
+            FROM Client_Specific_Workout_Program cswp JOIN Client_Template_Log_Counts c
+              ON c.client_id = cswp.client_id
+              AND c.workout_id = cswp.workout_id
+            WHERE c.total_workouts > 0
+            ORDER BY completion_rate DESC, cswp.program_id
+            {"LIMIT %s" if limit else ""};
         """
+        params = (limit,) if limit else ()
+
+        # ?format=csv or Accept: application/x-ndjson streams the rows instead
+        fmt = wants_stream()
+        if fmt:
+            return stream_query(query, params, fmt=fmt, filename="completion_rates")
 
         cursor = db.get_db().cursor()
-        cursor.execute(query)
+        cursor.execute(query, params)
         data = cursor.fetchall()
         cursor.close()
 
         return jsonify(data), 200
 
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Error as e:
         current_app.logger.error(f"Error in completion_rates: {str(e)}")
         return jsonify({"error": str(e)}), 500
@@ -164,28 +368,77 @@ def get_program_completion_rates():
 
 # --------------------------------------------------------------------------------
 # 3.6 Workout Template Usage Frequency
+# per-template counters kept by backend/rollups; ?limit=N walks idx_tlc_total
+# for the N most used templates
 # --------------------------------------------------------------------------------
 @health_analyst.route("/template_usage", methods=["GET"])
+@validated_by(version_query("workout_logs", "templates"))
 def get_workout_template_usage():
     try:
-        query = """
+        limit = top_n_limit()
+
+        query = f"""
             SELECT
-              cwl.workout_id,
+              t.workout_id,
               wst.name,
-              COUNT(*) AS used
-            FROM Client_Workout_Log cwl JOIN Workout_Session_Template wst
-              ON cwl.workout_id = wst.workout_id
-            GROUP BY cwl.workout_id, wst.name
-            ORDER BY used DESC;
+              t.total_workouts AS used,
+              t.completed_workouts,
+              t.partial_workouts,
+              t.not_started_workouts
+            FROM Template_Log_Counts t JOIN Workout_Session_Template wst
+              ON t.workout_id = wst.workout_id
+            WHERE t.total_workouts > 0
+            ORDER BY used DESC
+            {"LIMIT %s" if limit else ""};
         """
+        params = (limit,) if limit else ()
+
+        # ?format=csv or Accept: application/x-ndjson streams the rows instead
+        fmt = wants_stream()
+        if fmt:
+            return stream_query(query, params, fmt=fmt, filename="template_usage")
 
         cursor = db.get_db().cursor()
-        cursor.execute(query)
+        cursor.execute(query, params)
         data = cursor.fetchall()
         cursor.close()
 
         return jsonify(data), 200
 
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Error as e:
         current_app.logger.error(f"Error in template_usage: {str(e)}")
         return jsonify({"error": str(e)}), 500
+
+
+# --------------------------------------------------------------------------------
+# 3.7 Model Predictions (parameters are cached in memory by the model registry)
+# --------------------------------------------------------------------------------
+@health_analyst.route("/prediction/<var01>/<var02>", methods=["GET"])
+def get_prediction(var01, var02):
+    try:
+        prediction = model01.predict(var01, var02)
+        return jsonify({"prediction": float(prediction)}), 200
+
+    except ValueError:
+        return jsonify({"error": "var01 and var02 must be numbers"}), 400
+    except ModelNotTrained as e:
+        return jsonify({"error": str(e)}), 503
+
+
+# body: {"rows": [[var01, var02], ...]} -> one matrix multiply for all rows
+@health_analyst.route("/prediction", methods=["POST"])
+def get_batch_predictions():
+    try:
+        rows = (request.get_json() or {}).get("rows")
+        if not rows:
+            return jsonify({"error": "rows is required"}), 400
+
+        predictions = model01.predict_many(rows)
+        return jsonify({"predictions": predictions.tolist()}), 200
+
+    except ValueError:
+        return jsonify({"error": "rows must be [var01, var02] pairs of numbers"}), 400
+    except ModelNotTrained as e:
+        return jsonify({"error": str(e)}), 503
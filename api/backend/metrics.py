@@ -0,0 +1,384 @@
+#------------------------------------------------------------
+# Request and SQL instrumentation, exposed in the Prometheus text
+# format on GET /metrics.
+#
+# Every request is timed per endpoint (histogram), counted per
+# status code and its response size added up. SQL statements run
+# through backend/db_connection/instrumented.py are timed per
+# endpoint and statement type, rows read from MySQL are counted,
+# and statements slower than SLOW_QUERY_MS are logged together with
+# the route that issued them. Pool gauges are read at scrape time.
+#
+# Metrics are kept per process. With METRICS_DIR set (gunicorn.conf.py
+# does) every worker also writes its values to <METRICS_DIR>/worker_<pid>.json
+# about once a second, and a scrape answered by any worker merges all
+# of them: counters and histograms are summed, gauges carry a `worker`
+# label. When a worker exits the master folds its counters into
+# archive.json (mark_process_dead), so totals never go backwards.
+#------------------------------------------------------------
+import fcntl
+import json
+import os
+import threading
+import time
+
+from flask import current_app, g, has_app_context, has_request_context, request
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# seconds; a request or a statement slower than 10s lands in +Inf
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)] + list(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def render(self, values=None):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        if values is None:
+            values = self.snapshot()
+        lines.extend(self._render_samples(sorted(values.items())))
+        return lines
+
+    def snapshot(self):
+        with self._lock:
+            return {key: list(value) if isinstance(value, list) else value
+                    for key, value in self._values.items()}
+
+    def merge(self, into, key, value):
+        """Add one worker's sample to the merged values of a scrape."""
+        into[key] = into.get(key, 0) + value
+
+    def _render_samples(self, items):
+        return [f'{self.name}{_labels(self.labelnames, key)} {_number(value)}' for key, value in items]
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def merge(self, into, key, value):
+        # per worker (the `worker` label keeps the keys apart)
+        into[key] = value
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DURATION_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [count per bucket..., sum, count]
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def merge(self, into, key, value):
+        current = into.get(key)
+        into[key] = list(value) if current is None else [a + b for a, b in zip(current, value)]
+
+    def _render_samples(self, items):
+        lines = []
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), state[:-2] + [None]):
+                cumulative = state[-1] if count is None else cumulative + count
+                le = f'le="{_number(float(bound))}"'
+                lines.append(f'{self.name}_bucket{_labels(self.labelnames, key, (le,))} {cumulative}')
+            lines.append(f'{self.name}_sum{_labels(self.labelnames, key)} {_number(state[-2])}')
+            lines.append(f'{self.name}_count{_labels(self.labelnames, key)} {state[-1]}')
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+        self.collectors = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def collect(self):
+        for collect in self.collectors:
+            collect()
+
+    def render(self):
+        self.collect()
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    # ---------------------------------------------------------
+    # several processes (METRICS_DIR)
+    # ---------------------------------------------------------
+    def dump(self, path):
+        """Write this process's values to `path` (atomically)."""
+        self.collect()
+        data = {m.name: [[list(key), value] for key, value in m.snapshot().items()] for m in self.metrics}
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    def merge_files(self, paths, kinds=None):
+        """{metric name: {key: value}} summed over the dumps in `paths`."""
+        merged = {m.name: {} for m in self.metrics}
+        by_name = {m.name: m for m in self.metrics}
+        for path in paths:
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+            except (FileNotFoundError, ValueError):
+                continue
+            for name, samples in data.items():
+                metric = by_name.get(name)
+                if metric is None or (kinds and metric.kind not in kinds):
+                    continue
+                for key, value in samples:
+                    metric.merge(merged[name], tuple(key), value)
+        return merged
+
+    def render_merged(self, merged):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render(merged[metric.name]))
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+http_requests = registry.register(Counter(
+    'fitflow_http_requests_total', 'HTTP requests by endpoint, method and status.',
+    ('endpoint', 'method', 'status')))
+http_duration = registry.register(Histogram(
+    'fitflow_http_request_duration_seconds', 'Time to build the response (streamed bodies excluded).',
+    ('endpoint', 'method')))
+http_bytes = registry.register(Counter(
+    'fitflow_http_response_bytes_total', 'Response body bytes sent (known length only).',
+    ('endpoint',)))
+db_duration = registry.register(Histogram(
+    'fitflow_db_query_duration_seconds', 'SQL statement execution time (to the first row for unbuffered cursors).',
+    ('endpoint', 'statement')))
+db_rows = registry.register(Counter(
+    'fitflow_db_rows_fetched_total', 'Rows read from MySQL.', ('endpoint',)))
+db_slow = registry.register(Counter(
+    'fitflow_db_slow_queries_total', 'Statements slower than SLOW_QUERY_MS.', ('endpoint',)))
+db_pool = registry.register(Gauge(
+    'fitflow_db_pool', 'Connection pool state per worker process.', ('worker', 'stat')))
+
+
+def current_endpoint():
+    if has_request_context():
+        return request.endpoint or 'unmatched'
+    return 'cli'
+
+
+# ---------------------------------------------------------
+# SQL (called by the instrumented cursors)
+# ---------------------------------------------------------
+def observe_query(query, seconds, rows=None):
+    endpoint = current_endpoint()
+    statement = query.lstrip()[:12].split(None, 1)[0].upper() if query.strip() else 'OTHER'
+    db_duration.observe(seconds, endpoint=endpoint, statement=statement)
+    if rows:
+        db_rows.inc(rows, endpoint=endpoint)
+
+    if not has_app_context():
+        return
+    threshold = current_app.config.get('SLOW_QUERY_MS', 0)
+    if threshold and seconds * 1000 >= threshold:
+        db_slow.inc(endpoint=endpoint)
+        path = request.full_path if has_request_context() else '-'
+        current_app.logger.warning(
+            f'slow query: {seconds * 1000:.1f} ms, {rows if rows is not None else "?"} rows, '
+            f'endpoint={endpoint} path={path} sql={" ".join(query.split())[:1000]}')
+
+
+def count_rows(rows):
+    if rows:
+        db_rows.inc(rows, endpoint=current_endpoint())
+
+
+# ---------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------
+def _start_timer():
+    g._metrics_started = time.perf_counter()
+
+
+def _record_request(response):
+    started = g.pop('_metrics_started', None)
+    if started is None:
+        return response
+    endpoint = request.endpoint or 'unmatched'
+    http_duration.observe(time.perf_counter() - started, endpoint=endpoint, method=request.method)
+    http_requests.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+    if response.content_length:
+        http_bytes.inc(response.content_length, endpoint=endpoint)
+    return response
+
+
+# ---------------------------------------------------------
+# several worker processes
+# ---------------------------------------------------------
+ARCHIVE = 'archive.json'
+
+_shared = {'dir': None, 'interval': 1.0, 'pid': None}
+
+
+def _worker_path(directory, pid):
+    return os.path.join(directory, f'worker_{pid}.json')
+
+
+class _DirLock:
+    """flock on <dir>/.lock: shared while scraping, exclusive while archiving."""
+
+    def __init__(self, directory, exclusive=False):
+        self.path = os.path.join(directory, '.lock')
+        self.mode = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+
+    def __enter__(self):
+        self.file = open(self.path, 'a')
+        fcntl.flock(self.file, self.mode)
+        return self
+
+    def __exit__(self, *exc):
+        fcntl.flock(self.file, fcntl.LOCK_UN)
+        self.file.close()
+
+
+def flush():
+    """Write this worker's values to METRICS_DIR now (e.g. from gunicorn's worker_exit)."""
+    directory = _shared['dir']
+    if directory:
+        registry.dump(_worker_path(directory, os.getpid()))
+
+
+def _flush_loop():
+    while True:
+        time.sleep(_shared['interval'])
+        try:
+            flush()
+        except OSError:
+            pass
+
+
+def _start_flusher():
+    # once per process, after gunicorn has forked the worker
+    if _shared['dir'] and _shared['pid'] != os.getpid():
+        _shared['pid'] = os.getpid()
+        threading.Thread(target=_flush_loop, name='metrics-flush', daemon=True).start()
+
+
+def render_shared(directory):
+    flush()
+    with _DirLock(directory):
+        paths = [os.path.join(directory, n) for n in os.listdir(directory)
+                 if n.startswith('worker_') and n.endswith('.json')]
+        merged = registry.merge_files([os.path.join(directory, ARCHIVE)] + paths)
+    return registry.render_merged(merged)
+
+
+def mark_process_dead(pid, directory):
+    """Fold an exited worker's counters and histograms into the archive (run in the master)."""
+    path = _worker_path(directory, pid)
+    if not os.path.exists(path):
+        return
+    with _DirLock(directory, exclusive=True):
+        archive = os.path.join(directory, ARCHIVE)
+        merged = registry.merge_files([archive, path], kinds=('counter', 'histogram'))
+        tmp = archive + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({name: [[list(k), v] for k, v in values.items()] for name, values in merged.items()}, f)
+        os.replace(tmp, archive)
+        os.remove(path)
+
+
+def reset_dir(directory):
+    """Start from empty totals (gunicorn on_starting)."""
+    os.makedirs(directory, exist_ok=True)
+    for name in os.listdir(directory):
+        if name.endswith('.json') or name.endswith('.tmp'):
+            os.remove(os.path.join(directory, name))
+
+
+def init_app(app, pool_stats=None):
+    """Register the request hooks and GET /metrics; `pool_stats` returns the pool's stats dict."""
+    app.config.setdefault('SLOW_QUERY_MS', 500)
+    app.config.setdefault('METRICS_DIR', '')
+    app.config.setdefault('METRICS_FLUSH_INTERVAL', 1.0)
+
+    directory = app.config['METRICS_DIR']
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        _shared['dir'] = directory
+        _shared['interval'] = float(app.config['METRICS_FLUSH_INTERVAL'])
+        app.before_request(_start_flusher)
+
+    if pool_stats is not None:
+        def collect_pool():
+            for stat, value in pool_stats().items():
+                if isinstance(value, (bool, int, float)):
+                    db_pool.set(float(value), worker=os.getpid(), stat=stat)
+        registry.collectors.append(collect_pool)
+
+    app.before_request(_start_timer)
+    app.after_request(_record_request)
+
+    def metrics():
+        body = render_shared(directory) if directory else registry.render()
+        return app.response_class(body, content_type=CONTENT_TYPE)
+    app.add_url_rule('/metrics', 'metrics', metrics, methods=['GET'])
@@ -0,0 +1,178 @@
+#------------------------------------------------------------
+# Versioned schema migrations.
+#
+# database-files/fitflow_db.sql builds the base schema when the
+# MySQL container is first created. Everything added afterwards
+# lives in versions/NNNN_<name>.sql and is applied in order by
+# upgrade(); applied versions are recorded in schema_migrations.
+#
+# MySQL commits DDL implicitly, so a migration that fails half-way
+# cannot be rolled back. Instead every statement that succeeds is
+# recorded in schema_migration_steps (committed together with it when
+# it is DML), and the next upgrade resumes after the last one.
+#
+#   flask --app backend_app migrations status
+#   flask --app backend_app migrations upgrade
+#   flask --app backend_app migrations verify
+#------------------------------------------------------------
+import hashlib
+import os
+import re
+
+VERSIONS_DIR = os.path.join(os.path.dirname(__file__), 'versions')
+_FILENAME = re.compile(r'^(\d{4})_(\w+)\.sql$')
+
+# serialises concurrent upgrades (e.g. several API workers starting at once)
+_LOCK_NAME = 'fitflow_schema_migrations'
+_LOCK_TIMEOUT = 60
+
+
+class MigrationError(Exception):
+    pass
+
+
+class Migration:
+    def __init__(self, version, name, path):
+        self.version = version
+        self.name = name
+        self.path = path
+
+    @property
+    def sql(self):
+        with open(self.path, encoding='utf-8') as f:
+            return f.read()
+
+    @property
+    def checksum(self):
+        return hashlib.sha256(self.sql.encode('utf-8')).hexdigest()
+
+    def statements(self):
+        return split_statements(self.sql)
+
+
+def split_statements(sql):
+    """Split a migration file into statements on a trailing ';' (no procedures/triggers)."""
+    statements, current = [], []
+    for line in sql.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith('--'):
+            continue
+        current.append(line)
+        if stripped.endswith(';'):
+            statements.append('\n'.join(current).rstrip().rstrip(';'))
+            current = []
+    if current:
+        statements.append('\n'.join(current))
+    return statements
+
+
+def discover():
+    migrations = []
+    for filename in sorted(os.listdir(VERSIONS_DIR)):
+        match = _FILENAME.match(filename)
+        if match:
+            migrations.append(Migration(match.group(1), match.group(2),
+                                        os.path.join(VERSIONS_DIR, filename)))
+    return migrations
+
+
+def ensure_history_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+          version    CHAR(4) PRIMARY KEY,
+          name       VARCHAR(100) NOT NULL,
+          checksum   CHAR(64) NOT NULL,
+          applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    # statements of a not yet completed migration that already ran
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migration_steps (
+          version    CHAR(4) NOT NULL,
+          step       INT NOT NULL,
+          checksum   CHAR(64) NOT NULL,
+          applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+          PRIMARY KEY (version, step)
+        )
+    """)
+
+
+def _statement_checksum(statement):
+    return hashlib.sha256(statement.encode('utf-8')).hexdigest()
+
+
+def applied_steps(cursor, version):
+    cursor.execute("SELECT step, checksum FROM schema_migration_steps WHERE version = %s", (version,))
+    return {row['step']: row['checksum'] for row in cursor.fetchall()}
+
+
+def applied_versions(cursor):
+    ensure_history_table(cursor)
+    cursor.execute("SELECT version, checksum FROM schema_migrations")
+    return {row['version']: row['checksum'] for row in cursor.fetchall()}
+
+
+def status(conn):
+    """List every known migration with whether it has been applied."""
+    cursor = conn.cursor()
+    applied = applied_versions(cursor)
+    cursor.close()
+    rows = []
+    for m in discover():
+        rows.append({
+            'version': m.version,
+            'name': m.name,
+            'applied': m.version in applied,
+            'modified_since_applied': m.version in applied and applied[m.version] != m.checksum,
+        })
+    return rows
+
+
+def upgrade(conn, log=print):
+    """Apply every pending migration in version order. Returns the versions applied."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT GET_LOCK(%s, %s) AS got", (_LOCK_NAME, _LOCK_TIMEOUT))
+    if not cursor.fetchone()['got']:
+        cursor.close()
+        raise MigrationError('another process is applying migrations')
+
+    done = []
+    try:
+        applied = applied_versions(cursor)
+        for m in discover():
+            if m.version in applied:
+                continue
+            steps = applied_steps(cursor, m.version)
+            log(f'applying {m.version}_{m.name}' + (f' (resuming after {len(steps)} statements)' if steps else ''))
+            for step, statement in enumerate(m.statements(), 1):
+                checksum = _statement_checksum(statement)
+                if step in steps:
+                    if steps[step] != checksum:
+                        raise MigrationError(
+                            f'{m.version}_{m.name} statement {step} changed after it was applied; '
+                            f'repair the schema by hand and clear its rows in schema_migration_steps')
+                    continue
+                try:
+                    cursor.execute(statement)
+                    cursor.execute(
+                        "INSERT INTO schema_migration_steps (version, step, checksum) VALUES (%s, %s, %s)",
+                        (m.version, step, checksum),
+                    )
+                    conn.commit()
+                except Exception as e:
+                    conn.rollback()
+                    raise MigrationError(
+                        f'{m.version}_{m.name} failed on statement {step}:\n{statement}\n{e}\n'
+                        f'(the statements before it stay applied; the next upgrade resumes here)') from e
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+                (m.version, m.name, m.checksum),
+            )
+            cursor.execute("DELETE FROM schema_migration_steps WHERE version = %s", (m.version,))
+            conn.commit()
+            done.append(m.version)
+    finally:
+        cursor.execute("SELECT RELEASE_LOCK(%s)", (_LOCK_NAME,))
+        cursor.fetchall()
+        cursor.close()
+    return done
@@ -0,0 +1,65 @@
+#------------------------------------------------------------
+# `flask --app backend_app migrations ...` commands
+#------------------------------------------------------------
+import json
+import sys
+
+import click
+from flask.cli import AppGroup
+
+from backend.db_connection import db
+from backend import migrations
+
+migrations_cli = AppGroup('migrations', help='Apply and verify schema migrations.')
+
+
+@migrations_cli.command('status')
+def status_command():
+    """Show which migrations have been applied."""
+    with db.connection() as conn:
+        for row in migrations.status(conn):
+            flag = 'applied' if row['applied'] else 'pending'
+            if row['modified_since_applied']:
+                flag += ' (file changed since it was applied!)'
+            click.echo(f"{row['version']}_{row['name']}: {flag}")
+
+
+@migrations_cli.command('upgrade')
+def upgrade_command():
+    """Apply all pending migrations."""
+    with db.connection() as conn:
+        applied = migrations.upgrade(conn, log=click.echo)
+    click.echo(f'{len(applied)} migration(s) applied' if applied else 'schema is up to date')
+
+
+@migrations_cli.command('verify')
+@click.option('--max-rows', default=1000, show_default=True,
+              help='Fail on full table scans of tables with more rows than this.')
+@click.option('--sample', multiple=True, metavar='NAME=VALUE',
+              help='Override a sample URL/query value, e.g. --sample client_id=42.')
+@click.option('--json', 'as_json', is_flag=True, help='Print the full EXPLAIN report as JSON.')
+def verify_command(max_rows, sample, as_json):
+    """EXPLAIN every GET route query and fail on large full table scans."""
+    from backend.migrations.explain_check import verify
+
+    samples = {}
+    for item in sample:
+        name, _, value = item.partition('=')
+        samples[name] = int(value) if value.isdigit() else value
+
+    report, violations = verify(max_rows=max_rows, samples=samples)
+
+    if as_json:
+        click.echo(json.dumps({'report': report, 'violations': violations}, indent=2, default=str))
+    else:
+        for entry in report:
+            click.echo(f"{entry['endpoint']:<45} {str(entry['table']):<32} "
+                       f"type={entry['type']:<7} key={entry['key']} rows={entry['rows']}")
+        for v in violations:
+            click.echo(f"FULL SCAN: {v['endpoint']} scans {v['table']} "
+                       f"({v['table_rows']} rows)", err=True)
+
+    if violations:
+        click.echo(f'{len(violations)} full table scan(s) above {max_rows} rows', err=True)
+        sys.exit(1)
+    click.echo('no full table scans above threshold')
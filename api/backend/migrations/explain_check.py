@@ -0,0 +1,147 @@
+#------------------------------------------------------------
+# Index verification: replay every GET route through the Flask
+# test client, capture each SELECT it sends to MySQL, EXPLAIN it
+# and flag full table scans on tables larger than a threshold.
+#------------------------------------------------------------
+import re
+
+from flask import current_app, has_request_context, request
+from pymysql import cursors
+
+from backend.db_connection import db
+
+# values substituted for URL parameters and common query-string filters
+DEFAULT_SAMPLES = {
+    'client_id': 1,
+    'trainer_id': 1,
+    'user_id': 1,
+    'log_id': 1,
+    'program_id': 1,
+    'template_id': 1,
+    'exercise_id': 1,
+    'feedback_id': 1,
+    'action_type': 'CREATE_WORKOUT',
+}
+_DEFAULT_FOR_CONVERTER = {'IntegerConverter': 1, 'FloatConverter': 1.0}
+
+# EXPLAIN reports aliases, so map "FROM Table t" / "JOIN Table AS t" back to tables
+_KEYWORDS = r'ON|WHERE|JOIN|LEFT|RIGHT|INNER|GROUP|ORDER|LIMIT|USING'
+_TABLE_REF = re.compile(
+    r'\b(?:FROM|JOIN)\s+`?(\w+)`?(?:\s+(?:AS\s+)?(?!(?:' + _KEYWORDS + r')\b)(\w+))?',
+    re.IGNORECASE,
+)
+
+
+class RecordingCursor(cursors.DictCursor):
+    """DictCursor that remembers every SELECT (with its route) while recording is on."""
+    captured = None
+
+    def execute(self, query, args=None):
+        if RecordingCursor.captured is not None and query.lstrip()[:6].upper() == 'SELECT':
+            endpoint = request.endpoint if has_request_context() else None
+            RecordingCursor.captured.append((endpoint, self.mogrify(query, args)))
+        return super().execute(query, args)
+
+
+def _sample_url(rule, samples):
+    values = {}
+    for arg, converter in rule._converters.items():
+        if arg in samples:
+            values[arg] = samples[arg]
+        else:
+            values[arg] = _DEFAULT_FOR_CONVERTER.get(type(converter).__name__, 'x')
+    return rule.build(values, append_unknown=False)[1]
+
+
+def capture_route_queries(samples=None):
+    """Call every GET route once and return [(endpoint, url, status, sql), ...]."""
+    samples = {**DEFAULT_SAMPLES, **(samples or {})}
+    query_string = {k: v for k, v in samples.items() if k in ('client_id', 'trainer_id')}
+
+    app = current_app._get_current_object()
+    previous_cursorclass = db.cursorclass
+    # connections remember their cursorclass, so start from a fresh pool
+    db.close_pool()
+    db.cursorclass = RecordingCursor
+    RecordingCursor.captured = []
+
+    results = []
+    try:
+        client = app.test_client()
+        for rule in app.url_map.iter_rules():
+            if 'GET' not in rule.methods or rule.endpoint == 'static':
+                continue
+            url = _sample_url(rule, samples)
+            before = len(RecordingCursor.captured)
+            response = client.get(url, query_string=query_string)
+            for endpoint, sql in RecordingCursor.captured[before:]:
+                results.append((endpoint or rule.endpoint, url, response.status_code, sql))
+    finally:
+        RecordingCursor.captured = None
+        db.close_pool()
+        db.cursorclass = previous_cursorclass
+    return results
+
+
+def _alias_map(sql):
+    aliases = {}
+    for table, alias in _TABLE_REF.findall(sql):
+        aliases[table] = table
+        if alias:
+            aliases[alias] = table
+    return aliases
+
+
+def _table_rows(cursor, table, cache):
+    if table not in cache:
+        try:
+            cursor.execute(f"SELECT COUNT(*) AS n FROM `{table}`")
+            cache[table] = cursor.fetchone()['n']
+        except Exception:
+            # derived tables / CTE names are not real tables
+            cache[table] = None
+    return cache[table]
+
+
+def verify(max_rows=1000, samples=None):
+    """
+    EXPLAIN every captured route query. Returns (report, violations) where a
+    violation is a full table scan (type=ALL) on a table with more than
+    max_rows rows.
+    """
+    captured = capture_route_queries(samples)
+
+    report, violations = [], []
+    row_counts = {}
+    with db.connection() as conn:
+        cursor = conn.cursor(cursors.DictCursor)
+        seen = set()
+        for endpoint, url, status, sql in captured:
+            if (endpoint, sql) in seen:
+                continue
+            seen.add((endpoint, sql))
+
+            aliases = _alias_map(sql)
+            cursor.execute('EXPLAIN ' + sql)
+            for plan in cursor.fetchall():
+                table = plan.get('table')
+                if table:
+                    table = aliases.get(table, table)
+                entry = {
+                    'endpoint': endpoint,
+                    'url': url,
+                    'status': status,
+                    'table': table,
+                    'type': plan.get('type'),
+                    'key': plan.get('key'),
+                    'rows': plan.get('rows'),
+                    'extra': plan.get('Extra'),
+                }
+                report.append(entry)
+
+                if plan.get('type') == 'ALL' and table and not table.startswith('<'):
+                    table_rows = _table_rows(cursor, table, row_counts)
+                    if table_rows is not None and table_rows > max_rows:
+                        violations.append({**entry, 'table_rows': table_rows, 'sql': sql})
+        cursor.close()
+    return report, violations
@@ -0,0 +1,36 @@
+-- =========================================================
+-- 0001: secondary indexes for the hot route predicates
+-- =========================================================
+
+-- client_routes.get_client_workout_logs / get_monthly_completion_rate,
+-- trainer_routes.client_progress: filter on client + status, sort on date
+CREATE INDEX idx_cwl_client_status_date
+    ON Client_Workout_Log (client_id, completion_status, workout_date);
+
+-- trainer_routes.completed_logs: every completed log, newest first
+CREATE INDEX idx_cwl_status_date
+    ON Client_Workout_Log (completion_status, workout_date);
+
+-- /health_analyst/recent_metrics and health progression per client
+CREATE INDEX idx_hm_client_date
+    ON Health_Metrics (client_id, record_date);
+
+-- admin_routes.get_logs_by_action: WHERE action_type ORDER BY timestamp
+CREATE INDEX idx_syslog_action_time
+    ON System_Log (action_type, timestamp);
+
+-- admin_routes.get_system_logs: ORDER BY timestamp
+CREATE INDEX idx_syslog_time
+    ON System_Log (timestamp);
+
+-- admin_routes.get_backup_status: WHERE status ORDER BY backup_end LIMIT 1
+CREATE INDEX idx_backup_status_end
+    ON Backup_Log (status, backup_end);
+
+-- admin_routes.get_backup_logs: ORDER BY backup_end
+CREATE INDEX idx_backup_end
+    ON Backup_Log (backup_end);
+
+-- trainer_routes.get_feedback: WHERE log_id ORDER BY created_at
+CREATE INDEX idx_tf_log_created
+    ON Trainer_Feedback (log_id, created_at);
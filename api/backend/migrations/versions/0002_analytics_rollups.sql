@@ -0,0 +1,63 @@
+-- =========================================================
+-- 0002: rollup tables behind the health analyst dashboards
+-- (maintained by backend/rollups, rebuilt with `flask rollups rebuild`)
+-- =========================================================
+
+CREATE TABLE Client_Weekly_Workout_Rollup (
+  client_id                INT      NOT NULL,
+  iso_year                 SMALLINT NOT NULL,
+  iso_week                 TINYINT  NOT NULL,
+  total_workouts           INT      NOT NULL DEFAULT 0,
+  completed_workouts       INT      NOT NULL DEFAULT 0,
+  completed_duration_sum   INT      NOT NULL DEFAULT 0,  -- minutes, completed logs with a duration
+  completed_duration_count INT      NOT NULL DEFAULT 0,
+  PRIMARY KEY (client_id, iso_year, iso_week),
+  INDEX idx_cwwr_week (iso_year, iso_week),
+  CONSTRAINT fk_cwwr_client
+     FOREIGN KEY (client_id) REFERENCES Client(client_id)
+     ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE Client_Monthly_Health_Rollup (
+  client_id      INT           NOT NULL,
+  year           SMALLINT      NOT NULL,
+  month          TINYINT       NOT NULL,
+  metric_count   INT           NOT NULL DEFAULT 0,
+  weight_sum     DECIMAL(12,2) NOT NULL DEFAULT 0,
+  weight_count   INT           NOT NULL DEFAULT 0,
+  body_fat_sum   DECIMAL(10,1) NOT NULL DEFAULT 0,
+  body_fat_count INT           NOT NULL DEFAULT 0,
+  PRIMARY KEY (client_id, year, month),
+  CONSTRAINT fk_cmhr_client
+     FOREIGN KEY (client_id) REFERENCES Client(client_id)
+     ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+-- backfill from the existing history
+INSERT INTO Client_Weekly_Workout_Rollup
+  (client_id, iso_year, iso_week, total_workouts, completed_workouts,
+   completed_duration_sum, completed_duration_count)
+SELECT
+  client_id,
+  YEARWEEK(workout_date, 3) DIV 100,
+  YEARWEEK(workout_date, 3) MOD 100,
+  COUNT(*),
+  SUM(completion_status = 'completed'),
+  COALESCE(SUM(CASE WHEN completion_status = 'completed' THEN duration_minutes END), 0),
+  COUNT(CASE WHEN completion_status = 'completed' THEN duration_minutes END)
+FROM Client_Workout_Log
+GROUP BY client_id, YEARWEEK(workout_date, 3);
+
+INSERT INTO Client_Monthly_Health_Rollup
+  (client_id, year, month, metric_count, weight_sum, weight_count, body_fat_sum, body_fat_count)
+SELECT
+  client_id,
+  YEAR(record_date),
+  MONTH(record_date),
+  COUNT(*),
+  COALESCE(SUM(weight_kg), 0),
+  COUNT(weight_kg),
+  COALESCE(SUM(body_fat_percentage), 0),
+  COUNT(body_fat_percentage)
+FROM Health_Metrics
+GROUP BY client_id, YEAR(record_date), MONTH(record_date);
@@ -0,0 +1,11 @@
+-- =========================================================
+-- 0003: parameter store read by backend/ml_models
+-- (one row per trained parameter set; the newest sequence_number wins)
+-- =========================================================
+
+CREATE TABLE IF NOT EXISTS model1_params (
+  sequence_number INT          NOT NULL AUTO_INCREMENT,
+  beta_vals       VARCHAR(512) NOT NULL,   -- e.g. '[0.5, 1.25, -3.0]' (intercept first)
+  created_at      DATETIME     NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (sequence_number)
+);
@@ -0,0 +1,9 @@
+-- =========================================================
+-- 0004: idempotency keys for bulk workout-log ingestion
+-- (POST /client/client_workout_log/bulk; a retried item with the
+--  same key is reported as a duplicate instead of inserted twice)
+-- =========================================================
+
+ALTER TABLE Client_Workout_Log
+    ADD COLUMN idempotency_key VARCHAR(64) NULL,
+    ADD UNIQUE INDEX uq_cwl_idempotency_key (idempotency_key);
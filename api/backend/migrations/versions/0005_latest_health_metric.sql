@@ -0,0 +1,30 @@
+-- =========================================================
+-- 0005: newest health reading per client, so /recent_metrics
+-- reads one row per client instead of a correlated MAX()
+-- (maintained by backend/rollups/latest_health.py)
+-- =========================================================
+
+CREATE TABLE Client_Latest_Health_Metric (
+  client_id           INT          NOT NULL,
+  metric_id           INT          NOT NULL,
+  record_date         DATE         NOT NULL,
+  weight_kg           DECIMAL(5,2),
+  body_fat_percentage DECIMAL(4,1),
+  heart_rate          INT,
+  PRIMARY KEY (client_id),
+  CONSTRAINT fk_clhm_client
+     FOREIGN KEY (client_id) REFERENCES Client(client_id)
+     ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+-- backfill; same-day readings resolve to the highest metric_id
+INSERT INTO Client_Latest_Health_Metric
+  (client_id, metric_id, record_date, weight_kg, body_fat_percentage, heart_rate)
+SELECT client_id, metric_id, record_date, weight_kg, body_fat_percentage, heart_rate
+FROM (
+  SELECT
+    client_id, metric_id, record_date, weight_kg, body_fat_percentage, heart_rate,
+    ROW_NUMBER() OVER (PARTITION BY client_id ORDER BY record_date DESC, metric_id DESC) AS newest
+  FROM Health_Metrics
+) ranked
+WHERE newest = 1;
@@ -0,0 +1,33 @@
+-- =========================================================
+-- 0006: current-program pointer per client and cached template
+-- documents (maintained by backend/programs.py)
+-- =========================================================
+
+CREATE TABLE Client_Current_Program (
+  client_id  INT NOT NULL,
+  program_id INT NOT NULL,
+  PRIMARY KEY (client_id),
+  CONSTRAINT fk_ccp_client
+     FOREIGN KEY (client_id) REFERENCES Client(client_id)
+     ON DELETE CASCADE ON UPDATE CASCADE,
+  CONSTRAINT fk_ccp_program
+     FOREIGN KEY (program_id) REFERENCES Client_Specific_Workout_Program(program_id)
+     ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+-- template + ordered exercises as one JSON document, built on first read
+CREATE TABLE Workout_Template_Document (
+  workout_id INT      NOT NULL,
+  document   JSON     NOT NULL,
+  built_at   DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (workout_id),
+  CONSTRAINT fk_wtd_workout
+     FOREIGN KEY (workout_id) REFERENCES Workout_Session_Template(workout_id)
+     ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+-- backfill: the newest program of every client is current
+INSERT INTO Client_Current_Program (client_id, program_id)
+SELECT client_id, MAX(program_id)
+FROM Client_Specific_Workout_Program
+GROUP BY client_id;
@@ -0,0 +1,58 @@
+-- =========================================================
+-- 0007: workout-log counters by completion status, per template
+-- and per (client, template) pair, behind the completion rate and
+-- template usage reports (maintained by backend/rollups)
+-- =========================================================
+
+CREATE TABLE Template_Log_Counts (
+  workout_id           INT NOT NULL,
+  total_workouts       INT NOT NULL DEFAULT 0,
+  completed_workouts   INT NOT NULL DEFAULT 0,
+  partial_workouts     INT NOT NULL DEFAULT 0,
+  not_started_workouts INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (workout_id),
+  INDEX idx_tlc_total (total_workouts),
+  CONSTRAINT fk_tlc_workout
+     FOREIGN KEY (workout_id) REFERENCES Workout_Session_Template(workout_id)
+     ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE Client_Template_Log_Counts (
+  client_id            INT NOT NULL,
+  workout_id           INT NOT NULL,
+  total_workouts       INT NOT NULL DEFAULT 0,
+  completed_workouts   INT NOT NULL DEFAULT 0,
+  partial_workouts     INT NOT NULL DEFAULT 0,
+  not_started_workouts INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (client_id, workout_id),
+  CONSTRAINT fk_ctlc_client
+     FOREIGN KEY (client_id) REFERENCES Client(client_id)
+     ON DELETE CASCADE ON UPDATE CASCADE,
+  CONSTRAINT fk_ctlc_workout
+     FOREIGN KEY (workout_id) REFERENCES Workout_Session_Template(workout_id)
+     ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+-- backfill from the existing history
+INSERT INTO Template_Log_Counts
+  (workout_id, total_workouts, completed_workouts, partial_workouts, not_started_workouts)
+SELECT
+  workout_id,
+  COUNT(*),
+  SUM(completion_status = 'completed'),
+  SUM(completion_status = 'partial'),
+  SUM(completion_status = 'not_started')
+FROM Client_Workout_Log
+GROUP BY workout_id;
+
+INSERT INTO Client_Template_Log_Counts
+  (client_id, workout_id, total_workouts, completed_workouts, partial_workouts, not_started_workouts)
+SELECT
+  client_id,
+  workout_id,
+  COUNT(*),
+  SUM(completion_status = 'completed'),
+  SUM(completion_status = 'partial'),
+  SUM(completion_status = 'not_started')
+FROM Client_Workout_Log
+GROUP BY client_id, workout_id;
@@ -0,0 +1,27 @@
+-- =========================================================
+-- 0008: stored week/month buckets so grouping and range filters
+-- on them come straight off an index instead of YEARWEEK()/MONTH()
+-- on every row (and a month bucket no longer merges years)
+--
+--   *_iso_week  YEARWEEK(date, 3), ISO-8601 year * 100 + week (202601)
+--   *_month     year * 100 + month                          (202601)
+-- =========================================================
+
+ALTER TABLE Client_Workout_Log
+  ADD COLUMN workout_iso_week INT AS (YEARWEEK(workout_date, 3)) STORED,
+  ADD COLUMN workout_month    INT AS (YEAR(workout_date) * 100 + MONTH(workout_date)) STORED;
+
+-- weekly rollup rebuild: covering, already in GROUP BY order
+CREATE INDEX idx_cwl_client_week
+    ON Client_Workout_Log (client_id, workout_iso_week, completion_status, duration_minutes);
+
+-- client_routes.get_monthly_completion_rate: client + status, range/group on month
+CREATE INDEX idx_cwl_client_status_month
+    ON Client_Workout_Log (client_id, completion_status, workout_month);
+
+ALTER TABLE Health_Metrics
+  ADD COLUMN record_month INT AS (YEAR(record_date) * 100 + MONTH(record_date)) STORED;
+
+-- monthly health rollup rebuild: covering, already in GROUP BY order
+CREATE INDEX idx_hm_client_month
+    ON Health_Metrics (client_id, record_month, weight_kg, body_fat_percentage);
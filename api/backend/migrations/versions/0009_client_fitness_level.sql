@@ -0,0 +1,8 @@
+-- =========================================================
+-- 0009: health_analyst /avg_duration?fitness_level= picks the
+-- matching clients off this index and joins the weekly rollup on
+-- its primary key (client_id, iso_year, iso_week)
+-- =========================================================
+
+CREATE INDEX idx_client_fitness_level
+    ON Client (fitness_level, client_id);
@@ -0,0 +1,36 @@
+-- =========================================================
+-- 0010: workout logs per client and calendar month by completion
+-- status, with completed minutes, behind /client/dashboard
+-- (maintained by backend/rollups)
+-- =========================================================
+
+CREATE TABLE Client_Monthly_Workout_Rollup (
+  client_id                INT NOT NULL,
+  month                    INT NOT NULL,   -- year * 100 + month (202601)
+  total_workouts           INT NOT NULL DEFAULT 0,
+  completed_workouts       INT NOT NULL DEFAULT 0,
+  partial_workouts         INT NOT NULL DEFAULT 0,
+  not_started_workouts     INT NOT NULL DEFAULT 0,
+  completed_duration_sum   INT NOT NULL DEFAULT 0,
+  completed_duration_count INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (client_id, month),
+  CONSTRAINT fk_cmwr_client
+     FOREIGN KEY (client_id) REFERENCES Client(client_id)
+     ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+-- backfill from the existing history
+INSERT INTO Client_Monthly_Workout_Rollup
+  (client_id, month, total_workouts, completed_workouts, partial_workouts, not_started_workouts,
+   completed_duration_sum, completed_duration_count)
+SELECT
+  client_id,
+  workout_month,
+  COUNT(*),
+  SUM(completion_status = 'completed'),
+  SUM(completion_status = 'partial'),
+  SUM(completion_status = 'not_started'),
+  COALESCE(SUM(CASE WHEN completion_status = 'completed' THEN duration_minutes END), 0),
+  COUNT(CASE WHEN completion_status = 'completed' THEN duration_minutes END)
+FROM Client_Workout_Log
+GROUP BY client_id, workout_month;
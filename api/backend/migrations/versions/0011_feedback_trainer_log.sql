@@ -0,0 +1,7 @@
+-- =========================================================
+-- 0011: trainer_routes.get_feedback_batch?trainer_id= pages through
+-- the logs a trainer commented on in log_id order
+-- =========================================================
+
+CREATE INDEX idx_tf_trainer_log
+    ON Trainer_Feedback (trainer_id, log_id);
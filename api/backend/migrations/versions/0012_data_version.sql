@@ -0,0 +1,20 @@
+-- =========================================================
+-- 0012: per-domain data versions, bumped by every writer and
+-- read by @validated_by(version_query(...)) (backend/versions.py)
+-- =========================================================
+
+CREATE TABLE Data_Version (
+  domain  VARCHAR(32)     NOT NULL,
+  version BIGINT UNSIGNED NOT NULL,
+  PRIMARY KEY (domain)
+);
+
+-- seeded with the current time in microseconds, so a recreated
+-- table never repeats a version an old ETag was derived from
+INSERT INTO Data_Version (domain, version)
+VALUES ('feedback',       FLOOR(UNIX_TIMESTAMP(NOW(6)) * 1000000)),
+       ('health_metrics', FLOOR(UNIX_TIMESTAMP(NOW(6)) * 1000000)),
+       ('people',         FLOOR(UNIX_TIMESTAMP(NOW(6)) * 1000000)),
+       ('programs',       FLOOR(UNIX_TIMESTAMP(NOW(6)) * 1000000)),
+       ('templates',      FLOOR(UNIX_TIMESTAMP(NOW(6)) * 1000000)),
+       ('workout_logs',   FLOOR(UNIX_TIMESTAMP(NOW(6)) * 1000000));
@@ -0,0 +1,30 @@
+#------------------------------------------------------------
+# `flask --app backend_app model ...` commands
+#------------------------------------------------------------
+import json
+
+import click
+from flask.cli import AppGroup
+
+from backend.ml_models import model01
+
+model_cli = AppGroup('model', help='Train and evaluate the prediction model.')
+
+
+@model_cli.command('train')
+@click.option('--test-fraction', default=0.2, show_default=True,
+              help='Share of rows held out for testing (hash split on metric_id).')
+@click.option('--chunk-rows', default=5000, show_default=True,
+              help='Rows fetched from MySQL per chunk.')
+def train_command(test_fraction, chunk_rows):
+    """Fit model01 from the database and store a new parameter set."""
+    report = model01.train(test_fraction=test_fraction, chunk_rows=chunk_rows)
+    click.echo(json.dumps(report, indent=2))
+
+
+@model_cli.command('test')
+@click.option('--test-fraction', default=0.2, show_default=True)
+@click.option('--chunk-rows', default=5000, show_default=True)
+def test_command(test_fraction, chunk_rows):
+    """Score the stored parameters on the held-out rows."""
+    click.echo(json.dumps(model01.test(test_fraction=test_fraction, chunk_rows=chunk_rows), indent=2))
@@ -2,38 +2,103 @@
 model01.py is an example of how to access model parameter values that you are storing
 in the database and use them to make a prediction when a route associated with prediction is
 accessed. 
+
+The parameters are held in memory by a ModelRegistry (see registry.py), so a
+prediction does not query the database unless a newer set of parameters may
+have been stored.
 """
-from backend.db_connection import db
 import numpy as np
 # import logging
 
 from flask import current_app
 
-def train():
+from backend.db_connection import db
+from backend.ml_models.registry import ModelRegistry
+from backend.ml_models.training import accumulate
+
+registry = ModelRegistry('model1_params')
+
+# One row per health measurement that has a body fat reading:
+#   var01 = completed workouts in the 28 days before the measurement
+#   var02 = minutes of those workouts
+#   target = body_fat_percentage
+# The LEFT JOIN is served by idx_cwl_client_status_date.
+FEATURES_QUERY = """
+  SELECT
+    hm.metric_id,
+    hm.body_fat_percentage AS target,
+    COUNT(cwl.log_id) AS var01,
+    COALESCE(SUM(cwl.duration_minutes), 0) AS var02
+  FROM Health_Metrics hm
+  LEFT JOIN Client_Workout_Log cwl
+    ON cwl.client_id = hm.client_id
+   AND cwl.completion_status = 'completed'
+   AND cwl.workout_date >= hm.record_date - INTERVAL 28 DAY
+   AND cwl.workout_date < hm.record_date
+  WHERE hm.body_fat_percentage IS NOT NULL
+  GROUP BY hm.metric_id, hm.body_fat_percentage
+"""
+FEATURES = ['var01', 'var02']
+
+def _fit(test_fraction, chunk_rows):
+  return accumulate(db.get_db(), FEATURES_QUERY, 'metric_id', FEATURES, 'target',
+                    test_fraction=test_fraction, chunk_rows=chunk_rows)
+
+def train(test_fraction=0.2, chunk_rows=5000):
   """
-  You could have a function that performs training from scratch as well as testing (see below).
-  It could be activated from a route for an "administrator role" or something similar. 
+  Fits the regression from scratch in one streaming pass (memory stays bounded by
+  chunk_rows), scores it on the held-out rows and stores the coefficients as a new
+  model1_params row. Returns a report with the new sequence_number and timings.
   """
-  return 'Training the model'
+  train_stats, test_stats, timings = _fit(test_fraction, chunk_rows)
+  if train_stats.n == 0:
+    raise ValueError('no training rows (Health_Metrics has no body_fat_percentage values)')
+
+  beta = train_stats.solve()
+  beta_vals = '[' + ', '.join(repr(float(b)) for b in beta) + ']'
+
+  conn = db.get_db()
+  cursor = conn.cursor()
+  cursor.execute('INSERT INTO model1_params (beta_vals) VALUES (%s)', (beta_vals,))
+  sequence_number = cursor.lastrowid
+  conn.commit()
+  cursor.close()
 
-def test():
-  return 'Testing the model'
+  report = {
+    "sequence_number": sequence_number,
+    "beta": beta.tolist(),
+    "n_train": train_stats.n,
+    "n_test": test_stats.n,
+    "train": train_stats.score(beta),
+    "test": test_stats.score(beta),
+    "timings": timings,
+  }
+  current_app.logger.info(f'model01.train(): {report}')
+
+  # this process starts predicting with the new parameters right away;
+  # the others pick them up on their next poll
+  registry.reload()
+  return report
+
+def test(test_fraction=0.2, chunk_rows=5000):
+  """
+  Scores the parameters currently in use on the held-out split (the same rows
+  train() leaves out for the same test_fraction).
+  """
+  beta = registry.params()
+  _, test_stats, timings = _fit(test_fraction, chunk_rows)
+  return {
+    "sequence_number": registry.info()["sequence_number"],
+    "n_test": test_stats.n,
+    "test": test_stats.score(beta),
+    "timings": timings,
+  }
 
 def predict(var01, var02):
   """
-  Retreives model parameters from the database and uses them for real-time prediction
+  Uses the cached model parameters for real-time prediction of a single row
   """
-  # get a database cursor 
-  cursor = db.get_db().cursor()
-  # get the model params from the database
-  query = 'SELECT beta_vals FROM model1_params ORDER BY sequence_number DESC LIMIT 1'
-  cursor.execute(query)
-  return_val = cursor.fetchone()
-  params = return_val['beta_vals']
-  
-  # turn the values from the database into a numpy array
-  params_array = np.array(list(map(float, params[1:-1].split(','))))
-  current_app.logger.info(f'params array = {params_array}')
+  params_array = registry.params()
 
   # turn the variables sent from the UI into a numpy array
   input_array = np.array([1.0, float(var01), float(var02)])
@@ -43,3 +108,15 @@ def predict(var01, var02):
 
   return prediction
 
+def predict_many(X):
+  """
+  Scores an N x 2 matrix of (var01, var02) rows with a single matrix multiply
+  """
+  X = np.asarray(X, dtype=np.float64)
+  if X.ndim != 2 or X.shape[1] != 2:
+    raise ValueError(f"expected an N x 2 matrix of (var01, var02) rows, got shape {X.shape}")
+
+  # intercept column first, matching the order of beta_vals
+  design = np.column_stack((np.ones(len(X)), X))
+
+  return design @ registry.params()
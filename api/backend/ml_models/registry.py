@@ -0,0 +1,110 @@
+"""
+registry.py keeps the latest parameters of a model in memory.
+
+The parameters are read from the database once and parsed into a NumPy
+array. After that a background thread per process polls the table (a
+primary key lookup of the newest sequence_number) every
+MODEL_POLL_INTERVAL seconds and re-reads the beta values only when a
+newer sequence_number shows up, so a prediction never waits on the
+database. A failed poll is logged and the current parameters stay in
+use. Set MODEL_POLL_INTERVAL to 0 to stop polling and rely on reload().
+"""
+import os
+import threading
+
+import numpy as np
+from flask import current_app
+
+from backend.db_connection import db
+
+
+class ModelNotTrained(LookupError):
+  pass
+
+
+def parse_beta_vals(text):
+  """'[0.5, 1.25, -3.0]' -> array([ 0.5 ,  1.25, -3.  ])"""
+  return np.array(text.strip().strip('[]').split(','), dtype=np.float64)
+
+
+class ModelRegistry:
+  def __init__(self, table):
+    self.table = table
+    self._lock = threading.Lock()
+    self._params = None
+    self._sequence_number = None
+    self._poller_pid = None
+    self._stopped = threading.Event()
+    self.loads = 0
+    self.poll_failures = 0
+
+  def params(self):
+    """Return the newest parameter vector; only the first call reads the database."""
+    params = self._params
+    if params is not None:
+      return params
+
+    with self._lock:
+      # another thread may have loaded them while we waited for the lock
+      if self._params is None:
+        self._refresh()
+      self._start_polling()
+      return self._params
+
+  def reload(self):
+    """Re-read the newest parameters now. Returns the sequence_number in use."""
+    with self._lock:
+      self._refresh(force=True)
+      return self._sequence_number
+
+  def stop(self):
+    """Stop this process's poller (it is a daemon thread, so exiting needs no call)."""
+    self._stopped.set()
+
+  def info(self):
+    return {
+      "table": self.table,
+      "sequence_number": self._sequence_number,
+      "n_params": None if self._params is None else int(self._params.size),
+      "loads": self.loads,
+      "poll_failures": self.poll_failures,
+    }
+
+  def _start_polling(self):
+    # caller holds self._lock; started lazily, so each forked worker gets its own
+    interval = float(current_app.config.get('MODEL_POLL_INTERVAL', 30))
+    if interval <= 0 or self._poller_pid == os.getpid():
+      return
+    self._poller_pid = os.getpid()
+    self._stopped.clear()
+    threading.Thread(target=self._poll, args=(current_app._get_current_object(), interval),
+                     name=f'{self.table}-poller', daemon=True).start()
+
+  def _poll(self, app, interval):
+    while not self._stopped.wait(interval):
+      with app.app_context():
+        try:
+          with self._lock:
+            self._refresh()
+        except Exception as e:
+          # keep predicting with what we have and try again next interval
+          self.poll_failures += 1
+          app.logger.warning(f'{self.table}: polling for new parameters failed: {e}')
+
+  def _refresh(self, force=False):
+    cursor = db.get_db().cursor()
+    try:
+      cursor.execute(f'SELECT MAX(sequence_number) AS sequence_number FROM {self.table}')
+      row = cursor.fetchone()
+      latest = row['sequence_number'] if row else None
+      if latest is None:
+        raise ModelNotTrained(f'{self.table} holds no parameters yet')
+
+      if force or latest != self._sequence_number:
+        cursor.execute(f'SELECT beta_vals FROM {self.table} WHERE sequence_number = %s', (latest,))
+        self._params = parse_beta_vals(cursor.fetchone()['beta_vals'])
+        self._sequence_number = latest
+        self.loads += 1
+        current_app.logger.info(f'{self.table}: loaded parameters #{latest} = {self._params}')
+    finally:
+      cursor.close()
@@ -0,0 +1,107 @@
+"""
+training.py holds the out-of-core pieces used to fit a linear model.
+
+Rows are read from MySQL with an unbuffered (server-side) cursor in chunks
+of `chunk_rows`, and each chunk is folded into the sufficient statistics
+of ordinary least squares (X'X, X'y, y'y, n). Memory therefore depends on
+the number of features, not the number of rows. The statistics of the
+held-out rows are accumulated in the same pass, which is enough to score
+the fitted coefficients on them afterwards without a second scan.
+"""
+import time
+
+import numpy as np
+
+from backend.db_connection.instrumented import InstrumentedSSDictCursor
+
+
+class NormalEquations:
+  """Running X'X / X'y / y'y for y ~ b0 + b1*x1 + ... (intercept added here)."""
+
+  def __init__(self, n_features):
+    k = n_features + 1
+    self.xtx = np.zeros((k, k))
+    self.xty = np.zeros(k)
+    self.yty = 0.0
+    self.n = 0
+
+  def add(self, X, y):
+    X = np.column_stack((np.ones(len(X)), X))
+    self.xtx += X.T @ X
+    self.xty += X.T @ y
+    self.yty += float(y @ y)
+    self.n += len(y)
+
+  def solve(self):
+    # lstsq instead of solve() so a rank-deficient X'X still gives an answer
+    beta, *_ = np.linalg.lstsq(self.xtx, self.xty, rcond=None)
+    return beta
+
+  def score(self, beta):
+    """RMSE and R^2 of `beta` on the accumulated rows."""
+    if self.n == 0:
+      return {"rmse": None, "r2": None}
+    sse = self.yty - 2.0 * beta @ self.xty + beta @ self.xtx @ beta
+    sse = max(float(sse), 0.0)
+    mean = self.xty[0] / self.n             # first column is the intercept
+    sst = self.yty - self.n * mean * mean
+    return {
+      "rmse": float(np.sqrt(sse / self.n)),
+      "r2": float(1.0 - sse / sst) if sst > 0 else None,
+    }
+
+
+def in_test_split(ids, test_fraction):
+  """Deterministic hash split on the row id, so train/test never reshuffle."""
+  ids = np.asarray(ids, dtype=np.uint64)
+  bucket = (ids * np.uint64(2654435761)) % np.uint64(1000)   # Knuth multiplicative hash
+  return bucket < np.uint64(int(round(test_fraction * 1000)))
+
+
+def stream_chunks(conn, query, params=(), chunk_rows=5000):
+  """Yield lists of dict rows from `query` without buffering the result."""
+  cursor = conn.cursor(InstrumentedSSDictCursor)
+  try:
+    cursor.execute(query, params)
+    while True:
+      rows = cursor.fetchmany(chunk_rows)
+      if not rows:
+        break
+      yield rows
+  finally:
+    cursor.close()
+
+
+def accumulate(conn, query, id_column, feature_columns, target_column,
+               test_fraction=0.2, chunk_rows=5000):
+  """
+  One streaming pass over `query`, split into train/test NormalEquations.
+  Returns (train, test, timings).
+  """
+  train = NormalEquations(len(feature_columns))
+  test = NormalEquations(len(feature_columns))
+  started = time.perf_counter()
+  fit_seconds = 0.0
+  chunks = 0
+
+  for rows in stream_chunks(conn, query, chunk_rows=chunk_rows):
+    t0 = time.perf_counter()
+    data = np.array([[row[id_column], row[target_column]] + [row[c] for c in feature_columns]
+                     for row in rows], dtype=np.float64)
+    held_out = in_test_split(data[:, 0], test_fraction)
+    train.add(data[~held_out, 2:], data[~held_out, 1])
+    test.add(data[held_out, 2:], data[held_out, 1])
+    fit_seconds += time.perf_counter() - t0
+    chunks += 1
+
+  total = time.perf_counter() - started
+  rows = train.n + test.n
+  timings = {
+    "chunks": chunks,
+    "rows": rows,
+    "seconds_total": round(total, 4),
+    "seconds_fetching": round(total - fit_seconds, 4),
+    "seconds_fitting": round(fit_seconds, 4),
+    "rows_per_second": round(rows / total, 1) if total > 0 else None,
+  }
+  return train, test, timings
@@ -0,0 +1,93 @@
+#------------------------------------------------------------
+# Shared keyset (cursor) pagination for list endpoints.
+#
+# A page is requested with ?limit=N&after=<token>. The token is an
+# opaque, URL-safe encoding of the sort key of the last row on the
+# previous page, so the next page is an index range scan
+# ("rows after this key") instead of an ever-growing OFFSET.
+#
+# Responses look like:
+#   {"items": [...], "limit": 50, "next": "/system_admin/system_logs?limit=50&after=..."}
+# where "next" is null on the last page.
+#------------------------------------------------------------
+import base64
+import datetime
+import json
+
+from flask import request, url_for
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+
+class PaginationError(ValueError):
+    pass
+
+
+def encode_cursor(values):
+    plain = []
+    for v in values:
+        if isinstance(v, datetime.datetime):
+            plain.append(v.isoformat(sep=' '))
+        elif isinstance(v, datetime.date):
+            plain.append(v.isoformat())
+        else:
+            plain.append(v)
+    raw = json.dumps(plain, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token, size):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, UnicodeError):
+        raise PaginationError("invalid 'after' cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise PaginationError("invalid 'after' cursor")
+    return values
+
+
+def page_args(key_size):
+    """Read ?limit and ?after from the current request -> (limit, cursor values or None)."""
+    try:
+        limit = int(request.args.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise PaginationError("'limit' must be an integer")
+    if limit < 1:
+        raise PaginationError("'limit' must be positive")
+    limit = min(limit, MAX_LIMIT)
+
+    token = request.args.get('after')
+    return limit, decode_cursor(token, key_size) if token else None
+
+
+def keyset_predicate(columns, cursor, descending=False):
+    """
+    SQL (and params) selecting rows strictly after `cursor` in ORDER BY `columns`.
+    Written as an expanded OR chain, which MySQL turns into an index range.
+    """
+    op = '<' if descending else '>'
+    clauses, params = [], []
+    for i, column in enumerate(columns):
+        parts = [f"{c} = %s" for c in columns[:i]] + [f"{column} {op} %s"]
+        clauses.append('(' + ' AND '.join(parts) + ')')
+        params.extend(cursor[:i])
+        params.append(cursor[i])
+    return '(' + ' OR '.join(clauses) + ')', params
+
+
+def page_response(rows, limit, key_columns):
+    """Build the response body from up to limit + 1 fetched rows."""
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_url = None
+    if has_more:
+        last = rows[-1]
+        args = request.args.to_dict()
+        args['limit'] = limit
+        args['after'] = encode_cursor([last[c] for c in key_columns])
+        next_url = url_for(request.endpoint, **(request.view_args or {}), **args)
+
+    return {"items": rows, "limit": limit, "next": next_url}
@@ -0,0 +1,190 @@
+#------------------------------------------------------------
+# On-demand request profiling.
+#
+# A request is profiled when it carries the admin token
+# (`X-Profile: <PROFILE_TOKEN>` or `?profile=<PROFILE_TOKEN>`) or is
+# picked at random with probability PROFILE_SAMPLE_RATE. The result
+# is written to PROFILE_DIR as either
+#
+#   collapsed - stacks sampled every PROFILE_INTERVAL_MS from a side
+#               thread, one "frame;frame;frame count" line per stack,
+#               ready for flamegraph.pl / speedscope / inferno
+#   pstats    - a cProfile dump for `python -m pstats` or snakeviz
+#
+# named <timestamp>_<endpoint>_<ms>ms.<format>. Only one request per
+# process is profiled at a time; others run unprofiled meanwhile.
+#------------------------------------------------------------
+import cProfile
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime
+
+from flask import g, request
+
+FORMATS = ('collapsed', 'pstats')
+
+_busy = threading.Lock()
+
+
+class StackSampler:
+    """Samples the stack of one thread at a fixed interval and counts collapsed stacks."""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profile-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{os.path.basename(code.co_filename)}:{code.co_name}:{code.co_firstlineno}')
+                frame = frame.f_back
+            key = ';'.join(reversed(stack))
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def dump(self, path):
+        with open(path, 'w') as f:
+            for stack, count in sorted(self.counts.items()):
+                f.write(f'{stack} {count}\n')
+
+
+def _requested(app):
+    token = app.config['PROFILE_TOKEN']
+    if token:
+        given = request.headers.get('X-Profile') or request.args.get('profile')
+        if given and hmac.compare_digest(given, token):
+            return True
+    rate = app.config['PROFILE_SAMPLE_RATE']
+    return rate > 0 and random.random() < rate
+
+
+def _start(app):
+    if request.endpoint in (None, 'static', 'metrics') or not _requested(app):
+        return
+    if not _busy.acquire(blocking=False):
+        return
+
+    fmt = request.headers.get('X-Profile-Format') or request.args.get('profile_format') \
+        or app.config['PROFILE_FORMAT']
+    if fmt not in FORMATS:
+        fmt = app.config['PROFILE_FORMAT']
+
+    try:
+        if fmt == 'pstats':
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            profiler = StackSampler(threading.get_ident(), app.config['PROFILE_INTERVAL_MS'] / 1000.0)
+            profiler.start()
+    except ValueError:
+        # another profiler (e.g. a debugger) already owns the interpreter hook
+        _busy.release()
+        return
+    g._profile = (fmt, profiler, time.perf_counter(), datetime.now())
+
+
+def _finish(app, response):
+    state = g.pop('_profile', None)
+    if state is None:
+        return response
+    fmt, profiler, started, started_at = state
+    try:
+        if fmt == 'pstats':
+            profiler.disable()
+        else:
+            profiler.stop()
+        elapsed_ms = int((time.perf_counter() - started) * 1000)
+
+        directory = app.config['PROFILE_DIR']
+        os.makedirs(directory, exist_ok=True)
+        name = f"{started_at.strftime('%Y%m%dT%H%M%S.%f')}_{request.endpoint}_{elapsed_ms}ms.{fmt}"
+        path = os.path.join(directory, name)
+        if fmt == 'pstats':
+            profiler.dump_stats(path)
+        else:
+            profiler.dump(path)
+        _prune(directory, app.config['PROFILE_KEEP'])
+        response.headers['X-Profile-File'] = name
+    except OSError as e:
+        app.logger.warning(f'profiling: could not write profile: {e}')
+    finally:
+        _busy.release()
+    return response
+
+
+def _abandon(exception):
+    # after_request did not run (unhandled error); never leave the lock held
+    state = g.pop('_profile', None)
+    if state is not None:
+        fmt, profiler = state[0], state[1]
+        if fmt == 'pstats':
+            profiler.disable()
+        else:
+            profiler.stop()
+        _busy.release()
+
+
+def _prune(directory, keep):
+    files = list_profiles(directory)
+    for entry in files[keep:]:
+        try:
+            os.remove(os.path.join(directory, entry['name']))
+        except OSError:
+            pass
+
+
+def list_profiles(directory, limit=None):
+    """Profiles in `directory`, newest first."""
+    try:
+        names = [n for n in os.listdir(directory) if n.rsplit('.', 1)[-1] in FORMATS]
+    except FileNotFoundError:
+        return []
+
+    profiles = []
+    for name in sorted(names, reverse=True)[:limit]:
+        stem, fmt = name.rsplit('.', 1)
+        parts = stem.split('_')
+        try:
+            stat = os.stat(os.path.join(directory, name))
+        except OSError:
+            continue
+        profiles.append({
+            "name": name,
+            "format": fmt,
+            "endpoint": '_'.join(parts[1:-1]),
+            "duration_ms": int(parts[-1][:-2]) if parts[-1].endswith('ms') else None,
+            "created_at": datetime.fromtimestamp(stat.st_mtime).isoformat(timespec='seconds'),
+            "bytes": stat.st_size,
+        })
+    return profiles
+
+
+def init_app(app):
+    app.config.setdefault('PROFILE_TOKEN', '')
+    app.config.setdefault('PROFILE_SAMPLE_RATE', 0.0)
+    app.config.setdefault('PROFILE_FORMAT', 'collapsed')
+    app.config.setdefault('PROFILE_INTERVAL_MS', 2.0)
+    app.config.setdefault('PROFILE_DIR', '/tmp/fitflow-profiles')
+    app.config.setdefault('PROFILE_KEEP', 200)
+
+    app.before_request(lambda: _start(app))
+    app.after_request(lambda response: _finish(app, response))
+    app.teardown_request(_abandon)
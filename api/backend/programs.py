@@ -0,0 +1,150 @@
+#------------------------------------------------------------
+# A client's current program, loaded with key lookups only.
+#
+# Client_Current_Program points every client at their newest
+# program (highest program_id); the trainer routes refresh it when
+# programs are assigned or removed. Workout_Template_Document holds
+# each template with its exercises as one JSON document, built on
+# first read and dropped (in the writer's transaction) whenever the
+# template, its exercise list or one of its exercises changes.
+#
+# The document is built with locking reads (FOR SHARE), so a build
+# either waits for a concurrent writer to commit and sees its change,
+# or finishes first and has its document dropped by that writer.
+#------------------------------------------------------------
+import json
+
+# columns of one flattened row, as served by /client_specific_workout_program/exercises
+TEMPLATE_FIELDS = ("workout_id", "workout_name", "workout_description", "duration_minutes", "difficulty")
+EXERCISE_FIELDS = ("exercise_id", "exercise_name", "sets", "reps", "rest_period")
+
+
+# ---------------------------------------------------------
+# current-program pointer
+# ---------------------------------------------------------
+def refresh_current_program(cursor, client_ids):
+    """Re-point each client at their newest remaining program (or drop the pointer)."""
+    for client_id in sorted(set(client_ids)):
+        # MAX(program_id) is one probe of the client_id FK index
+        cursor.execute("""
+            SELECT MAX(program_id) AS program_id
+            FROM Client_Specific_Workout_Program
+            WHERE client_id = %s
+        """, (client_id,))
+        program_id = cursor.fetchone()['program_id']
+        if program_id is None:
+            cursor.execute("DELETE FROM Client_Current_Program WHERE client_id = %s", (client_id,))
+        else:
+            cursor.execute("""
+                INSERT INTO Client_Current_Program (client_id, program_id)
+                VALUES (%s, %s) AS d
+                ON DUPLICATE KEY UPDATE program_id = d.program_id
+            """, (client_id, program_id))
+
+
+def program_clients(cursor, where, params=()):
+    """client_ids owning the programs matching `where` (read before a delete that cascades to them)."""
+    cursor.execute(f"SELECT DISTINCT client_id FROM Client_Specific_Workout_Program WHERE {where}", params)
+    return [row['client_id'] for row in cursor.fetchall()]
+
+
+def rebuild_current_programs(cursor):
+    cursor.execute("DELETE FROM Client_Current_Program")
+    cursor.execute("""
+        INSERT INTO Client_Current_Program (client_id, program_id)
+        SELECT client_id, MAX(program_id)
+        FROM Client_Specific_Workout_Program
+        GROUP BY client_id
+    """)
+    return cursor.rowcount
+
+
+# ---------------------------------------------------------
+# template documents
+# ---------------------------------------------------------
+def drop_template_documents(cursor, workout_ids):
+    workout_ids = sorted(set(workout_ids))
+    if workout_ids:
+        cursor.execute(
+            f"DELETE FROM Workout_Template_Document WHERE workout_id IN ({', '.join(['%s'] * len(workout_ids))})",
+            workout_ids,
+        )
+
+
+def drop_exercise_documents(cursor, exercise_id):
+    """Drop the documents of every template that uses `exercise_id` (before deleting it)."""
+    cursor.execute("""
+        DELETE d
+        FROM Workout_Template_Document d
+        JOIN Workout_Specific_Exercise wse ON wse.workout_id = d.workout_id
+        WHERE wse.exercise_id = %s
+    """, (exercise_id,))
+
+
+def build_template_document(cursor, workout_id):
+    cursor.execute("""
+        SELECT
+            w.workout_id,
+            w.name AS workout_name,
+            w.description AS workout_description,
+            w.duration_minutes,
+            w.difficulty,
+            e.exercise_id,
+            e.name AS exercise_name,
+            wse.sets,
+            wse.reps,
+            wse.rest_period
+        FROM Workout_Session_Template w
+        JOIN Workout_Specific_Exercise wse
+            ON w.workout_id = wse.workout_id
+        JOIN Exercise e
+            ON wse.exercise_id = e.exercise_id
+        WHERE w.workout_id = %s
+        ORDER BY wse.workout_exercise_id
+        FOR SHARE
+    """, (workout_id,))
+    rows = cursor.fetchall()
+
+    document = {"exercises": [{f: row[f] for f in EXERCISE_FIELDS} for row in rows]}
+    if rows:
+        document.update({f: rows[0][f] for f in TEMPLATE_FIELDS})
+    else:
+        document["workout_id"] = workout_id
+
+    cursor.execute("""
+        INSERT INTO Workout_Template_Document (workout_id, document)
+        VALUES (%s, %s) AS d
+        ON DUPLICATE KEY UPDATE document = d.document
+    """, (workout_id, json.dumps(document, default=str)))
+    return document
+
+
+def load_current_program(cursor, client_id):
+    """
+    Flattened rows (one per exercise) of the client's current program,
+    from a primary-key lookup on the pointer, program and document
+    tables; the document is built here the first time it is needed.
+    """
+    cursor.execute("""
+        SELECT p.program_id, p.name AS program_name, p.workout_id, d.document
+        FROM Client_Current_Program c
+        JOIN Client_Specific_Workout_Program p ON p.program_id = c.program_id
+        LEFT JOIN Workout_Template_Document d ON d.workout_id = p.workout_id
+        WHERE c.client_id = %s
+    """, (client_id,))
+    program = cursor.fetchone()
+    if program is None:
+        return []
+
+    if program['document'] is None:
+        document = build_template_document(cursor, program['workout_id'])
+        cursor.connection.commit()
+    else:
+        document = json.loads(program['document'])
+
+    head = {
+        "program_id": program['program_id'],
+        "program_name": program['program_name'],
+        **{f: document.get(f) for f in TEMPLATE_FIELDS},
+    }
+    return [{**head, **exercise} for exercise in document['exercises']]
@@ -1,5 +1,12 @@
-from flask import Flask
+from flask import Flask, jsonify
 from backend.db_connection import db
+from backend.db_connection.pool import PoolTimeout
+from backend.cache import response_cache
+from backend import conditional, metrics, profiling
+from backend.pagination import PaginationError
+from backend.migrations.cli import migrations_cli
+from backend.rollups.cli import rollups_cli
+from backend.ml_models.cli import model_cli
 
 from .system_admin.admin_routes import system_admin
 from .health_analyst.health_analyst_routes import health_analyst
@@ -33,10 +40,73 @@ def create_app():
     app.config['MYSQL_DATABASE_PORT'] = int(os.getenv('DB_PORT').strip())
     app.config['MYSQL_DATABASE_DB'] = os.getenv('DB_NAME').strip()  # Change this to your DB name
 
+    # connection pool sizing; connections are opened lazily on first use
+    app.config['MYSQL_POOL_MIN_SIZE'] = int(os.getenv('DB_POOL_MIN_SIZE', '1'))
+    app.config['MYSQL_POOL_MAX_SIZE'] = int(os.getenv('DB_POOL_MAX_SIZE', '10'))
+    app.config['MYSQL_POOL_WAIT_TIMEOUT'] = float(os.getenv('DB_POOL_WAIT_TIMEOUT', '5'))
+    app.config['MYSQL_POOL_MAX_IDLE_TIME'] = float(os.getenv('DB_POOL_MAX_IDLE_TIME', '300'))
+    app.config['MYSQL_POOL_PING_INTERVAL'] = float(os.getenv('DB_POOL_PING_INTERVAL', '30'))
+
     # Initialize the database object with the settings above. 
-    app.logger.info('current_app(): starting the database connection')
+    app.logger.info('current_app(): starting the database connection pool')
     db.init_app(app)
 
+    # response cache for read-mostly GET endpoints (memory | redis | none)
+    app.config['RESPONSE_CACHE_BACKEND'] = os.getenv('RESPONSE_CACHE_BACKEND', 'memory').strip()
+    app.config['RESPONSE_CACHE_TTL'] = int(os.getenv('RESPONSE_CACHE_TTL', '60'))
+    app.config['RESPONSE_CACHE_MAX_ENTRIES'] = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '1024'))
+    app.config['REDIS_URL'] = os.getenv('REDIS_URL', 'redis://localhost:6379/0').strip()
+    response_cache.init_app(app)
+
+    # seconds between checks for newer ML model parameters (0 = only on reload)
+    app.config['MODEL_POLL_INTERVAL'] = float(os.getenv('MODEL_POLL_INTERVAL', '30'))
+
+    # on-demand profiling: `X-Profile: <PROFILE_TOKEN>` (or ?profile=) profiles
+    # one request, PROFILE_SAMPLE_RATE picks requests at random. Registered
+    # first so the profile spans the other request hooks too.
+    app.config['PROFILE_TOKEN'] = os.getenv('PROFILE_TOKEN', '').strip()
+    app.config['PROFILE_SAMPLE_RATE'] = float(os.getenv('PROFILE_SAMPLE_RATE', '0'))
+    app.config['PROFILE_FORMAT'] = os.getenv('PROFILE_FORMAT', 'collapsed').strip()
+    app.config['PROFILE_DIR'] = os.getenv('PROFILE_DIR', '/tmp/fitflow-profiles').strip()
+    profiling.init_app(app)
+
+    # per-route latency, status and SQL timings on GET /metrics; statements
+    # slower than SLOW_QUERY_MS are logged with their route (0 disables).
+    # Registered before `conditional` so it sees the final (e.g. 304) status.
+    app.config['SLOW_QUERY_MS'] = float(os.getenv('SLOW_QUERY_MS', '500'))
+    # shared by the gunicorn workers so any of them can answer a scrape with
+    # totals over all of them (gunicorn.conf.py sets it; empty = this process only)
+    app.config['METRICS_DIR'] = os.getenv('METRICS_DIR', '').strip()
+    metrics.init_app(app, pool_stats=db.pool_stats)
+
+    # ETag on every GET; matching If-None-Match revalidations get a 304
+    conditional.init_app(app)
+
+    # an exhausted pool is a temporary condition, so answer 503 instead of 500
+    @app.errorhandler(PoolTimeout)
+    def handle_pool_timeout(e):
+        app.logger.warning(f'create_app(): {e}')
+        return jsonify({"error": "database busy, please retry"}), 503
+
+    # bad ?limit / ?after values on paginated list endpoints
+    @app.errorhandler(PaginationError)
+    def handle_pagination_error(e):
+        return jsonify({"error": str(e)}), 400
+
+    # schema migrations: `flask --app backend_app migrations upgrade`
+    app.cli.add_command(migrations_cli)
+    # aggregate tables: `flask --app backend_app rollups rebuild`
+    app.cli.add_command(rollups_cli)
+    # model training: `flask --app backend_app model train`
+    app.cli.add_command(model_cli)
+    if os.getenv('DB_AUTO_MIGRATE', '0').strip() == '1':
+        from backend import migrations
+        try:
+            with app.app_context(), db.connection() as conn:
+                migrations.upgrade(conn, log=app.logger.info)
+        except Exception as e:
+            app.logger.error(f'create_app(): automatic migration failed: {e}')
+
     # Register the routes from each Blueprint with the app object
     # and give a url prefix to each
     app.logger.info('create_app(): registering blueprints with Flask app object.')
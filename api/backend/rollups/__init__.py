@@ -0,0 +1,126 @@
+#------------------------------------------------------------
+# Incrementally maintained aggregate tables.
+#
+# Every route that inserts, updates or deletes Client_Workout_Log
+# or Health_Metrics rows reports the affected rows *before* and
+# *after* the change, in the same transaction:
+#
+#   before = fetch_workout_logs(cursor, "log_id = %s", (log_id,))
+#   ... UPDATE / DELETE ...
+#   after = fetch_workout_logs(cursor, "log_id = %s", (log_id,))
+#   workout_logs_changed(cursor, before, after)
+#
+# Each maintainer subtracts the "before" rows and adds the "after"
+# rows to its buckets, so reads are O(buckets) instead of
+# O(history). Snapshot maintainers (latest_health) re-read the
+# newest base row of each affected key instead. `flask --app
+# backend_app rollups rebuild` recomputes everything from the base
+# tables and `rollups reconcile` repairs only the keys that drifted.
+# Both hooks also bump the domain's data version (backend/versions).
+#
+# A recompute reads the base tables and replaces rollup rows, so a
+# route writing in between would have its deltas lost or counted
+# twice. rebuild_all() and reconcile(fix=True) therefore run under
+# quiesced(): LOCK TABLES holds every log/metric writer (and every
+# reader of the rollups) off until the recompute has committed.
+#------------------------------------------------------------
+from contextlib import contextmanager
+
+from backend import versions
+from . import (weekly_workouts, monthly_workouts, monthly_health, latest_health,
+               template_counts, program_counts)
+from .common import add_deltas, drift, repair
+
+# columns every workout-log maintainer may need
+WORKOUT_LOG_COLUMNS = "log_id, client_id, workout_id, workout_date, completion_status, duration_minutes"
+HEALTH_METRIC_COLUMNS = "metric_id, client_id, record_date, weight_kg, body_fat_percentage, heart_rate"
+
+WORKOUT_LOG_MAINTAINERS = [weekly_workouts, monthly_workouts, template_counts, program_counts]
+HEALTH_METRIC_MAINTAINERS = [monthly_health, latest_health]
+
+# what the SOURCE queries read
+BASE_TABLES = ("Client_Workout_Log", "Health_Metrics")
+
+
+def fetch_workout_logs(cursor, where, params=()):
+    """Lock and return the log rows matching `where` (call inside the write transaction)."""
+    cursor.execute(f"SELECT {WORKOUT_LOG_COLUMNS} FROM Client_Workout_Log WHERE {where} FOR UPDATE", params)
+    return cursor.fetchall()
+
+
+def fetch_health_metrics(cursor, where, params=()):
+    cursor.execute(f"SELECT {HEALTH_METRIC_COLUMNS} FROM Health_Metrics WHERE {where} FOR UPDATE", params)
+    return cursor.fetchall()
+
+
+def workout_logs_changed(cursor, before=(), after=()):
+    for maintainer in WORKOUT_LOG_MAINTAINERS:
+        maintainer.apply(cursor, before, after)
+    versions.bump(cursor, "workout_logs")
+
+
+def health_metrics_changed(cursor, before=(), after=()):
+    for maintainer in HEALTH_METRIC_MAINTAINERS:
+        maintainer.apply(cursor, before, after)
+    versions.bump(cursor, "health_metrics")
+
+
+@contextmanager
+def quiesced(cursor):
+    """
+    Lock the base tables for reading and the rollup tables (and
+    Data_Version) for writing, commit the block's work and unlock.
+    Needs autocommit off, like every connection from backend.db_connection.
+    """
+    locks = [f"{t} READ" for t in BASE_TABLES]
+    locks += [f"{m.TABLE} WRITE" for m in WORKOUT_LOG_MAINTAINERS + HEALTH_METRIC_MAINTAINERS]
+    locks.append("Data_Version WRITE")
+    cursor.execute(f"LOCK TABLES {', '.join(locks)}")
+    try:
+        yield
+        cursor.execute("COMMIT")
+    except BaseException:
+        # UNLOCK TABLES would commit the half-done work
+        cursor.execute("ROLLBACK")
+        raise
+    finally:
+        cursor.execute("UNLOCK TABLES")
+
+
+def rebuild_all(cursor):
+    """Recompute every aggregate table from the base tables and commit. Returns {table: rows}."""
+    counts = {}
+    with quiesced(cursor):
+        for maintainer in WORKOUT_LOG_MAINTAINERS + HEALTH_METRIC_MAINTAINERS:
+            counts[maintainer.TABLE] = maintainer.rebuild(cursor)
+        versions.bump(cursor, "workout_logs", "health_metrics")
+    return counts
+
+
+def reconcile(cursor, fix=True):
+    """
+    Compare every aggregate table with its base-table source and, with
+    `fix`, recompute the keys that differ (under quiesced(), committed).
+    Returns {table: [key, ...]}.
+
+    Without `fix` nothing is locked: the comparison reads one consistent
+    snapshot (REPEATABLE READ), in which the routes' writes and their
+    deltas are either both visible or both not.
+    """
+    if not fix:
+        return _reconcile(cursor, fix)
+    with quiesced(cursor):
+        return _reconcile(cursor, fix)
+
+
+def _reconcile(cursor, fix):
+    drifted = {}
+    for maintainer in WORKOUT_LOG_MAINTAINERS + HEALTH_METRIC_MAINTAINERS:
+        args = (cursor, maintainer.TABLE, maintainer.KEY_COLUMNS, maintainer.VALUE_COLUMNS, maintainer.SOURCE)
+        keys = drift(*args)
+        if keys and fix:
+            repair(*args, keys)
+        drifted[maintainer.TABLE] = keys
+    if fix and any(drifted.values()):
+        versions.bump(cursor, "workout_logs", "health_metrics")
+    return drifted
@@ -0,0 +1,38 @@
+#------------------------------------------------------------
+# `flask --app backend_app rollups ...` commands
+#------------------------------------------------------------
+import click
+from flask.cli import AppGroup
+
+from backend.db_connection import db
+from backend import rollups
+
+rollups_cli = AppGroup('rollups', help='Maintain the aggregate (rollup) tables.')
+
+
+@rollups_cli.command('rebuild')
+def rebuild_command():
+    """Recompute every rollup table from the base tables."""
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        counts = rollups.rebuild_all(cursor)
+        conn.commit()
+        cursor.close()
+    for table, rows in counts.items():
+        click.echo(f'{table}: {rows} rows')
+
+
+@rollups_cli.command('reconcile')
+@click.option('--dry-run', is_flag=True, help='Only report drift; exit 1 if any is found.')
+def reconcile_command(dry_run):
+    """Find rollup rows that no longer match the base tables and recompute them."""
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        drifted = rollups.reconcile(cursor, fix=not dry_run)
+        conn.commit()
+        cursor.close()
+    for table, keys in drifted.items():
+        sample = ', '.join(str(k if len(k) > 1 else k[0]) for k in keys[:10])
+        click.echo(f'{table}: {len(keys)} drifted' + (f' ({sample}{", ..." if len(keys) > 10 else ""})' if keys else ''))
+    if dry_run and any(drifted.values()):
+        raise SystemExit(1)
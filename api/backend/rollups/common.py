@@ -0,0 +1,92 @@
+#------------------------------------------------------------
+# Helpers shared by the rollup maintainers
+#------------------------------------------------------------
+import datetime
+
+
+def as_date(value):
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(str(value))
+
+
+def add_deltas(cursor, table, key_columns, value_columns, deltas):
+    """
+    Upsert {key_tuple: value_tuple} into `table`, adding the values to
+    whatever is already stored. One multi-row statement per call.
+    """
+    rows = [(*key, *values) for key, values in deltas.items() if any(values)]
+    if not rows:
+        return
+    columns = list(key_columns) + list(value_columns)
+    placeholders = '(' + ', '.join(['%s'] * len(columns)) + ')'
+    updates = ', '.join(f"{c} = {c} + d.{c}" for c in value_columns)
+    cursor.execute(
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES {', '.join([placeholders] * len(rows))} AS d "
+        f"ON DUPLICATE KEY UPDATE {updates}",
+        [v for row in rows for v in row],
+    )
+
+
+def status_counts(row):
+    """(total, completed, partial, not_started) contribution of one workout log."""
+    status = row['completion_status']
+    return (1,
+            1 if status == 'completed' else 0,
+            1 if status == 'partial' else 0,
+            1 if status == 'not_started' else 0)
+
+
+def rebuild_from(cursor, table, key_columns, value_columns, source):
+    """
+    Replace the contents of `table` with the rows of `source` (same columns, same order).
+    Only safe while the base tables can't change; see rollups.quiesced().
+    """
+    cursor.execute(f"DELETE FROM {table}")
+    cursor.execute(f"INSERT INTO {table} ({', '.join(list(key_columns) + list(value_columns))}) {source}")
+    return cursor.rowcount
+
+
+def drift(cursor, table, key_columns, value_columns, source):
+    """
+    Keys whose stored values differ from `source`: missing, different,
+    or stored without any source rows (unless every value is zero).
+    `source` must name its columns like the table does.
+    """
+    # two statements, each naming every table once, so they also run
+    # under LOCK TABLES (which won't let one query open a table twice)
+    on = ' AND '.join(f"{table}.{k} = s.{k}" for k in key_columns)
+    same = ' AND '.join(f"{table}.{v} <=> s.{v}" for v in value_columns)
+    nonzero = ' OR '.join(f"{table}.{v} <> 0" for v in value_columns)
+    cursor.execute(f"""
+        SELECT {', '.join('s.' + k for k in key_columns)}
+        FROM ({source}) s LEFT JOIN {table} ON {on}
+        WHERE {table}.{key_columns[0]} IS NULL OR NOT ({same})
+    """)
+    keys = [tuple(row[k] for k in key_columns) for row in cursor.fetchall()]
+    cursor.execute(f"""
+        SELECT {', '.join(f'{table}.{k}' for k in key_columns)}
+        FROM {table} LEFT JOIN ({source}) s ON {on}
+        WHERE s.{key_columns[0]} IS NULL AND ({nonzero})
+    """)
+    return keys + [tuple(row[k] for k in key_columns) for row in cursor.fetchall()]
+
+
+def repair(cursor, table, key_columns, value_columns, source, keys, batch=1000):
+    """Recompute the given keys of `table` from `source`."""
+    columns = list(key_columns) + list(value_columns)
+    tuple_sql = '(' + ', '.join(['%s'] * len(key_columns)) + ')'
+    key_list = '(' + ', '.join(key_columns) + ')'
+    for i in range(0, len(keys), batch):
+        chunk = keys[i:i + batch]
+        params = [v for key in chunk for v in key]
+        in_list = ', '.join([tuple_sql] * len(chunk))
+        cursor.execute(f"DELETE FROM {table} WHERE {key_list} IN ({in_list})", params)
+        cursor.execute(
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"SELECT {', '.join(columns)} FROM ({source}) s WHERE {key_list} IN ({in_list})",
+            params,
+        )
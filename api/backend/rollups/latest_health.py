@@ -0,0 +1,65 @@
+#------------------------------------------------------------
+# Newest Health_Metrics row per client (feeds /health_analyst/recent_metrics)
+#
+# "Newest" is the highest (record_date, metric_id), so two readings
+# on the same day resolve to the later insert instead of both rows.
+# A write re-reads the newest row of each affected client with one
+# backward probe of idx_hm_client_date (client_id, record_date [, metric_id]),
+# which also covers deleting or back-dating the current newest row.
+#------------------------------------------------------------
+from .common import rebuild_from
+
+TABLE = "Client_Latest_Health_Metric"
+KEY_COLUMNS = ("client_id",)
+VALUE_COLUMNS = ("metric_id", "record_date", "weight_kg", "body_fat_percentage", "heart_rate")
+
+_COLUMNS = KEY_COLUMNS + VALUE_COLUMNS
+
+
+def refresh(cursor, client_ids):
+    for client_id in sorted(client_ids):
+        # lock the snapshot row first so concurrent writers for the
+        # same client refresh one after the other
+        cursor.execute(f"SELECT metric_id FROM {TABLE} WHERE client_id = %s FOR UPDATE", (client_id,))
+        cursor.execute(f"""
+            SELECT {', '.join(_COLUMNS)}
+            FROM Health_Metrics
+            WHERE client_id = %s
+            ORDER BY record_date DESC, metric_id DESC
+            LIMIT 1
+            FOR UPDATE
+        """, (client_id,))
+        row = cursor.fetchone()
+        if row is None:
+            cursor.execute(f"DELETE FROM {TABLE} WHERE client_id = %s", (client_id,))
+            continue
+        updates = ', '.join(f"{c} = d.{c}" for c in VALUE_COLUMNS)
+        cursor.execute(
+            f"INSERT INTO {TABLE} ({', '.join(_COLUMNS)}) "
+            f"VALUES ({', '.join(['%s'] * len(_COLUMNS))}) AS d "
+            f"ON DUPLICATE KEY UPDATE {updates}",
+            [row[c] for c in _COLUMNS],
+        )
+
+
+def apply(cursor, before, after):
+    client_ids = {row['client_id'] for rows in (before, after) for row in rows}
+    if client_ids:
+        refresh(cursor, client_ids)
+
+
+SOURCE = f"""
+    SELECT {', '.join(_COLUMNS)}
+    FROM (
+      SELECT
+        {', '.join(_COLUMNS)},
+        ROW_NUMBER() OVER (PARTITION BY client_id
+                           ORDER BY record_date DESC, metric_id DESC) AS newest
+      FROM Health_Metrics
+    ) ranked
+    WHERE newest = 1
+"""
+
+
+def rebuild(cursor):
+    return rebuild_from(cursor, TABLE, KEY_COLUMNS, VALUE_COLUMNS, SOURCE)
@@ -0,0 +1,56 @@
+#------------------------------------------------------------
+# Client x calendar month health rollup (feeds /health_analyst/health_progression)
+#------------------------------------------------------------
+from collections import defaultdict
+
+from .common import add_deltas, as_date, rebuild_from
+
+TABLE = "Client_Monthly_Health_Rollup"
+KEY_COLUMNS = ("client_id", "year", "month")
+VALUE_COLUMNS = ("metric_count", "weight_sum", "weight_count",
+                 "body_fat_sum", "body_fat_count")
+
+
+def _bucket(row):
+    record_date = as_date(row['record_date'])
+    return (row['client_id'], record_date.year, record_date.month)
+
+
+def _contribution(row):
+    weight = row['weight_kg']
+    body_fat = row['body_fat_percentage']
+    return (1,
+            weight if weight is not None else 0,
+            1 if weight is not None else 0,
+            body_fat if body_fat is not None else 0,
+            1 if body_fat is not None else 0)
+
+
+def apply(cursor, before, after):
+    deltas = defaultdict(lambda: [0, 0, 0, 0, 0])
+    for sign, rows in ((-1, before), (1, after)):
+        for row in rows:
+            bucket = deltas[_bucket(row)]
+            for i, value in enumerate(_contribution(row)):
+                bucket[i] += sign * value
+    add_deltas(cursor, TABLE, KEY_COLUMNS, VALUE_COLUMNS, deltas)
+
+
+# record_month is the stored year * 100 + month; idx_hm_client_month covers this query
+SOURCE = """
+    SELECT
+      client_id,
+      record_month DIV 100 AS year,
+      record_month MOD 100 AS month,
+      COUNT(*) AS metric_count,
+      COALESCE(SUM(weight_kg), 0) AS weight_sum,
+      COUNT(weight_kg) AS weight_count,
+      COALESCE(SUM(body_fat_percentage), 0) AS body_fat_sum,
+      COUNT(body_fat_percentage) AS body_fat_count
+    FROM Health_Metrics
+    GROUP BY client_id, record_month
+"""
+
+
+def rebuild(cursor):
+    return rebuild_from(cursor, TABLE, KEY_COLUMNS, VALUE_COLUMNS, SOURCE)
@@ -0,0 +1,57 @@
+#------------------------------------------------------------
+# Client x calendar month workout rollup (feeds /client/dashboard)
+#
+# Lifetime totals are the sum of a client's months, so one primary-key
+# range read gives the dashboard both its monthly and lifetime figures.
+#------------------------------------------------------------
+from collections import defaultdict
+
+from .common import add_deltas, as_date, rebuild_from, status_counts
+
+TABLE = "Client_Monthly_Workout_Rollup"
+KEY_COLUMNS = ("client_id", "month")
+VALUE_COLUMNS = ("total_workouts", "completed_workouts", "partial_workouts", "not_started_workouts",
+                 "completed_duration_sum", "completed_duration_count")
+
+
+def _bucket(row):
+    date = as_date(row['workout_date'])
+    return (row['client_id'], date.year * 100 + date.month)
+
+
+def _contribution(row):
+    timed = row['completion_status'] == 'completed' and row['duration_minutes'] is not None
+    return (*status_counts(row),
+            row['duration_minutes'] if timed else 0,
+            1 if timed else 0)
+
+
+def apply(cursor, before, after):
+    deltas = defaultdict(lambda: [0] * len(VALUE_COLUMNS))
+    for sign, rows in ((-1, before), (1, after)):
+        for row in rows:
+            bucket = deltas[_bucket(row)]
+            for i, value in enumerate(_contribution(row)):
+                bucket[i] += sign * value
+    add_deltas(cursor, TABLE, KEY_COLUMNS, VALUE_COLUMNS, deltas)
+
+
+# workout_month is the stored year * 100 + month; grouping on it
+# walks idx_cwl_client_status_month
+SOURCE = """
+    SELECT
+      client_id,
+      workout_month AS month,
+      COUNT(*) AS total_workouts,
+      SUM(completion_status = 'completed') AS completed_workouts,
+      SUM(completion_status = 'partial') AS partial_workouts,
+      SUM(completion_status = 'not_started') AS not_started_workouts,
+      COALESCE(SUM(CASE WHEN completion_status = 'completed' THEN duration_minutes END), 0) AS completed_duration_sum,
+      COUNT(CASE WHEN completion_status = 'completed' THEN duration_minutes END) AS completed_duration_count
+    FROM Client_Workout_Log
+    GROUP BY client_id, workout_month
+"""
+
+
+def rebuild(cursor):
+    return rebuild_from(cursor, TABLE, KEY_COLUMNS, VALUE_COLUMNS, SOURCE)
@@ -0,0 +1,43 @@
+#------------------------------------------------------------
+# Workout logs per (client, template) by completion status
+# (feeds /health_analyst/completion_rates)
+#
+# A program is a template assigned to a client, so its counters are
+# the row for (program.client_id, program.workout_id). Keying on the
+# pair instead of program_id means assigning or removing a program
+# needs no maintenance here.
+#------------------------------------------------------------
+from collections import defaultdict
+
+from .common import add_deltas, rebuild_from, status_counts
+
+TABLE = "Client_Template_Log_Counts"
+KEY_COLUMNS = ("client_id", "workout_id")
+VALUE_COLUMNS = ("total_workouts", "completed_workouts", "partial_workouts", "not_started_workouts")
+
+
+def apply(cursor, before, after):
+    deltas = defaultdict(lambda: [0, 0, 0, 0])
+    for sign, rows in ((-1, before), (1, after)):
+        for row in rows:
+            bucket = deltas[(row['client_id'], row['workout_id'])]
+            for i, value in enumerate(status_counts(row)):
+                bucket[i] += sign * value
+    add_deltas(cursor, TABLE, KEY_COLUMNS, VALUE_COLUMNS, deltas)
+
+
+SOURCE = """
+    SELECT
+      client_id,
+      workout_id,
+      COUNT(*) AS total_workouts,
+      SUM(completion_status = 'completed') AS completed_workouts,
+      SUM(completion_status = 'partial') AS partial_workouts,
+      SUM(completion_status = 'not_started') AS not_started_workouts
+    FROM Client_Workout_Log
+    GROUP BY client_id, workout_id
+"""
+
+
+def rebuild(cursor):
+    return rebuild_from(cursor, TABLE, KEY_COLUMNS, VALUE_COLUMNS, SOURCE)
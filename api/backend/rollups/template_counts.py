@@ -0,0 +1,37 @@
+#------------------------------------------------------------
+# Workout logs per template by completion status
+# (feeds /health_analyst/template_usage)
+#------------------------------------------------------------
+from collections import defaultdict
+
+from .common import add_deltas, rebuild_from, status_counts
+
+TABLE = "Template_Log_Counts"
+KEY_COLUMNS = ("workout_id",)
+VALUE_COLUMNS = ("total_workouts", "completed_workouts", "partial_workouts", "not_started_workouts")
+
+
+def apply(cursor, before, after):
+    deltas = defaultdict(lambda: [0, 0, 0, 0])
+    for sign, rows in ((-1, before), (1, after)):
+        for row in rows:
+            bucket = deltas[(row['workout_id'],)]
+            for i, value in enumerate(status_counts(row)):
+                bucket[i] += sign * value
+    add_deltas(cursor, TABLE, KEY_COLUMNS, VALUE_COLUMNS, deltas)
+
+
+SOURCE = """
+    SELECT
+      workout_id,
+      COUNT(*) AS total_workouts,
+      SUM(completion_status = 'completed') AS completed_workouts,
+      SUM(completion_status = 'partial') AS partial_workouts,
+      SUM(completion_status = 'not_started') AS not_started_workouts
+    FROM Client_Workout_Log
+    GROUP BY workout_id
+"""
+
+
+def rebuild(cursor):
+    return rebuild_from(cursor, TABLE, KEY_COLUMNS, VALUE_COLUMNS, SOURCE)
@@ -0,0 +1,55 @@
+#------------------------------------------------------------
+# Client x ISO week workout rollup (feeds /health_analyst/avg_duration)
+#------------------------------------------------------------
+from collections import defaultdict
+
+from .common import add_deltas, as_date, rebuild_from
+
+TABLE = "Client_Weekly_Workout_Rollup"
+KEY_COLUMNS = ("client_id", "iso_year", "iso_week")
+VALUE_COLUMNS = ("total_workouts", "completed_workouts",
+                 "completed_duration_sum", "completed_duration_count")
+
+
+def _bucket(row):
+    iso_year, iso_week, _ = as_date(row['workout_date']).isocalendar()
+    return (row['client_id'], iso_year, iso_week)
+
+
+def _contribution(row):
+    completed = row['completion_status'] == 'completed'
+    timed = completed and row['duration_minutes'] is not None
+    return (1,
+            1 if completed else 0,
+            row['duration_minutes'] if timed else 0,
+            1 if timed else 0)
+
+
+def apply(cursor, before, after):
+    deltas = defaultdict(lambda: [0, 0, 0, 0])
+    for sign, rows in ((-1, before), (1, after)):
+        for row in rows:
+            bucket = deltas[_bucket(row)]
+            for i, value in enumerate(_contribution(row)):
+                bucket[i] += sign * value
+    add_deltas(cursor, TABLE, KEY_COLUMNS, VALUE_COLUMNS, deltas)
+
+
+# workout_iso_week is the stored YEARWEEK(workout_date, 3), the ISO-8601
+# week like date.isocalendar(); idx_cwl_client_week covers this query
+SOURCE = """
+    SELECT
+      client_id,
+      workout_iso_week DIV 100 AS iso_year,
+      workout_iso_week MOD 100 AS iso_week,
+      COUNT(*) AS total_workouts,
+      SUM(completion_status = 'completed') AS completed_workouts,
+      COALESCE(SUM(CASE WHEN completion_status = 'completed' THEN duration_minutes END), 0) AS completed_duration_sum,
+      COUNT(CASE WHEN completion_status = 'completed' THEN duration_minutes END) AS completed_duration_count
+    FROM Client_Workout_Log
+    GROUP BY client_id, workout_iso_week
+"""
+
+
+def rebuild(cursor):
+    return rebuild_from(cursor, TABLE, KEY_COLUMNS, VALUE_COLUMNS, SOURCE)
@@ -0,0 +1,94 @@
+#------------------------------------------------------------
+# Opt-in streaming export for bulk endpoints.
+#
+# A client asks for it with `Accept: application/x-ndjson` or
+# `?format=ndjson` / `?format=csv`. The query then runs on an
+# unbuffered (server-side) cursor and rows are written to the
+# socket in chunks as MySQL produces them, so memory stays flat
+# no matter how large the result is.
+#------------------------------------------------------------
+import csv
+import datetime
+import decimal
+import io
+
+from flask import Response, current_app, request, stream_with_context
+from backend.db_connection import db
+from backend.db_connection.instrumented import InstrumentedSSDictCursor
+
+NDJSON = 'application/x-ndjson'
+CHUNK_ROWS = 500
+
+
+def wants_stream():
+    """Return 'ndjson', 'csv' or None for the current request."""
+    fmt = request.args.get('format', '').lower()
+    if fmt in ('ndjson', 'csv'):
+        return fmt
+    # JSON first so that `Accept: */*` keeps the regular response
+    best = request.accept_mimetypes.best_match(['application/json', NDJSON])
+    if best == NDJSON:
+        return 'ndjson'
+    return None
+
+
+def _csv_value(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    return value
+
+
+def _encode_ndjson(rows):
+    dumps = current_app.json.dumps
+    return ''.join(dumps(row) + '\n' for row in rows)
+
+
+def _encode_csv(rows, header):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    if header is not None:
+        writer.writerow(header)
+    for row in rows:
+        writer.writerow([_csv_value(v) for v in row.values()])
+    return buf.getvalue()
+
+
+def stream_query(query, params=(), fmt='ndjson', filename='export', chunk_rows=CHUNK_ROWS):
+    """Stream the rows of `query` as NDJSON or CSV."""
+
+    def generate():
+        conn = db.get_db()
+        cursor = conn.cursor(InstrumentedSSDictCursor)
+        finished = False
+        try:
+            cursor.execute(query, params)
+            first = True
+            while True:
+                rows = cursor.fetchmany(chunk_rows)
+                if not rows:
+                    break
+                if fmt == 'csv':
+                    yield _encode_csv(rows, list(rows[0].keys()) if first else None)
+                else:
+                    yield _encode_ndjson(rows)
+                first = False
+            finished = True
+        finally:
+            if finished:
+                cursor.close()
+            else:
+                # the client went away mid-stream; closing the unbuffered
+                # cursor would read every remaining row first, so drop the
+                # connection instead (the pool discards closed connections)
+                conn.close()
+
+    if fmt == 'csv':
+        mimetype = 'text/csv'
+        headers = {'Content-Disposition': f'attachment; filename="{filename}.csv"'}
+    else:
+        mimetype = NDJSON
+        headers = {}
+    headers['X-Accel-Buffering'] = 'no'
+    return Response(stream_with_context(generate()), mimetype=mimetype, headers=headers)
@@ -1,39 +1,98 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, send_from_directory
 from backend.db_connection import db
+from backend.pagination import page_args, keyset_predicate, page_response
+from backend.streaming import wants_stream, stream_query
+from backend.cache import response_cache
+from backend.conditional import validated_by
+from backend.ml_models import model01
+from backend import programs, versions
+from backend.rollups import fetch_workout_logs, workout_logs_changed
+from backend.client.monthly_completion import completion_tags
+from backend.ml_models.registry import ModelNotTrained
+from backend.profiling import list_profiles, FORMATS as PROFILE_FORMATS
 from mysql.connector import Error
 from flask import current_app
 
 system_admin = Blueprint("system_admin", __name__)
 
+# System_Log and Backup_Log only grow by inserts, but rows can still
+# disappear through FK cascades: deleting a User removes their
+# System_Log rows, and deleting a System_Admin removes the Backup_Log
+# rows they performed. So the version is the newest id *and* the row
+# count (an index-only count, still far cheaper than the list query).
+# No Last-Modified: a delete doesn't move MAX(timestamp), so
+# If-Modified-Since alone can't tell the list changed.
+SYSTEM_LOG_VERSION = "SELECT MAX(log_id) AS version, COUNT(*) AS row_count FROM System_Log"
+BACKUP_LOG_VERSION = "SELECT MAX(backup_id) AS version, COUNT(*) AS row_count FROM Backup_Log"
+
 # GET /system_logs  [Ava-6]
+# paginated newest first: ?limit=N&after=<cursor from "next">
 @system_admin.route("/system_logs", methods=["GET"])
+@validated_by(SYSTEM_LOG_VERSION)
 def get_system_logs():
     try:
+        # ?format=csv or Accept: application/x-ndjson exports every log as a stream
+        fmt = wants_stream()
+        if fmt:
+            return stream_query(
+                "SELECT * FROM System_Log ORDER BY timestamp DESC, log_id DESC",
+                fmt=fmt, filename="system_logs")
+
+        limit, after = page_args(2)
+
+        where, params = "", []
+        if after:
+            where, params = keyset_predicate(["timestamp", "log_id"], after, descending=True)
+            where = "WHERE " + where
+
         cursor = db.get_db().cursor()
-        cursor.execute("SELECT * FROM System_Log ORDER BY timestamp DESC")
+        cursor.execute(f"""
+            SELECT * FROM System_Log
+            {where}
+            ORDER BY timestamp DESC, log_id DESC
+            LIMIT %s
+        """, (*params, limit + 1))
         logs = cursor.fetchall()
         cursor.close()
-        return jsonify(logs), 200
+        return jsonify(page_response(logs, limit, ["timestamp", "log_id"])), 200
     except Error as e:
         return jsonify({"error": str(e)}), 500
 
 
 # GET /system_logs/{action_type}   [Ava-5]
 @system_admin.route("/system_logs/<string:action_type>", methods=["GET"])
+@validated_by(SYSTEM_LOG_VERSION)
 def get_logs_by_action(action_type):
     try:
+        fmt = wants_stream()
+        if fmt:
+            return stream_query("""
+                SELECT * FROM System_Log
+                WHERE action_type = %s
+                ORDER BY timestamp DESC, log_id DESC
+            """, (action_type,), fmt=fmt, filename=f"system_logs_{action_type}")
+
+        limit, after = page_args(2)
+
+        where, params = "", []
+        if after:
+            where, params = keyset_predicate(["timestamp", "log_id"], after, descending=True)
+            where = "AND " + where
+
         cursor = db.get_db().cursor()
 
-        query = """
+        query = f"""
             SELECT * FROM System_Log
             WHERE action_type = %s
-            ORDER BY timestamp DESC
+            {where}
+            ORDER BY timestamp DESC, log_id DESC
+            LIMIT %s
         """
-        cursor.execute(query, (action_type,))
+        cursor.execute(query, (action_type, *params, limit + 1))
         logs = cursor.fetchall()
         cursor.close()
 
-        return jsonify(logs), 200
+        return jsonify(page_response(logs, limit, ["timestamp", "log_id"])), 200
     except Error as e:
         return jsonify({"error": str(e)}), 500
 
@@ -61,10 +120,13 @@ def create_user():
             data.get("permissions"),
             data.get("created_by")   # system_admin_id
         ))
+        versions.bump(cursor, "people")
 
         db.get_db().commit()
         new_user_id = cursor.lastrowid
         cursor.close()
+        # a new row in the permissions listing, whatever its role
+        response_cache.invalidate("users")
 
         return jsonify({"message": "User created", "user_id": new_user_id}), 201
     except Error as e:
@@ -107,12 +169,18 @@ def update_user(user_id):
         params.append(user_id)
 
         cursor = db.get_db().cursor()
+        cursor.execute("SELECT role FROM User WHERE user_id = %s", (user_id,))
+        current = cursor.fetchone()
         query = f"UPDATE User SET {', '.join(fields)} WHERE user_id = %s"
 
         cursor.execute(query, params)
+        versions.bump(cursor, "people")
         db.get_db().commit()
         cursor.close()
 
+        roles = {data.get("role"), current["role"] if current else None} - {None}
+        response_cache.invalidate(*(f"role:{r}" for r in roles))
+
         return jsonify({"message": "User updated"}), 200
     except Error as e:
         return jsonify({"error": str(e)}), 500
@@ -142,6 +210,7 @@ def create_trainer_profile():
             data["certification"],
             data["specialization"]
         ))
+        versions.bump(cursor, "people")
 
         db.get_db().commit()
         profile_id = cursor.lastrowid
@@ -157,9 +226,40 @@ def create_trainer_profile():
 def delete_user(user_id):
     try:
         cursor = db.get_db().cursor()
+        cursor.execute("SELECT role FROM User WHERE user_id = %s", (user_id,))
+        current = cursor.fetchone()
+        # a trainer's programs and templates go with them (FK cascade),
+        # so their clients may fall back to another program
+        clients, logs = [], []
+        if current and current['role'] == 'trainer':
+            clients = programs.program_clients(cursor, """
+                created_by IN (SELECT trainer_id FROM Trainer WHERE user_id = %s)
+                OR workout_id IN (SELECT w.workout_id
+                                  FROM Workout_Session_Template w JOIN Trainer t ON t.trainer_id = w.trainer_id
+                                  WHERE t.user_id = %s)
+            """, (user_id, user_id))
+            # ...and with the templates, every client's logs of them
+            logs = fetch_workout_logs(cursor, """
+                workout_id IN (SELECT w.workout_id
+                               FROM Workout_Session_Template w JOIN Trainer t ON t.trainer_id = w.trainer_id
+                               WHERE t.user_id = %s)
+            """, (user_id,))
+        elif current and current['role'] == 'client':
+            # a client's logs go with them; Template_Log_Counts has no
+            # client_id to cascade on, so it must be told
+            logs = fetch_workout_logs(
+                cursor, "client_id IN (SELECT client_id FROM Client WHERE user_id = %s)", (user_id,))
+        # take the logs out of the rollups while their keys still exist
+        workout_logs_changed(cursor, before=logs)
         cursor.execute("DELETE FROM User WHERE user_id = %s", (user_id,))
+        programs.refresh_current_program(cursor, clients)
+        # the cascades can reach every table behind a versioned view
+        versions.bump(cursor, *versions.DOMAINS)
         db.get_db().commit()
         cursor.close()
+        if current:
+            response_cache.invalidate(f"role:{current['role']}", *(f"client:{c}:program" for c in clients),
+                                      *completion_tags(logs))
         return jsonify({"message": "User deleted"}), 200
     except Error as e:
         return jsonify({"error": str(e)}), 500
@@ -189,6 +289,7 @@ def create_client_profile():
             data.get("fitness_level"),
             data.get("goals")
         ))
+        versions.bump(cursor, "people")
 
         db.get_db().commit()
         new_client_id = cursor.lastrowid
@@ -213,10 +314,13 @@ def delete_exercise(exercise_id):
             cursor.close()
             return jsonify({"error": "Exercise not found"}), 404
 
-        # Perform deletion
+        # Perform deletion (documents first: the cascade removes the template links)
+        programs.drop_exercise_documents(cursor, exercise_id)
         cursor.execute("DELETE FROM Exercise WHERE exercise_id = %s", (exercise_id,))
+        versions.bump(cursor, "templates")
         conn.commit()
         cursor.close()
+        response_cache.invalidate(f"exercise:{exercise_id}")
         return jsonify({"message": "Exercise deleted"}), 200
 
     except Error as e:
@@ -249,23 +353,46 @@ def update_exercise(exercise_id):
         cursor = db.get_db().cursor()
         query = f"UPDATE Exercise SET {', '.join(fields)} WHERE exercise_id = %s"
         cursor.execute(query, params)
+        programs.drop_exercise_documents(cursor, exercise_id)
+        versions.bump(cursor, "templates")
 
         db.get_db().commit()
         cursor.close()
+        response_cache.invalidate(f"exercise:{exercise_id}")
 
         return jsonify({"message": "Exercise updated"}), 200
     except Error as e:
         return jsonify({"error": str(e)}), 500
 
 # GET /backup_logs [Ava-7]
+# paginated newest first: ?limit=N&after=<cursor from "next">
 @system_admin.route("/backup_logs", methods=["GET"])
+@validated_by(BACKUP_LOG_VERSION)
 def get_backup_logs():
     try:
+        fmt = wants_stream()
+        if fmt:
+            return stream_query(
+                "SELECT * FROM Backup_Log ORDER BY backup_end DESC, backup_id DESC",
+                fmt=fmt, filename="backup_logs")
+
+        limit, after = page_args(2)
+
+        where, params = "", []
+        if after:
+            where, params = keyset_predicate(["backup_end", "backup_id"], after, descending=True)
+            where = "WHERE " + where
+
         cursor = db.get_db().cursor()
-        cursor.execute("SELECT * FROM Backup_Log ORDER BY backup_end DESC")
+        cursor.execute(f"""
+            SELECT * FROM Backup_Log
+            {where}
+            ORDER BY backup_end DESC, backup_id DESC
+            LIMIT %s
+        """, (*params, limit + 1))
         backups = cursor.fetchall()
         cursor.close()
-        return jsonify(backups), 200
+        return jsonify(page_response(backups, limit, ["backup_end", "backup_id"])), 200
     except Error as e:
         return jsonify({"error": str(e)}), 500
 
@@ -318,7 +445,9 @@ def get_backup_status():
         return jsonify({"error": str(e)}), 500
 
 # GET /user/permissions [Ava-6]
+# cached; tagged per role so a permission change only drops this listing
 @system_admin.route("/user/permissions", methods=["GET"])
+@response_cache.cached(tags=lambda args, rows: {f"role:{r['role']}" for r in rows} | {"users"})
 def get_all_role_permissions():
     try:
         cursor = db.get_db().cursor()
@@ -358,8 +487,10 @@ def update_role_permissions():
         """
 
         cursor.execute(query, (data["new_permissions"], data["role"]))
+        versions.bump(cursor, "people")
         db.get_db().commit()
         cursor.close()
+        response_cache.invalidate(f"role:{data['role']}")
 
         return jsonify({
             "message": f"Updated permissions for all {data['role']} users."
@@ -367,3 +498,45 @@ def update_role_permissions():
 
     except Error as e:
         return jsonify({"error": str(e)}), 500
+
+# GET /db_pool  -- connection pool statistics
+@system_admin.route("/db_pool", methods=["GET"])
+def get_db_pool_stats():
+    return jsonify(db.pool_stats()), 200
+
+# GET /response_cache  -- response cache hit/miss/eviction counters
+@system_admin.route("/response_cache", methods=["GET"])
+def get_response_cache_stats():
+    return jsonify(response_cache.stats()), 200
+
+# GET /model  -- which parameter set the prediction routes are using
+@system_admin.route("/model", methods=["GET"])
+def get_model_info():
+    return jsonify(model01.registry.info()), 200
+
+# Training is CLI-only (`flask --app backend_app model train`): a full pass
+# over Health_Metrics takes longer than a request may hold a worker thread.
+
+# POST /model/reload  -- pick up newly stored parameters without waiting for the poll
+@system_admin.route("/model/reload", methods=["POST"])
+def reload_model():
+    try:
+        sequence_number = model01.registry.reload()
+        return jsonify({"message": "Model reloaded", "sequence_number": sequence_number}), 200
+    except ModelNotTrained as e:
+        return jsonify({"error": str(e)}), 404
+    except Error as e:
+        return jsonify({"error": str(e)}), 500
+
+# GET /profiles  -- recent request profiles (newest first, ?limit=N)
+@system_admin.route("/profiles", methods=["GET"])
+def get_profiles():
+    limit = request.args.get("limit", 50, type=int)
+    return jsonify(list_profiles(current_app.config["PROFILE_DIR"], limit)), 200
+
+# GET /profiles/<name>  -- download one (.collapsed for flamegraph tools, .pstats for pstats/snakeviz)
+@system_admin.route("/profiles/<path:name>", methods=["GET"])
+def download_profile(name):
+    if name.rsplit(".", 1)[-1] not in PROFILE_FORMATS:
+        return jsonify({"error": "not a profile"}), 404
+    return send_from_directory(current_app.config["PROFILE_DIR"], name, as_attachment=True)
@@ -1,5 +1,12 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, url_for
 from backend.db_connection import db
+from backend.pagination import page_args, keyset_predicate, page_response
+from backend.rollups import fetch_workout_logs, workout_logs_changed
+from backend.cache import response_cache
+from backend.conditional import validated_by
+from backend.versions import bump, version_query
+from backend import programs
+from backend.client.monthly_completion import completion_tags
 from mysql.connector import Error
 
 trainer = Blueprint("trainer", __name__)
@@ -28,9 +35,12 @@ def create_workout_exercise():
                 (workout_id, exercise_id, sets, reps, rest_period)
             VALUES (%s, %s, %s, %s, %s)
         """, (workout_id, exercise_id, sets, reps, rest))
+        programs.drop_template_documents(cursor, [workout_id])
+        bump(cursor, "templates")
 
         db.get_db().commit()
         cursor.close()
+        response_cache.invalidate(f"template:{workout_id}", "workout_exercises")
 
         return jsonify({"message": "Workout-specific exercise created"}), 201
 
@@ -38,13 +48,24 @@ def create_workout_exercise():
         return jsonify({"error": str(e)}), 500
 
 
-# GET workout-specific exercises
+# GET workout-specific exercises (paginated: ?limit=N&after=<cursor>)
 @trainer.route("/workout-exercises", methods=["GET"])
+@validated_by(version_query("templates"))
+@response_cache.cached(tags=lambda args, page: {"workout_exercises"}
+                       | {f"template:{r['workout_id']}" for r in page["items"]}
+                       | {f"exercise:{r['exercise_id']}" for r in page["items"]})
 def get_workout_exercises():
     try:
+        limit, after = page_args(1)
+
+        where, params = "", []
+        if after:
+            where, params = keyset_predicate(["wse.workout_exercise_id"], after)
+            where = "WHERE " + where
+
         cursor = db.get_db().cursor()
 
-        cursor.execute("""
+        cursor.execute(f"""
             SELECT 
                 wse.workout_exercise_id,
                 wse.workout_id,
@@ -56,11 +77,14 @@ def get_workout_exercises():
                 wse.rest_period
             FROM Workout_Specific_Exercise wse
             JOIN Exercise e ON wse.exercise_id = e.exercise_id
-        """)
+            {where}
+            ORDER BY wse.workout_exercise_id
+            LIMIT %s
+        """, (*params, limit + 1))
 
         rows = cursor.fetchall()
         cursor.close()
-        return jsonify(rows), 200
+        return jsonify(page_response(rows, limit, ["workout_exercise_id"])), 200
 
     except Error as e:
         return jsonify({"error": str(e)}), 500
@@ -89,10 +113,12 @@ def create_template(trainer_id):
                 (trainer_id, name, description, duration_minutes, difficulty)
             VALUES (%s, %s, %s, %s, %s)
         """, (trainer_id, name, description, duration, difficulty))
+        bump(cursor, "templates")
 
         db.get_db().commit()
         template_id = cursor.lastrowid
         cursor.close()
+        response_cache.invalidate(f"trainer:{trainer_id}:templates")
 
         return jsonify({"message": "Template created", "template_id": template_id}), 201
 
@@ -102,6 +128,9 @@ def create_template(trainer_id):
 
 # GET all templates created by trainer
 @trainer.route("/view-all-templates/<int:trainer_id>", methods=["GET"])
+@validated_by(version_query("templates"))
+@response_cache.cached(tags=lambda args, rows: {f"trainer:{args['trainer_id']}:templates"}
+                       | {f"template:{r['workout_id']}" for r in rows})
 def get_templates(trainer_id):
     try:
         cursor = db.get_db().cursor()
@@ -136,9 +165,12 @@ def update_template(template_id):
             WHERE workout_id = %s
         """, (data["name"], data["description"],
               data["duration_minutes"], data["difficulty"], template_id))
+        programs.drop_template_documents(cursor, [template_id])
+        bump(cursor, "templates")
 
         db.get_db().commit()
         cursor.close()
+        response_cache.invalidate(f"template:{template_id}")
         return jsonify({"message": "Template updated"}), 200
 
     except Error as e:
@@ -150,9 +182,20 @@ def update_template(template_id):
 def delete_template(template_id):
     try:
         cursor = db.get_db().cursor()
+        # the FK cascade deletes the template's workout logs too
+        logs = fetch_workout_logs(cursor, "workout_id = %s", (template_id,))
+        # ...and the programs built on it, so those clients need a new current program
+        clients = programs.program_clients(cursor, "workout_id = %s", (template_id,))
+        # before the DELETE: the counters keyed by workout_id reference the template
+        workout_logs_changed(cursor, before=logs)
         cursor.execute("DELETE FROM Workout_Session_Template WHERE workout_id = %s", (template_id,))
+        programs.refresh_current_program(cursor, clients)
+        # the cascade also takes the feedback on those logs
+        bump(cursor, "templates", "programs", "feedback")
         db.get_db().commit()
         cursor.close()
+        # also drops the client programs built on this template (FK cascade)
+        response_cache.invalidate(f"template:{template_id}", *completion_tags(logs))
         return jsonify({"message": "Template deleted"}), 200
 
     except Error as e:
@@ -179,10 +222,13 @@ def assign_program(trainer_id):
                 (workout_id, created_by, client_id, name, description)
             VALUES (%s, %s, %s, %s, %s)
         """, (workout_id, trainer_id, client_id, name, description))
+        program_id = cursor.lastrowid
+        programs.refresh_current_program(cursor, [client_id])
+        bump(cursor, "programs")
 
         db.get_db().commit()
-        program_id = cursor.lastrowid
         cursor.close()
+        response_cache.invalidate(f"client:{client_id}:program")
 
         return jsonify({"message": "Program assigned", "program_id": program_id}), 201
 
@@ -190,21 +236,32 @@ def assign_program(trainer_id):
         return jsonify({"error": str(e)}), 500
 
 
-# GET list of assigned programs (by trainer)
+# GET list of assigned programs (by trainer, paginated: ?limit=N&after=<cursor>)
 @trainer.route("/programs/<int:trainer_id>", methods=["GET"])
+@validated_by(version_query("programs"))
 def get_programs(trainer_id):
     try:
+        limit, after = page_args(1)
+
+        where, params = "", []
+        if after:
+            where, params = keyset_predicate(["program_id"], after)
+            where = "AND " + where
+
         cursor = db.get_db().cursor()
 
-        cursor.execute("""
+        cursor.execute(f"""
             SELECT *
             FROM Client_Specific_Workout_Program
             WHERE created_by = %s
-        """, (trainer_id,))
+            {where}
+            ORDER BY program_id
+            LIMIT %s
+        """, (trainer_id, *params, limit + 1))
 
         rows = cursor.fetchall()
         cursor.close()
-        return jsonify(rows), 200
+        return jsonify(page_response(rows, limit, ["program_id"])), 200
 
     except Error as e:
         return jsonify({"error": str(e)}), 500
@@ -223,9 +280,11 @@ def update_program(program_id):
                 description = %s
             WHERE program_id = %s
         """, (data["name"], data["description"], program_id))
+        bump(cursor, "programs")
 
         db.get_db().commit()
         cursor.close()
+        response_cache.invalidate(f"program:{program_id}")
         return jsonify({"message": "Program updated"}), 200
 
     except Error as e:
@@ -237,9 +296,14 @@ def update_program(program_id):
 def delete_program(program_id):
     try:
         cursor = db.get_db().cursor()
+        clients = programs.program_clients(cursor, "program_id = %s", (program_id,))
         cursor.execute("DELETE FROM Client_Specific_Workout_Program WHERE program_id = %s", (program_id,))
+        # the client's previous program (if any) becomes current again
+        programs.refresh_current_program(cursor, clients)
+        bump(cursor, "programs")
         db.get_db().commit()
         cursor.close()
+        response_cache.invalidate(f"program:{program_id}")
         return jsonify({"message": "Program removed"}), 200
 
     except Error as e:
@@ -250,42 +314,58 @@ def delete_program(program_id):
 # 4) CLIENT LOGS / COMPLETED FILTER / PROGRESS METRICS
 # ============================================================
 
-# GET all completed logs
+# GET all completed logs, newest first (paginated: ?limit=N&after=<cursor>)
 @trainer.route("/client-logs", methods=["GET"])
+@validated_by(version_query("workout_logs"))
 def completed_logs():
     try:
+        limit, after = page_args(2)
+
+        where, params = "", []
+        if after:
+            where, params = keyset_predicate(["workout_date", "log_id"], after, descending=True)
+            where = "AND " + where
+
         cursor = db.get_db().cursor()
 
-        cursor.execute("""
-            SELECT *
+        # the base columns only (not the bookkeeping ones added by migrations)
+        cursor.execute(f"""
+            SELECT log_id, client_id, workout_id, analyst_id, workout_date,
+                   completion_status, duration_minutes, notes, PR
             FROM Client_Workout_Log
             WHERE completion_status = 'completed'
-            ORDER BY workout_date DESC
-        """)
+            {where}
+            ORDER BY workout_date DESC, log_id DESC
+            LIMIT %s
+        """, (*params, limit + 1))
 
         rows = cursor.fetchall()
         cursor.close()
-        return jsonify(rows), 200
+        return jsonify(page_response(rows, limit, ["workout_date", "log_id"])), 200
 
     except Error as e:
         return jsonify({"error": str(e)}), 500
 
 
 # CLIENT progress metrics
+# summed from the client's per-template log counters (backend/rollups)
+# instead of aggregating the client's whole log history; the SUMs are
+# cast back to integers (a bare SUM is a DECIMAL, sent as a JSON string)
 @trainer.route("/progress/<int:client_id>", methods=["GET"])
+@validated_by(version_query("workout_logs"))
 def client_progress(client_id):
     try:
         cursor = db.get_db().cursor()
 
         cursor.execute("""
             SELECT 
-                client_id,
-                COUNT(*) AS total_workouts,
-                SUM(completion_status = 'completed') AS completed,
-                ROUND(SUM(completion_status='completed') / COUNT(*), 2) AS completion_rate
-            FROM Client_Workout_Log
+                %s AS client_id,
+                CAST(COALESCE(SUM(total_workouts), 0) AS UNSIGNED) AS total_workouts,
+                CAST(COALESCE(SUM(completed_workouts), 0) AS UNSIGNED) AS completed,
+                ROUND(SUM(completed_workouts) / NULLIF(SUM(total_workouts), 0), 2) AS completion_rate
+            FROM Client_Template_Log_Counts
             WHERE client_id = %s
-        """, (client_id,))
+        """, (client_id, client_id))
 
         row = cursor.fetchone()
         cursor.close()
@@ -295,6 +375,67 @@ def client_progress(client_id):
         return jsonify({"error": str(e)}), 500
 
 
+# Progress of every client linked to a trainer, in one grouped query
+#   ?sort=completion_rate|total_workouts|completed|client_id (default completion_rate)
+#   ?order=desc|asc (default desc)   ?limit=N (top N after sorting)
+# Trainer_Client's primary key starts with trainer_id and the counters
+# are read by their (client_id, workout_id) primary key per client.
+PROGRESS_SORTS = ("completion_rate", "total_workouts", "completed", "client_id")
+
+@trainer.route("/<int:trainer_id>/progress", methods=["GET"])
+@validated_by(version_query("workout_logs", "people"))
+def trainer_clients_progress(trainer_id):
+    try:
+        sort = request.args.get("sort", "completion_rate")
+        order = request.args.get("order", "desc").lower()
+        limit = request.args.get("limit")
+
+        if sort not in PROGRESS_SORTS:
+            return jsonify({"error": f"sort must be one of {', '.join(PROGRESS_SORTS)}"}), 400
+        if order not in ("asc", "desc"):
+            return jsonify({"error": "order must be asc or desc"}), 400
+        if limit is not None and (not limit.isdigit() or int(limit) < 1):
+            return jsonify({"error": "limit must be a positive integer"}), 400
+
+        # sort by the bare select aliases: inside an expression MySQL would
+        # resolve total_workouts to n.total_workouts, which isn't grouped.
+        # Only the rate can be NULL (clients without logs); it goes last.
+        order_by = f"{sort} {order.upper()}"
+        if sort == "completion_rate":
+            order_by = "completion_rate IS NULL, " + order_by
+        if sort != "client_id":
+            order_by += ", client_id"
+
+        cursor = db.get_db().cursor()
+
+        cursor.execute(f"""
+            SELECT
+                tc.client_id,
+                c.first_name,
+                c.last_name,
+                CAST(COALESCE(SUM(n.total_workouts), 0) AS UNSIGNED) AS total_workouts,
+                CAST(COALESCE(SUM(n.completed_workouts), 0) AS UNSIGNED) AS completed,
+                ROUND(SUM(n.completed_workouts) / NULLIF(SUM(n.total_workouts), 0), 2) AS completion_rate
+            FROM (
+                SELECT DISTINCT client_id
+                FROM Trainer_Client
+                WHERE trainer_id = %s
+            ) tc
+            JOIN Client c ON c.client_id = tc.client_id
+            LEFT JOIN Client_Template_Log_Counts n ON n.client_id = tc.client_id
+            GROUP BY tc.client_id, c.first_name, c.last_name
+            ORDER BY {order_by}
+            {"LIMIT %s" if limit else ""}
+        """, (trainer_id, int(limit)) if limit else (trainer_id,))
+
+        rows = cursor.fetchall()
+        cursor.close()
+        return jsonify(rows), 200
+
+    except Error as e:
+        return jsonify({"error": str(e)}), 500
+
+
 # ============================================================
 # 5) FEEDBACK
 # ============================================================
@@ -303,9 +444,10 @@ def client_progress(client_id):
 # ============================================================
 
 @trainer.route("/getfeedback/<int:log_id>", methods=["GET"])
+@validated_by(version_query("feedback"))
 def get_feedback(log_id):
     try:
-        cursor = db.get_db().cursor(d)
+        cursor = db.get_db().cursor()
 
         cursor.execute("""
             SELECT 
@@ -327,6 +469,99 @@ def get_feedback(log_id):
     except Error as e:
         return jsonify({"error": str(e)}), 500
 
+# ============================================================
+# 🔹 GET feedback for many logs at once, grouped by log
+#    ?log_ids=1,2,3  |  ?from_log_id=100&to_log_id=200  |  ?trainer_id=7
+#    Each form covers at most MAX_FEEDBACK_LOG_IDS logs. For trainer_id
+#    the logs come in log_id order; when more remain, a
+#    Link: <...&after_log_id=N>; rel="next" header points at the rest.
+# ============================================================
+
+MAX_FEEDBACK_LOG_IDS = 1000
+
+@trainer.route("/feedback", methods=["GET"])
+@validated_by(version_query("feedback"))
+def get_feedback_batch():
+    try:
+        log_ids = request.args.get("log_ids")
+        from_log_id = request.args.get("from_log_id", type=int)
+        to_log_id = request.args.get("to_log_id", type=int)
+        trainer_id = request.args.get("trainer_id", type=int)
+        after_log_id = request.args.get("after_log_id", 0, type=int)
+
+        if log_ids is not None:
+            try:
+                ids = sorted({int(i) for i in log_ids.split(",") if i.strip()})
+            except ValueError:
+                return jsonify({"error": "log_ids must be a comma-separated list of integers"}), 400
+            if len(ids) > MAX_FEEDBACK_LOG_IDS:
+                return jsonify({"error": f"at most {MAX_FEEDBACK_LOG_IDS} log_ids per request"}), 400
+            if not ids:
+                return jsonify({}), 200
+            where = f"log_id IN ({', '.join(['%s'] * len(ids))})"
+            params = ids
+        elif from_log_id is not None and to_log_id is not None:
+            if from_log_id > to_log_id:
+                return jsonify({"error": "from_log_id must not be after to_log_id"}), 400
+            if to_log_id - from_log_id + 1 > MAX_FEEDBACK_LOG_IDS:
+                return jsonify({"error": f"at most {MAX_FEEDBACK_LOG_IDS} log ids per range"}), 400
+            ids = []
+            where, params = "log_id BETWEEN %s AND %s", [from_log_id, to_log_id]
+        elif trainer_id is None:
+            return jsonify({"error": "log_ids, from_log_id and to_log_id, or trainer_id is required"}), 400
+
+        cursor = db.get_db().cursor()
+
+        next_after = None
+        if log_ids is None and (from_log_id is None or to_log_id is None):
+            # the next MAX_FEEDBACK_LOG_IDS logs this trainer commented on (idx_tf_trainer_log)
+            cursor.execute("""
+                SELECT DISTINCT log_id
+                FROM Trainer_Feedback
+                WHERE trainer_id = %s AND log_id > %s
+                ORDER BY log_id
+                LIMIT %s
+            """, (trainer_id, after_log_id, MAX_FEEDBACK_LOG_IDS + 1))
+            page = [row["log_id"] for row in cursor.fetchall()]
+            if len(page) > MAX_FEEDBACK_LOG_IDS:
+                page = page[:MAX_FEEDBACK_LOG_IDS]
+                next_after = page[-1]
+            if not page:
+                cursor.close()
+                return jsonify({}), 200
+            ids = []
+            where, params = "trainer_id = %s AND log_id BETWEEN %s AND %s", [trainer_id, page[0], page[-1]]
+
+        # one range/IN lookup on idx_tf_log_created (log_id, created_at)
+        cursor.execute(f"""
+            SELECT 
+                feedback_id,
+                trainer_id,
+                log_id,
+                comment,
+                created_at
+            FROM Trainer_Feedback
+            WHERE {where}
+            ORDER BY log_id, created_at DESC
+        """, params)
+
+        rows = cursor.fetchall()
+        cursor.close()
+
+        # every requested log gets a key, even without feedback
+        grouped = {str(i): [] for i in ids}
+        for row in rows:
+            grouped.setdefault(str(row["log_id"]), []).append(row)
+
+        response = jsonify(grouped)
+        if next_after is not None:
+            next_url = url_for(".get_feedback_batch", trainer_id=trainer_id, after_log_id=next_after, _external=True)
+            response.headers["Link"] = f'<{next_url}>; rel="next"'
+        return response, 200
+
+    except Error as e:
+        return jsonify({"error": str(e)}), 500
+
 # CREATE feedback
 @trainer.route("/createfeedback/<int:log_id>", methods=["POST"])
 def create_feedback(log_id):
@@ -340,6 +575,7 @@ def create_feedback(log_id):
             INSERT INTO Trainer_Feedback (log_id, trainer_id, comment)
             VALUES (%s, %s, %s)
         """, (log_id, trainer_id, comment))
+        bump(cursor, "feedback")
 
         db.get_db().commit()
         cursor.close()
@@ -355,6 +591,7 @@ def delete_feedback(feedback_id):
     try:
         cursor = db.get_db().cursor()
         cursor.execute("DELETE FROM Trainer_Feedback WHERE feedback_id = %s", (feedback_id,))
+        bump(cursor, "feedback")
         db.get_db().commit()
         cursor.close()
         return jsonify({"message": "Feedback deleted"}), 200
@@ -0,0 +1,57 @@
+#------------------------------------------------------------
+# Data versions: one counter per group of tables, for validators.
+#
+# Data_Version holds a counter per domain that every writer bumps in
+# its own transaction (the rollup hooks bump workout_logs and
+# health_metrics, so every log/metric writer is covered). A view
+# decorated with
+#
+#   @validated_by(version_query("workout_logs", "templates"))
+#
+# gets its ETag from one primary-key read of those counters, so an
+# unchanged list is answered with 304 without running the view query.
+# Counters are global per domain: any write in the domain changes the
+# ETag of every view over it, which costs a full response now and
+# then but never a stale 304.
+#
+# A domain's row is seeded with the current time in microseconds
+# (migration 0012, and bump() if the row is missing), so a recreated
+# table doesn't hand out versions an old ETag was built from.
+#------------------------------------------------------------
+
+DOMAINS = (
+    "feedback",         # Trainer_Feedback
+    "health_metrics",   # Health_Metrics and its rollups
+    "people",           # User, Trainer, Client, Trainer_Client
+    "programs",         # Client_Specific_Workout_Program, Client_Current_Program
+    "templates",        # Workout_Session_Template, Workout_Specific_Exercise, Exercise
+    "workout_logs",     # Client_Workout_Log and its rollups
+)
+
+
+def _check(domains):
+    unknown = set(domains) - set(DOMAINS)
+    if not domains or unknown:
+        raise ValueError(f"unknown data version domain(s): {', '.join(sorted(unknown)) or '(none)'}")
+    return sorted(set(domains))
+
+
+def bump(cursor, *domains):
+    """Advance the counters of `domains` (call inside the write transaction, before commit)."""
+    # always in the same order, so two writers never wait on each other's rows
+    for domain in _check(domains):
+        cursor.execute("""
+            INSERT INTO Data_Version (domain, version)
+            VALUES (%s, FLOOR(UNIX_TIMESTAMP(NOW(6)) * 1000000))
+            ON DUPLICATE KEY UPDATE version = version + 1
+        """, (domain,))
+
+
+def version_query(*domains):
+    """A one-row query for @validated_by covering the tables of `domains`."""
+    names = ", ".join(f"'{domain}'" for domain in _check(domains))
+    return f"""
+        SELECT GROUP_CONCAT(domain, '=', version ORDER BY domain) AS version
+        FROM Data_Version
+        WHERE domain IN ({names})
+    """
@@ -9,6 +9,8 @@ from backend.rest_entry import create_app
 # create the app object
 app = create_app()
 
+# In production gunicorn imports `app` from here (see gunicorn.conf.py);
+# running this file directly starts the development server instead.
 if __name__ == '__main__':
     # we want to run in debug mode (for hot reloading) 
     # this app will be bound to port 4000. 
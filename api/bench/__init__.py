@@ -0,0 +1,6 @@
+#------------------------------------------------------------
+# Benchmark tooling (run from the api/ directory):
+#
+#   python -m bench.generate_data --scale 1      # synthetic data
+#   python -m bench.load_test --duration 60      # replay a route mix
+#------------------------------------------------------------
@@ -0,0 +1,318 @@
+#------------------------------------------------------------
+# Synthetic data generator.
+#
+# Appends a realistic, internally consistent data set to every table
+# of the FitFlow schema: users and their trainer/client/analyst
+# profiles, exercises, templates with exercises, trainer-client
+# assignments, programs, workout logs, health metrics, feedback,
+# system and backup logs. Values are correlated the way real data
+# is: a client's fitness level drives how often they finish a
+# workout, finished workouts drive their body-fat trend, logs use
+# the templates of their own program, feedback comes from their
+# trainer.
+#
+# --scale 1 is 1,000 clients; --logs-per-client sets the depth of
+# the workout history (10 x 1,000 gives 10M logs). Rows are written
+# with multi-row INSERTs in batches, each batch its own transaction,
+# and the rollup tables are rebuilt at the end.
+#
+#   python -m bench.generate_data --scale 10 --logs-per-client 1000
+#------------------------------------------------------------
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+import time
+
+import pymysql
+from dotenv import load_dotenv
+
+FITNESS_LEVELS = ['Beginner', 'Intermediate', 'Advanced']
+COMPLETION_RATE = {'Beginner': 0.6, 'Intermediate': 0.75, 'Advanced': 0.9}
+GOALS = ['Lose weight', 'Build muscle', 'Improve endurance', 'Rehab', 'General fitness']
+CATEGORIES = ['Strength', 'Cardio', 'Mobility', 'Core', 'Plyometrics']
+SPECIALIZATIONS = ['Strength', 'Weight loss', 'Endurance', 'Rehabilitation', 'Mobility']
+DIFFICULTIES = ['Easy', 'Medium', 'Hard']
+ACTIONS = ['LOGIN', 'LOGOUT', 'CREATE_WORKOUT', 'UPDATE_WORKOUT', 'DELETE_LOG', 'EXERCISE_FLAGGED']
+
+FEEDBACK = ['Great pace, keep it up.', 'Watch your form on the last sets.',
+            'Try adding 5% load next session.', 'Good recovery between sets.',
+            'Missed the cooldown - do not skip it.']
+
+
+class Loader:
+    """Batched multi-row inserts with per-table timing."""
+
+    def __init__(self, conn, batch_rows):
+        self.conn = conn
+        self.batch_rows = batch_rows
+        self.report = {}
+
+    def next_id(self, table, column):
+        with self.conn.cursor() as cursor:
+            cursor.execute(f"SELECT COALESCE(MAX({column}), 0) + 1 AS next_id FROM {table}")
+            return cursor.fetchone()['next_id']
+
+    def insert(self, table, columns, rows):
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+        started = time.perf_counter()
+        count = 0
+        batch = []
+        with self.conn.cursor() as cursor:
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= self.batch_rows:
+                    cursor.executemany(sql, batch)
+                    self.conn.commit()
+                    count += len(batch)
+                    batch = []
+            if batch:
+                cursor.executemany(sql, batch)
+                self.conn.commit()
+                count += len(batch)
+        seconds = time.perf_counter() - started
+        entry = self.report.setdefault(table, {"rows": 0, "seconds": 0.0})
+        entry["rows"] += count
+        entry["seconds"] = round(entry["seconds"] + seconds, 3)
+        entry["rows_per_second"] = round(entry["rows"] / entry["seconds"], 1) if entry["seconds"] else None
+        print(f"{table}: {count} rows in {seconds:.1f}s", file=sys.stderr)
+
+
+def generate(conn, scale, logs_per_client, days, batch_rows, seed):
+    rng = random.Random(seed)
+    load = Loader(conn, batch_rows)
+    today = datetime.date.today()
+    start = today - datetime.timedelta(days=days)
+
+    n_clients = max(1, int(1000 * scale))
+    n_trainers = max(1, n_clients // 50)
+    n_analysts = max(1, n_clients // 500)
+    n_exercises = 200
+    templates_per_trainer = 8
+
+    with conn.cursor() as cursor:
+        cursor.execute("SET foreign_key_checks = 0, unique_checks = 0")
+        cursor.execute("SELECT system_admin_id FROM System_Admin ORDER BY system_admin_id LIMIT 1")
+        row = cursor.fetchone()
+    if row:
+        admin_id = row['system_admin_id']
+    else:
+        admin_id = 1
+        load.insert('System_Admin', ['system_admin_id', 'first_name', 'last_name', 'email'],
+                    [(1, 'Bench', 'Admin', 'bench-admin@fitflow.test')])
+
+    # ---------------- users and profiles ----------------
+    user_id = load.next_id('User', 'user_id')
+    trainer_id0 = load.next_id('Trainer', 'trainer_id')
+    client_id0 = load.next_id('Client', 'client_id')
+    analyst_id0 = load.next_id('Health_Analyst', 'analyst_id')
+
+    roles = (['trainer'] * n_trainers) + (['client'] * n_clients) + (['analyst'] * n_analysts)
+    user_ids = {role: [] for role in ('trainer', 'client', 'analyst')}
+
+    def users():
+        for i, role in enumerate(roles):
+            uid = user_id + i
+            user_ids[role].append(uid)
+            created = start + datetime.timedelta(days=rng.randrange(days))
+            yield (uid, f'bench-{role}{uid}@fitflow.test', f'hashed_{role}{uid}', role, None, admin_id,
+                   f'{created} 09:00:00')
+
+    load.insert('User', ['user_id', 'email', 'password_hash', 'role', 'permissions', 'created_by', 'created_at'],
+                users())
+
+    trainer_ids = list(range(trainer_id0, trainer_id0 + n_trainers))
+    load.insert('Trainer', ['trainer_id', 'user_id', 'first_name', 'last_name', 'specialization', 'certification'],
+                ((tid, uid, f'Trainer{tid}', 'Bench', rng.choice(SPECIALIZATIONS), 'NASM-CPT')
+                 for tid, uid in zip(trainer_ids, user_ids['trainer'])))
+
+    analyst_ids = list(range(analyst_id0, analyst_id0 + n_analysts))
+    load.insert('Health_Analyst', ['analyst_id', 'user_id', 'first_name', 'last_name'],
+                ((aid, uid, f'Analyst{aid}', 'Bench') for aid, uid in zip(analyst_ids, user_ids['analyst'])))
+
+    clients = []
+    for i, uid in enumerate(user_ids['client']):
+        birth = datetime.date(rng.randint(1960, 2005), rng.randint(1, 12), rng.randint(1, 28))
+        clients.append({
+            "client_id": client_id0 + i,
+            "user_id": uid,
+            "birth": birth,
+            "level": rng.choices(FITNESS_LEVELS, weights=(4, 4, 2))[0],
+            "join": start + datetime.timedelta(days=rng.randrange(max(1, days // 2))),
+            "trainer_id": rng.choice(trainer_ids),
+        })
+    load.insert('Client', ['client_id', 'user_id', 'first_name', 'last_name', 'date_of_birth', 'age',
+                           'fitness_level', 'goals', 'join_date'],
+                ((c['client_id'], c['user_id'], f"Client{c['client_id']}", 'Bench', c['birth'],
+                  (today - c['birth']).days // 365, c['level'], rng.choice(GOALS), c['join'])
+                 for c in clients))
+
+    load.insert('Trainer_Client', ['trainer_id', 'client_id', 'start_date'],
+                ((c['trainer_id'], c['client_id'], c['join']) for c in clients))
+
+    # ---------------- exercises and templates ----------------
+    exercise_id0 = load.next_id('Exercise', 'exercise_id')
+    exercise_ids = list(range(exercise_id0, exercise_id0 + n_exercises))
+    load.insert('Exercise', ['exercise_id', 'name', 'description', 'category'],
+                ((eid, f'Exercise {eid}', f'Synthetic exercise {eid}', rng.choice(CATEGORIES))
+                 for eid in exercise_ids))
+
+    workout_id0 = load.next_id('Workout_Session_Template', 'workout_id')
+    templates = {}   # trainer_id -> [(workout_id, duration)]
+    template_rows = []
+    for t, tid in enumerate(trainer_ids):
+        for k in range(templates_per_trainer):
+            wid = workout_id0 + t * templates_per_trainer + k
+            duration = rng.choice((30, 45, 60, 75, 90))
+            templates.setdefault(tid, []).append((wid, duration))
+            template_rows.append((wid, tid, rng.choice(analyst_ids), f'Template {wid}',
+                                  f'Synthetic template {wid}', duration, rng.choice(DIFFICULTIES),
+                                  f'{start} 08:00:00'))
+    load.insert('Workout_Session_Template', ['workout_id', 'trainer_id', 'analyst_id', 'name', 'description',
+                                             'duration_minutes', 'difficulty', 'date_created'], template_rows)
+
+    load.insert('Workout_Specific_Exercise', ['workout_id', 'exercise_id', 'sets', 'reps', 'rest_period'],
+                ((wid, eid, rng.randint(2, 5), rng.choice((5, 8, 10, 12, 15)), rng.choice((30, 60, 90, 120)))
+                 for tid in trainer_ids for wid, _ in templates[tid]
+                 for eid in rng.sample(exercise_ids, rng.randint(4, 8))))
+
+    # ---------------- programs (1-3 per client, latest is current) ----------------
+    def program_rows():
+        for c in clients:
+            own = templates[c['trainer_id']]
+            c['templates'] = rng.sample(own, rng.randint(1, min(3, len(own))))
+            for n, (wid, _) in enumerate(c['templates'], start=1):
+                created = c['join'] + datetime.timedelta(days=30 * (n - 1))
+                yield (wid, c['trainer_id'], c['client_id'], f'Program {n} for client {c["client_id"]}',
+                       'Synthetic program', f'{created} 10:00:00')
+
+    load.insert('Client_Specific_Workout_Program',
+                ['workout_id', 'created_by', 'client_id', 'name', 'description', 'created_at'], program_rows())
+
+    # ---------------- workout logs + trainer feedback ----------------
+    log_id0 = load.next_id('Client_Workout_Log', 'log_id')
+    feedback = []
+    log_id = log_id0
+
+    def logs():
+        nonlocal log_id
+        for c in clients:
+            span = max(1, (today - c['join']).days)
+            rate = COMPLETION_RATE[c['level']]
+            completed = 0
+            for _ in range(logs_per_client):
+                wid, duration = rng.choice(c['templates'])
+                day = c['join'] + datetime.timedelta(days=rng.randrange(span))
+                roll = rng.random()
+                status = 'completed' if roll < rate else ('partial' if roll < rate + 0.15 else 'not_started')
+                minutes = None
+                if status == 'completed':
+                    minutes = max(5, int(rng.gauss(duration, duration * 0.15)))
+                    completed += 1
+                elif status == 'partial':
+                    minutes = max(5, int(duration * rng.uniform(0.2, 0.7)))
+                if rng.random() < 0.05:
+                    feedback.append((c['trainer_id'], log_id, rng.choice(FEEDBACK), f'{day} 20:00:00'))
+                yield (log_id, c['client_id'], wid, day, status, minutes, None)
+                log_id += 1
+            c['completed_share'] = completed / logs_per_client if logs_per_client else 0
+
+    load.insert('Client_Workout_Log', ['log_id', 'client_id', 'workout_id', 'workout_date',
+                                       'completion_status', 'duration_minutes', 'notes'], logs())
+    load.insert('Trainer_Feedback', ['trainer_id', 'log_id', 'comment', 'created_at'], feedback)
+
+    # ---------------- monthly health metrics, trending with adherence ----------------
+    def metrics():
+        for c in clients:
+            weight = rng.uniform(55, 110)
+            body_fat = rng.uniform(12, 35)
+            height = rng.uniform(60, 76)
+            trend = 0.6 * c['completed_share'] - 0.2   # % body fat lost per month
+            day = c['join']
+            while day <= today:
+                bmi = weight / ((height * 0.0254) ** 2)
+                yield (c['client_id'], rng.choice(analyst_ids), day, round(weight, 2), round(height, 1),
+                       round(bmi, 1), round(body_fat, 1), rng.randint(55, 90))
+                body_fat = max(6.0, body_fat - trend + rng.gauss(0, 0.3))
+                weight = max(45.0, weight - trend * 0.8 + rng.gauss(0, 0.5))
+                day += datetime.timedelta(days=30)
+
+    load.insert('Health_Metrics', ['client_id', 'analyst_id', 'record_date', 'weight_kg', 'height_inches',
+                                   'bmi', 'body_fat_percentage', 'heart_rate'], metrics())
+
+    # ---------------- system and backup logs ----------------
+    all_users = user_ids['trainer'] + user_ids['client'] + user_ids['analyst']
+
+    def system_logs():
+        for _ in range(20 * n_clients):
+            uid = rng.choice(all_users)
+            action = rng.choice(ACTIONS)
+            at = datetime.datetime.combine(start, datetime.time()) + datetime.timedelta(
+                seconds=rng.randrange(days * 86400))
+            yield (uid, action, f'{action} action by user {uid}', at)
+
+    load.insert('System_Log', ['user_id', 'action_type', 'description', 'timestamp'], system_logs())
+
+    def backups():
+        for d in range(days):
+            begin = datetime.datetime.combine(start + datetime.timedelta(days=d), datetime.time(2, 0))
+            minutes = rng.randint(10, 40)
+            status = rng.choices(('success', 'failed', 'partial'), weights=(95, 3, 2))[0]
+            yield (admin_id, begin, begin + datetime.timedelta(minutes=minutes), minutes, status)
+
+    load.insert('Backup_Log', ['performed_by', 'backup_start', 'backup_end', 'backup_time_mins', 'status'],
+                backups())
+
+    with conn.cursor() as cursor:
+        cursor.execute("SET foreign_key_checks = 1, unique_checks = 1")
+
+    # ---------------- derived tables ----------------
+    from backend import programs, rollups, versions
+    started = time.perf_counter()
+    with conn.cursor() as cursor:
+        counts = rollups.rebuild_all(cursor)
+        counts['Client_Current_Program'] = programs.rebuild_current_programs(cursor)
+        # every table grew, so no ETag handed out before this run is valid
+        versions.bump(cursor, *versions.DOMAINS)
+    conn.commit()
+    load.report['derived'] = {"rows": counts, "seconds": round(time.perf_counter() - started, 3)}
+
+    return load.report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=float, default=1.0, help='1.0 = 1,000 clients')
+    parser.add_argument('--logs-per-client', type=int, default=100)
+    parser.add_argument('--days', type=int, default=730, help='length of the generated history')
+    parser.add_argument('--batch-rows', type=int, default=5000, help='rows per INSERT batch / transaction')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--host')
+    parser.add_argument('--port', type=int)
+    args = parser.parse_args(argv)
+
+    # same settings the API reads (api/.env)
+    load_dotenv()
+    conn = pymysql.connect(
+        host=args.host or os.getenv('DB_HOST', 'localhost').strip(),
+        port=args.port or int(os.getenv('DB_PORT', '3306').strip()),
+        user=os.getenv('DB_USER', 'root').strip(),
+        password=os.getenv('MYSQL_ROOT_PASSWORD', '').strip(),
+        database=os.getenv('DB_NAME', 'fitflow').strip(),
+        charset='utf8mb4',
+        cursorclass=pymysql.cursors.DictCursor,
+    )
+    started = time.perf_counter()
+    try:
+        report = generate(conn, args.scale, args.logs_per_client, args.days, args.batch_rows, args.seed)
+    finally:
+        conn.close()
+
+    print(json.dumps({"args": vars(args), "seconds_total": round(time.perf_counter() - started, 3),
+                      "tables": report}, indent=2, default=str))
+
+
+if __name__ == '__main__':
+    main()
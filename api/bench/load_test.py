@@ -0,0 +1,222 @@
+#------------------------------------------------------------
+# Load-test harness.
+#
+# Replays a weighted mix of GET routes from all four blueprints
+# against a running API with --concurrency worker threads, each
+# holding one keep-alive connection, for --duration seconds (or
+# until --requests have been sent). Per route it reports request
+# count, error rate, throughput and p50/p95/p99 latency as JSON so
+# runs can be diffed across commits:
+#
+#   python -m bench.load_test --concurrency 32 --duration 60 \
+#       --clients 10000 --trainers 200 --output before.json
+#------------------------------------------------------------
+import argparse
+import http.client
+import json
+import random
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+# (name, weight, path) - {client}, {trainer}, {log} are filled with random ids
+ROUTE_MIX = [
+    # client
+    ("client.workout_log",            20, "/client/client_workout_log?client_id={client}"),
+    ("client.monthly_completion",     10, "/client/client_workout_log/completion_rate/monthly?client_id={client}"),
+    ("client.program_exercises",      10, "/client/client_specific_workout_program/exercises?client_id={client}"),
+    # trainer
+    ("trainer.client_logs",           10, "/trainer/client-logs?limit=50"),
+    ("trainer.templates",              8, "/trainer/view-all-templates/{trainer}"),
+    ("trainer.programs",               5, "/trainer/programs/{trainer}"),
+    ("trainer.progress",               8, "/trainer/progress/{client}"),
+    ("trainer.roster_progress",        5, "/trainer/{trainer}/progress?limit=20"),
+    ("trainer.feedback",               5, "/trainer/feedback?from_log_id={log}&to_log_id={log_end}"),
+    ("trainer.workout_exercises",      3, "/trainer/workout-exercises?limit=50"),
+    # health analyst
+    ("health_analyst.avg_duration",    3, "/health_analyst/avg_duration"),
+    ("health_analyst.recent_metrics",  3, "/health_analyst/recent_metrics"),
+    ("health_analyst.progression",     5, "/health_analyst/health_progression/{client}"),
+    ("health_analyst.completion_rates", 2, "/health_analyst/completion_rates"),
+    ("health_analyst.template_usage",  2, "/health_analyst/template_usage"),
+    ("health_analyst.client_info",     2, "/health_analyst/client_info?limit=50"),
+    # system admin
+    ("system_admin.system_logs",       2, "/system_admin/system_logs?limit=50"),
+    ("system_admin.backup_logs",       1, "/system_admin/backup_logs?limit=50"),
+    ("system_admin.permissions",       1, "/system_admin/user/permissions"),
+]
+
+
+def percentile(ordered, q):
+    if not ordered:
+        return None
+    k = (len(ordered) - 1) * q
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+class Worker(threading.Thread):
+    """Sends requests over one persistent connection until the run is over."""
+
+    def __init__(self, run, seed):
+        super().__init__(daemon=True)
+        self.run_state = run
+        self.rng = random.Random(seed)
+        self.samples = []   # (route, seconds, ok)
+        self.conn = None
+
+    def connect(self):
+        target = self.run_state.target
+        cls = http.client.HTTPSConnection if target.scheme == "https" else http.client.HTTPConnection
+        self.conn = cls(target.hostname, target.port, timeout=self.run_state.timeout)
+
+    def path_for(self, template):
+        args = self.run_state.args
+        log = self.rng.randint(1, max(1, args.logs - 100))
+        return self.run_state.prefix + template.format(
+            client=self.rng.randint(1, args.clients),
+            trainer=self.rng.randint(1, args.trainers),
+            log=log,
+            log_end=log + 99,
+        )
+
+    def run(self):
+        run = self.run_state
+        self.connect()
+        while run.take():
+            name, template = self.rng.choices(run.routes, weights=run.weights)[0]
+            path = self.path_for(template)
+            started = time.perf_counter()
+            try:
+                self.conn.request("GET", path, headers={"Accept": "application/json"})
+                response = self.conn.getresponse()
+                response.read()
+                ok = response.status < 400
+            except (OSError, http.client.HTTPException):
+                ok = False
+                self.conn.close()
+                self.connect()
+            self.samples.append((name, time.perf_counter() - started, ok))
+
+
+class Run:
+    def __init__(self, args):
+        self.args = args
+        self.target = urlsplit(args.base_url)
+        self.prefix = self.target.path.rstrip("/")
+        self.timeout = args.timeout
+        selected = [r for r in ROUTE_MIX if not args.only or any(r[0].startswith(p) for p in args.only)]
+        if not selected:
+            raise SystemExit("no route matches --only")
+        self.routes = [(name, path) for name, _, path in selected]
+        self.weights = [weight for _, weight, _ in selected]
+        self.deadline = None
+        self.remaining = args.requests
+        self.lock = threading.Lock()
+
+    def take(self):
+        if time.perf_counter() >= self.deadline:
+            return False
+        if self.remaining is None:
+            return True
+        with self.lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+
+def summarize(samples, elapsed):
+    by_route = {}
+    for name, seconds, ok in samples:
+        by_route.setdefault(name, []).append((seconds, ok))
+
+    def stats(entries):
+        latencies = sorted(s for s, _ in entries)
+        errors = sum(1 for _, ok in entries if not ok)
+        return {
+            "requests": len(entries),
+            "errors": errors,
+            "error_rate": round(errors / len(entries), 4) if entries else 0.0,
+            "throughput_rps": round(len(entries) / elapsed, 2) if elapsed else None,
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+            "max_ms": round(latencies[-1] * 1000, 2),
+        }
+
+    routes = {name: stats(entries) for name, entries in sorted(by_route.items())}
+    overall = stats([(s, ok) for _, s, ok in samples]) if samples else {}
+    return overall, routes
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://localhost:4000')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds to run')
+    parser.add_argument('--requests', type=int, help='stop after this many requests')
+    parser.add_argument('--warmup', type=float, default=5.0, help='seconds of traffic not counted')
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--clients', type=int, default=1000, help='random client ids are drawn from 1..N')
+    parser.add_argument('--trainers', type=int, default=20)
+    parser.add_argument('--logs', type=int, default=100000)
+    parser.add_argument('--only', action='append', help='route name prefix, e.g. trainer. (repeatable)')
+    parser.add_argument('--label', help='free-form tag stored in the report (default: git revision)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='also write the JSON report to this file')
+    args = parser.parse_args(argv)
+
+    run = Run(args)
+    if args.warmup:
+        print(f"warming up for {args.warmup:.0f}s", file=sys.stderr)
+        run.deadline = time.perf_counter() + args.warmup
+        warm = [Worker(run, args.seed + 1000 + i) for i in range(args.concurrency)]
+        for w in warm:
+            w.start()
+        for w in warm:
+            w.join()
+        run.remaining = args.requests
+
+    workers = [Worker(run, args.seed + i) for i in range(args.concurrency)]
+    print(f"running {args.concurrency} workers for {args.duration:.0f}s", file=sys.stderr)
+    started = time.perf_counter()
+    run.deadline = started + args.duration
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - started
+
+    samples = [s for w in workers for s in w.samples]
+    overall, routes = summarize(samples, elapsed)
+    report = {
+        "label": args.label or git_revision(),
+        "started_at": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "base_url": args.base_url,
+        "concurrency": args.concurrency,
+        "seconds": round(elapsed, 3),
+        "overall": overall,
+        "routes": routes,
+    }
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+
+
+if __name__ == '__main__':
+    main()
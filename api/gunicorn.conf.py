@@ -0,0 +1,60 @@
+###
+# Production server settings (gunicorn -c gunicorn.conf.py backend_app:app)
+#
+# Every value can be overridden from the environment, e.g. in
+# docker-compose.yaml. Send SIGHUP to the master process for a graceful
+# reload: new workers are started with fresh code and the old ones
+# finish their in-flight requests before exiting.
+###
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('API_PORT', '4000')}"
+
+# pre-fork worker processes, each with its own thread pool
+workers = int(os.getenv('API_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('API_THREADS', '4'))
+worker_class = 'gthread' if threads > 1 else 'sync'
+
+# recycle a worker after this many requests (+ random jitter so they
+# don't all restart at once); 0 disables recycling
+max_requests = int(os.getenv('API_MAX_REQUESTS', '1000'))
+max_requests_jitter = int(os.getenv('API_MAX_REQUESTS_JITTER', '100'))
+
+timeout = int(os.getenv('API_WORKER_TIMEOUT', '60'))
+graceful_timeout = int(os.getenv('API_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.getenv('API_KEEPALIVE', '5'))
+
+# load the app once in the master and fork it (less memory, faster
+# worker start) - but then SIGHUP no longer picks up code changes
+preload_app = os.getenv('API_PRELOAD', '0') == '1'
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('API_LOG_LEVEL', 'info')
+
+# workers write their metrics here so GET /metrics can sum over all of them
+os.environ.setdefault('METRICS_DIR', '/tmp/fitflow-metrics')
+
+
+def on_starting(server):
+    from backend import metrics
+    metrics.reset_dir(os.environ['METRICS_DIR'])
+
+
+def post_fork(server, worker):
+    # with preload_app the master may already have opened DB connections
+    # (e.g. DB_AUTO_MIGRATE); every worker must open its own
+    from backend.db_connection import db
+    db.after_fork()
+
+
+def worker_exit(server, worker):
+    # last values of this worker, before the master archives them
+    from backend import metrics
+    metrics.flush()
+
+
+def child_exit(server, worker):
+    from backend import metrics
+    metrics.mark_process_dead(worker.pid, os.environ['METRICS_DIR'])
@@ -0,0 +1,147 @@
+#------------------------------------------------------------
+# Shared fixtures: in-memory stand-ins for the services the API
+# talks to, so the tests need neither MySQL nor Redis.
+#------------------------------------------------------------
+import fnmatch
+
+import pytest
+from flask import Flask
+
+
+class FakeRedis:
+    """The subset of redis-py that backend.cache.RedisCache uses; expiry is recorded, not enforced."""
+
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+        self.ttls = {}
+
+    def get(self, key):
+        value = self.values.get(key)
+        return value.encode('utf-8') if isinstance(value, str) else value
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+        self.ttls.pop(key, None)
+        if ex is not None:
+            self.ttls[key] = ex
+
+    def delete(self, *keys):
+        removed = 0
+        for key in keys:
+            key = key.decode('utf-8') if isinstance(key, bytes) else key
+            found = self.values.pop(key, None) is not None or self.sets.pop(key, None) is not None
+            self.ttls.pop(key, None)
+            removed += found
+        return removed
+
+    def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+
+    def smembers(self, key):
+        return set(self.sets.get(key, ()))
+
+    def expire(self, key, seconds, nx=False, gt=False):
+        if key not in self.values and key not in self.sets:
+            return False
+        current = self.ttls.get(key)
+        if nx and current is not None:
+            return False
+        # like Redis, GT treats a key without a TTL as infinite
+        if gt and (current is None or seconds <= current):
+            return False
+        self.ttls[key] = seconds
+        return True
+
+    def ttl(self, key):
+        if key not in self.values and key not in self.sets:
+            return -2
+        return self.ttls.get(key, -1)
+
+    def scan_iter(self, match='*', count=None):
+        for key in list(self.values) + list(self.sets):
+            if fnmatch.fnmatchcase(key, match):
+                yield key.encode('utf-8')
+
+    def info(self, section=None):
+        return {}
+
+
+@pytest.fixture
+def fake_redis():
+    return FakeRedis()
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    with app.app_context():
+        yield app
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.rows = []
+        self.rowcount = 0
+        self.lastrowid = None
+
+    def execute(self, sql, params=()):
+        self.conn.statements.append((" ".join(sql.split()), params))
+        self.rows = list(self.conn.results(sql, params) or [])
+        self.rowcount = len(self.rows)
+
+    def executemany(self, sql, rows):
+        self.conn.statements.append((" ".join(sql.split()), rows))
+        self.conn.results(sql, rows)
+        self.rows, self.rowcount = [], len(rows)
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return list(self.rows)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """
+    Records every statement; `results(sql, params)` supplies the rows a
+    query returns (or raises). executemany() passes the list of rows.
+    """
+
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.results = lambda sql, params: []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    """Point backend.db_connection.db at a FakeConnection for the test."""
+    from backend.db_connection import db
+
+    conn = FakeConnection()
+    monkeypatch.setattr(db, "get_db", lambda: conn)
+    return conn
+
+
+@pytest.fixture
+def blueprint_client(app):
+    """blueprint_client(bp, prefix) -> a test client for an app serving just that blueprint."""
+    def make(blueprint, url_prefix):
+        app.register_blueprint(blueprint, url_prefix=url_prefix)
+        return app.test_client()
+    return make
@@ -0,0 +1,123 @@
+import pytest
+from pymysql.err import IntegrityError, OperationalError
+
+from backend.client import bulk_logs
+
+
+class LogTable:
+    """Just enough of MySQL for ingest_chunk: FK lookups, the unique key and the FK on insert."""
+
+    def __init__(self, clients=(1, 2), workouts=(10, 11)):
+        self.clients = set(clients)
+        self.workouts = set(workouts)
+        self.logs = {}
+
+    def __call__(self, sql, params):
+        sql = " ".join(sql.split())
+        if sql.startswith("SELECT client_id FROM Client "):
+            return [{"client_id": c} for c in params if c in self.clients]
+        if sql.startswith("SELECT workout_id FROM Workout_Session_Template "):
+            return [{"workout_id": w} for w in params if w in self.workouts]
+        if sql.startswith("SELECT idempotency_key, log_id FROM Client_Workout_Log"):
+            return [{"idempotency_key": k, "log_id": self.logs[k]["log_id"]} for k in params if k in self.logs]
+        if sql.startswith("SELECT log_id, client_id"):
+            return [self.logs[k] for k in params if k in self.logs]
+        if sql.startswith("INSERT INTO Client_Workout_Log"):
+            rows = params if isinstance(params, list) else [params]
+            for row in rows:
+                if row[1] not in self.workouts:
+                    raise IntegrityError(1452, "Cannot add or update a child row: a foreign key constraint fails")
+                if row[6] in self.logs:
+                    raise IntegrityError(1062, f"Duplicate entry '{row[6]}' for key 'uq_cwl_idempotency_key'")
+            for row in rows:
+                self.logs[row[6]] = {"log_id": len(self.logs) + 1, "client_id": row[0], "workout_id": row[1],
+                                     "workout_date": row[2], "completion_status": row[3],
+                                     "duration_minutes": row[4]}
+        return []
+
+
+def log(key, workout_id=10, **fields):
+    return {"client_id": 1, "workout_id": workout_id, "date": "2026-01-05",
+            "completion_status": "completed", "duration_minutes": 30, "idempotency_key": key, **fields}
+
+
+def ingest(fake_db, table, *items):
+    fake_db.results = table
+    return bulk_logs.ingest_chunk(fake_db, list(enumerate(items)), set())
+
+
+def statuses(results):
+    return [r["status"] for r in results]
+
+
+def test_valid_chunk_is_created(app, fake_db):
+    table = LogTable()
+    results = ingest(fake_db, table, log("a"), log("b", workout_id=11))
+
+    assert statuses(results) == ["created", "created"]
+    assert set(table.logs) == {"a", "b"}
+    assert fake_db.commits == 1
+
+
+def test_fk_checked_up_front(app, fake_db):
+    results = ingest(fake_db, LogTable(), log("a"), log("b", workout_id=99), log("c", client_id=7))
+
+    assert statuses(results) == ["created", "invalid", "invalid"]
+    assert results[1]["error"] == "unknown workout_id 99"
+
+
+def test_fk_failure_on_insert_fails_only_its_items(app, fake_db):
+    table = LogTable()
+
+    # template 11 passes the check, then is deleted before the insert
+    def deleted_after_check(sql, params):
+        rows = table(sql, params)
+        if "FROM Workout_Session_Template" in sql:
+            table.workouts.discard(11)
+        return rows
+
+    fake_db.results = deleted_after_check
+    results = bulk_logs.ingest_chunk(fake_db, list(enumerate([log("a"), log("b", workout_id=11), log("c")])), set())
+
+    assert statuses(results) == ["created", "error", "created"]
+    assert "foreign key" in results[1]["error"]
+    assert set(table.logs) == {"a", "c"}
+    assert fake_db.rollbacks == 1
+    assert fake_db.commits == 1
+
+
+def test_already_ingested_keys_are_duplicates(app, fake_db):
+    table = LogTable()
+    ingest(fake_db, table, log("a"))
+    results = ingest(fake_db, table, log("a"), log("b"))
+
+    assert statuses(results) == ["duplicate", "created"]
+    assert results[0]["log_id"] == table.logs["a"]["log_id"]
+
+
+@pytest.mark.parametrize("notes, error", [
+    (42, True),
+    (["x"], True),
+    ("x" * bulk_logs.MAX_NOTES_BYTES, False),
+    ("é" * (bulk_logs.MAX_NOTES_BYTES // 2 + 1), True),   # two bytes each in UTF-8
+    (None, False),
+])
+def test_notes_are_validated(app, fake_db, notes, error):
+    results = ingest(fake_db, LogTable(), log("a", notes=notes))
+
+    assert statuses(results) == (["invalid"] if error else ["created"])
+    if error:
+        assert results[0]["error"].startswith("notes must be")
+
+
+def test_database_error_is_a_json_500(blueprint_client, fake_db):
+    from backend.client.client_routes import client
+
+    def down(sql, params):
+        raise OperationalError(2013, "Lost connection to MySQL server during query")
+
+    fake_db.results = down
+    response = blueprint_client(client, "/client").post("/client/client_workout_log/bulk", json=[log("a")])
+
+    assert response.status_code == 500
+    assert "Lost connection" in response.get_json()["error"]
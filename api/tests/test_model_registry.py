@@ -0,0 +1,86 @@
+import time
+
+import numpy as np
+import pytest
+from pymysql.err import OperationalError
+
+from backend.ml_models.registry import ModelNotTrained, ModelRegistry
+
+
+class ParamsTable:
+    """model1_params as the registry reads it; `down` makes every query fail."""
+
+    def __init__(self, *betas):
+        self.rows = dict(enumerate(betas, start=1))
+        self.down = False
+
+    def __call__(self, sql, params):
+        if self.down:
+            raise OperationalError(2003, "Can't connect to MySQL server")
+        if "MAX(sequence_number)" in sql:
+            return [{"sequence_number": max(self.rows, default=None)}]
+        return [{"beta_vals": self.rows[params[0]]}]
+
+
+@pytest.fixture
+def registry(app, fake_db):
+    app.config["MODEL_POLL_INTERVAL"] = 0.01
+    registry = ModelRegistry("model1_params")
+    yield registry
+    registry.stop()
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_first_call_loads_then_requests_never_query(app, registry, fake_db):
+    app.config["MODEL_POLL_INTERVAL"] = 60      # the poller stays asleep
+    fake_db.results = ParamsTable("[1.0, 2.0, 3.0]")
+
+    np.testing.assert_array_equal(registry.params(), [1.0, 2.0, 3.0])
+    queries = len(fake_db.statements)
+    for _ in range(100):
+        registry.params()
+    assert len(fake_db.statements) == queries
+
+
+def test_poller_picks_up_new_parameters(registry, fake_db):
+    table = fake_db.results = ParamsTable("[1.0, 2.0, 3.0]")
+    registry.params()
+
+    table.rows[2] = "[4.0, 5.0, 6.0]"
+    wait_for(lambda: registry.info()["sequence_number"] == 2)
+    np.testing.assert_array_equal(registry.params(), [4.0, 5.0, 6.0])
+    assert registry.info()["loads"] == 2
+
+
+def test_failed_poll_keeps_current_parameters(registry, fake_db):
+    table = fake_db.results = ParamsTable("[1.0, 2.0, 3.0]")
+    registry.params()
+
+    table.down = True
+    wait_for(lambda: registry.info()["poll_failures"] >= 2)
+    np.testing.assert_array_equal(registry.params(), [1.0, 2.0, 3.0])
+
+    table.down = False
+    table.rows[2] = "[0.5, 0.5, 0.5]"
+    wait_for(lambda: registry.info()["sequence_number"] == 2)
+
+
+def test_untrained_model(registry, fake_db):
+    fake_db.results = ParamsTable()
+    with pytest.raises(ModelNotTrained):
+        registry.params()
+
+
+def test_polling_disabled(app, fake_db):
+    app.config["MODEL_POLL_INTERVAL"] = 0
+    fake_db.results = ParamsTable("[1.0, 2.0, 3.0]")
+    registry = ModelRegistry("model1_params")
+    registry.params()
+    time.sleep(0.05)
+    assert len(fake_db.statements) == 2
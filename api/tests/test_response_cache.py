@@ -0,0 +1,183 @@
+import pytest
+from flask import jsonify
+
+from backend.cache import ANY_TAG, ResponseCache
+from backend.cache.memory import MemoryCache
+from backend.cache.redis_backend import RedisCache
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request, fake_redis):
+    if request.param == "memory":
+        return MemoryCache(max_entries=16, default_ttl=60)
+    return RedisCache(fake_redis, default_ttl=60)
+
+
+@pytest.fixture
+def cache(app, backend):
+    cache = ResponseCache()
+    cache.init_app(app, backend=backend)
+    return cache
+
+
+# ---------------------------------------------------------
+# backends
+# ---------------------------------------------------------
+def test_get_returns_what_set_stored(backend):
+    backend.set("a", "1")
+    assert backend.get("a") == "1"
+    assert backend.get("missing") is None
+
+
+def test_delete(backend):
+    backend.set("a", "1")
+    backend.delete("a")
+    assert backend.get("a") is None
+
+
+def test_invalidate_tags_drops_only_tagged_entries(backend):
+    backend.set("a", "1", tags=["template:1"])
+    backend.set("b", "2", tags=["template:1", "exercise:4"])
+    backend.set("c", "3", tags=["template:2"])
+
+    assert backend.invalidate_tags(["template:1"]) == 2
+    assert backend.get("a") is None
+    assert backend.get("b") is None
+    assert backend.get("c") == "3"
+
+
+def test_memory_entry_expires():
+    backend = MemoryCache()
+    backend.set("a", "1", ttl=0)
+    assert backend.get("a") is None
+    assert backend.info()["expirations"] == 1
+
+
+def test_memory_evicts_least_recently_used():
+    backend = MemoryCache(max_entries=2)
+    backend.set("a", "1", tags=["t"])
+    backend.set("b", "2", tags=["t"])
+    backend.get("a")
+    backend.set("c", "3")
+
+    assert backend.get("b") is None
+    assert backend.get("a") == "1"
+    assert backend.get("c") == "3"
+    assert backend.info()["evictions"] == 1
+    # the evicted key left the tag index too
+    assert backend.invalidate_tags(["t"]) == 1
+
+
+def test_redis_tag_ttl_is_only_extended(fake_redis):
+    backend = RedisCache(fake_redis)
+    backend.set("long", "1", tags=["t"], ttl=300)
+    backend.set("short", "2", tags=["t"], ttl=10)
+    assert fake_redis.ttl("fitflow:cache:tag:t") == 300
+
+    backend.set("longer", "3", tags=["t"], ttl=900)
+    assert fake_redis.ttl("fitflow:cache:tag:t") == 900
+
+
+def test_redis_clear_removes_only_its_prefix(fake_redis):
+    backend = RedisCache(fake_redis)
+    for i in range(5):
+        backend.set(f"k{i}", str(i), tags=[f"t{i % 2}"])
+    fake_redis.set("other:key", "keep")
+
+    assert backend.clear(batch=2) == 7      # 5 entries + 2 tag sets
+    assert list(fake_redis.scan_iter(match="fitflow:cache:*")) == []
+    assert fake_redis.get("other:key") == b"keep"
+
+
+# ---------------------------------------------------------
+# ResponseCache
+# ---------------------------------------------------------
+def test_hits_and_misses_are_counted(cache):
+    cache.set("a", "1")
+    assert cache.get("a") == "1"
+    assert cache.get("b") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_invalidate_drops_tagged_entries(cache):
+    cache.set("a", "1", tags=["role:client"])
+    cache.set("b", "2", tags=["role:trainer"])
+
+    assert cache.invalidate("role:client") == 1
+    assert cache.get("a") is None
+    assert cache.get("b") == "2"
+
+
+def test_set_keeps_entry_when_generations_unchanged(cache):
+    generations = cache.generations(["client:3"])
+    cache.set("a", "1", tags=["client:3"], generations=generations)
+    assert cache.get("a") == "1"
+
+
+def test_set_drops_entry_invalidated_since_the_snapshot(cache):
+    generations = cache.generations(["client:3"])
+    # a write commits while the reader is still querying
+    cache.invalidate("client:3")
+    cache.set("a", "stale", tags=["client:3"], generations=generations)
+    assert cache.get("a") is None
+
+
+def test_invalidate_moves_the_parent_generation(cache):
+    before = cache.generations([ANY_TAG])
+    cache.invalidate("unrelated")
+    assert cache.generations([ANY_TAG]) != before
+
+
+# ---------------------------------------------------------
+# @cached
+# ---------------------------------------------------------
+def cached_view(app, cache, during_view=None):
+    calls = []
+
+    @app.route("/items")
+    @cache.cached(tags=lambda args, rows: {f"item:{r}" for r in rows})
+    def items():
+        calls.append(1)
+        if during_view:
+            during_view()
+        return jsonify([1, 2])
+
+    return app.test_client(), calls
+
+
+def test_cached_view_is_served_from_cache(app, cache):
+    client, calls = cached_view(app, cache)
+
+    first = client.get("/items")
+    second = client.get("/items")
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.get_json() == [1, 2]
+    assert len(calls) == 1
+
+    revalidated = client.get("/items", headers={"If-None-Match": first.headers["ETag"]})
+    assert revalidated.status_code == 304
+
+
+def test_cached_view_is_dropped_by_its_tags(app, cache):
+    client, calls = cached_view(app, cache)
+
+    client.get("/items")
+    cache.invalidate("item:2")
+    assert client.get("/items").headers["X-Cache"] == "MISS"
+    assert len(calls) == 2
+
+
+def test_cached_view_is_not_stored_across_an_invalidation(app, cache):
+    def write_once():
+        # only the first call overlaps a write that commits and invalidates
+        if not calls[1:]:
+            cache.invalidate("item:1")
+
+    client, calls = cached_view(app, cache, during_view=write_once)
+
+    assert client.get("/items").headers["X-Cache"] == "MISS"
+    assert client.get("/items").headers["X-Cache"] == "MISS"
+    assert client.get("/items").headers["X-Cache"] == "HIT"
+    assert len(calls) == 2
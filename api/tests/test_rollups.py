@@ -0,0 +1,374 @@
+#------------------------------------------------------------
+# The rollup tables stay equal to a from-scratch aggregate of the
+# base rows through inserts, updates, deletes, rows moving between
+# buckets and the FK cascades of deleting a trainer or client.
+#
+# RollupDB stands in for MySQL: it applies the statements the
+# maintainers issue (additive upserts, the latest-metric refresh,
+# the Data_Version bump) to in-memory tables, and the tests delete
+# base rows and cascade the way the routes do.
+#------------------------------------------------------------
+import datetime
+import re
+from collections import defaultdict
+from decimal import Decimal
+
+import pytest
+
+from backend import rollups
+from backend.rollups import (weekly_workouts, monthly_workouts, template_counts, program_counts,
+                             monthly_health, latest_health)
+
+MAINTAINERS = rollups.WORKOUT_LOG_MAINTAINERS + rollups.HEALTH_METRIC_MAINTAINERS
+KEYS = {m.TABLE: m.KEY_COLUMNS for m in MAINTAINERS}
+
+UPSERT = re.compile(r"INSERT INTO (\w+) \(([^)]*)\) VALUES .* AS d ON DUPLICATE KEY UPDATE (.*)", re.S)
+
+
+class RollupDB:
+    def __init__(self):
+        self.logs = {}
+        self.metrics = {}
+        self.tables = {table: {} for table in KEYS}
+        self.bumps = defaultdict(int)
+        self._next_id = 1
+
+    def next_id(self):
+        self._next_id += 1
+        return self._next_id
+
+    def cursor(self):
+        return RollupCursor(self)
+
+    def cascade(self, table_column_values):
+        """Drop rollup rows whose key column holds one of the values, like ON DELETE CASCADE."""
+        for table, column, values in table_column_values:
+            index = KEYS[table].index(column)
+            self.tables[table] = {k: v for k, v in self.tables[table].items() if k[index] not in values}
+
+
+class RollupCursor:
+    def __init__(self, db):
+        self.db = db
+        self.rows = []
+
+    def execute(self, sql, params=()):
+        sql = " ".join(sql.split())
+        self.rows = []
+        if sql.startswith("INSERT INTO Data_Version"):
+            self.db.bumps[params[0]] += 1
+        elif sql.startswith(f"SELECT metric_id FROM {latest_health.TABLE}"):
+            pass
+        elif sql.startswith("SELECT") and "FROM Health_Metrics WHERE client_id = %s" in sql:
+            rows = [m for m in self.db.metrics.values() if m["client_id"] == params[0]]
+            rows.sort(key=lambda m: (m["record_date"], m["metric_id"]), reverse=True)
+            self.rows = rows[:1]
+        elif sql.startswith(f"DELETE FROM {latest_health.TABLE} WHERE client_id = %s"):
+            self.db.tables[latest_health.TABLE].pop((params[0],), None)
+        elif UPSERT.match(sql):
+            self._upsert(*UPSERT.match(sql).groups(), params)
+        else:
+            raise AssertionError(f"unexpected statement: {sql}")
+
+    def _upsert(self, table, columns, updates, params):
+        columns = [c.strip() for c in columns.split(",")]
+        additive = "+ d." in updates
+        key_columns = KEYS[table]
+        stored = self.db.tables[table]
+        for i in range(0, len(params), len(columns)):
+            row = dict(zip(columns, params[i:i + len(columns)]))
+            key = tuple(row[k] for k in key_columns)
+            values = {c: v for c, v in row.items() if c not in key_columns}
+            if additive and key in stored:
+                stored[key] = {c: stored[key][c] + v for c, v in values.items()}
+            else:
+                stored[key] = values
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return list(self.rows)
+
+
+# ---------------------------------------------------------
+# the routes' write pattern: before rows, change, after rows
+# ---------------------------------------------------------
+def add_logs(db, *logs):
+    rows = []
+    for client_id, workout_id, date, status, duration in logs:
+        log = {"log_id": db.next_id(), "client_id": client_id, "workout_id": workout_id,
+               "workout_date": datetime.date.fromisoformat(date),
+               "completion_status": status, "duration_minutes": duration}
+        db.logs[log["log_id"]] = log
+        rows.append(dict(log))
+    rollups.workout_logs_changed(db.cursor(), after=rows)
+    return [row["log_id"] for row in rows]
+
+
+def update_log(db, log_id, **changes):
+    before = [dict(db.logs[log_id])]
+    db.logs[log_id].update(changes)
+    rollups.workout_logs_changed(db.cursor(), before, [dict(db.logs[log_id])])
+
+
+def delete_logs(db, predicate):
+    before = [dict(log) for log in db.logs.values() if predicate(log)]
+    for log in before:
+        del db.logs[log["log_id"]]
+    rollups.workout_logs_changed(db.cursor(), before=before)
+
+
+def add_metrics(db, *metrics):
+    rows = []
+    for client_id, date, weight, body_fat in metrics:
+        metric = {"metric_id": db.next_id(), "client_id": client_id,
+                  "record_date": datetime.date.fromisoformat(date),
+                  "weight_kg": weight, "body_fat_percentage": body_fat, "heart_rate": 70}
+        db.metrics[metric["metric_id"]] = metric
+        rows.append(dict(metric))
+    rollups.health_metrics_changed(db.cursor(), after=rows)
+    return [row["metric_id"] for row in rows]
+
+
+def update_metric(db, metric_id, **changes):
+    before = [dict(db.metrics[metric_id])]
+    db.metrics[metric_id].update(changes)
+    rollups.health_metrics_changed(db.cursor(), before, [dict(db.metrics[metric_id])])
+
+
+def delete_metric(db, metric_id):
+    before = [db.metrics.pop(metric_id)]
+    rollups.health_metrics_changed(db.cursor(), before=before)
+
+
+# ---------------------------------------------------------
+# from-scratch aggregates (what each SOURCE query computes)
+# ---------------------------------------------------------
+def status_counts(logs):
+    return {"total_workouts": len(logs),
+            "completed_workouts": sum(l["completion_status"] == "completed" for l in logs),
+            "partial_workouts": sum(l["completion_status"] == "partial" for l in logs),
+            "not_started_workouts": sum(l["completion_status"] == "not_started" for l in logs)}
+
+
+def timed(logs):
+    durations = [l["duration_minutes"] for l in logs
+                 if l["completion_status"] == "completed" and l["duration_minutes"] is not None]
+    return {"completed_duration_sum": sum(durations), "completed_duration_count": len(durations)}
+
+
+def grouped(rows, key):
+    groups = defaultdict(list)
+    for row in rows:
+        groups[key(row)].append(row)
+    return groups
+
+
+def expected_tables(db):
+    logs, metrics = list(db.logs.values()), list(db.metrics.values())
+    weekly = {}
+    for key, group in grouped(logs, lambda l: (l["client_id"], *l["workout_date"].isocalendar()[:2])).items():
+        weekly[key] = {"total_workouts": len(group),
+                       "completed_workouts": status_counts(group)["completed_workouts"], **timed(group)}
+    monthly = {key: {**status_counts(group), **timed(group)} for key, group in grouped(
+        logs, lambda l: (l["client_id"], l["workout_date"].year * 100 + l["workout_date"].month)).items()}
+    health = {}
+    for key, group in grouped(metrics, lambda m: (m["client_id"], m["record_date"].year,
+                                                  m["record_date"].month)).items():
+        weights = [m["weight_kg"] for m in group if m["weight_kg"] is not None]
+        body_fats = [m["body_fat_percentage"] for m in group if m["body_fat_percentage"] is not None]
+        health[key] = {"metric_count": len(group), "weight_sum": sum(weights), "weight_count": len(weights),
+                       "body_fat_sum": sum(body_fats), "body_fat_count": len(body_fats)}
+    latest = {}
+    for (client_id,), group in grouped(metrics, lambda m: (m["client_id"],)).items():
+        newest = max(group, key=lambda m: (m["record_date"], m["metric_id"]))
+        latest[(client_id,)] = {c: newest[c] for c in latest_health.VALUE_COLUMNS}
+    return {
+        weekly_workouts.TABLE: weekly,
+        monthly_workouts.TABLE: monthly,
+        template_counts.TABLE: {k: status_counts(g) for k, g in grouped(logs, lambda l: (l["workout_id"],)).items()},
+        program_counts.TABLE: {k: status_counts(g) for k, g in
+                               grouped(logs, lambda l: (l["client_id"], l["workout_id"])).items()},
+        monthly_health.TABLE: health,
+        latest_health.TABLE: latest,
+    }
+
+
+def assert_matches_source(db):
+    """Like rollups.drift(): stored rows equal the source, and extra stored rows are all zero."""
+    for table, expected in expected_tables(db).items():
+        stored = {key: values for key, values in db.tables[table].items() if any(values.values())}
+        assert stored == expected, table
+
+
+# ---------------------------------------------------------
+# workout logs
+# ---------------------------------------------------------
+@pytest.fixture
+def db():
+    db = RollupDB()
+    add_logs(db,
+             (1, 10, "2025-12-01", "completed", 45),
+             (1, 10, "2025-12-03", "partial", 20),
+             (1, 11, "2025-12-28", "completed", None),
+             (2, 10, "2025-12-29", "not_started", 30),
+             (2, 12, "2026-01-05", "completed", 60),
+             (3, 12, "2026-01-06", "completed", 50))
+    add_metrics(db,
+                (1, "2025-11-30", Decimal("80.50"), Decimal("20.1")),
+                (1, "2025-12-02", Decimal("79.75"), None),
+                (2, "2025-12-15", None, Decimal("25.0")),
+                (3, "2026-01-01", Decimal("65.00"), Decimal("18.4")))
+    return db
+
+
+def test_inserts_match_source(db):
+    assert_matches_source(db)
+    assert db.bumps["workout_logs"] == 1
+    assert db.bumps["health_metrics"] == 1
+
+
+def test_status_and_duration_updates(db):
+    log_id = next(iter(db.logs))
+    update_log(db, log_id, completion_status="partial")
+    assert_matches_source(db)
+    update_log(db, log_id, completion_status="completed", duration_minutes=None)
+    assert_matches_source(db)
+    update_log(db, log_id, duration_minutes=90)
+    assert_matches_source(db)
+
+
+@pytest.mark.parametrize("dates", [
+    # 2025-W52 -> 2026-W01 inside December, then into January
+    ("2025-12-28", "2025-12-31", "2026-01-05"),
+    # a back-dated log lands in an empty week and month
+    ("2026-01-05", "2025-06-15"),
+])
+def test_log_moves_between_weeks_and_months(db, dates):
+    log_id, = add_logs(db, (4, 11, dates[0], "completed", 35))
+    for date in dates[1:]:
+        update_log(db, log_id, workout_date=datetime.date.fromisoformat(date))
+        assert_matches_source(db)
+
+
+def test_log_moves_between_clients_and_templates(db):
+    log_id = next(iter(db.logs))
+    update_log(db, log_id, client_id=3, workout_id=12)
+    assert_matches_source(db)
+
+
+def test_deletes(db):
+    delete_logs(db, lambda log: log["completion_status"] == "not_started")
+    assert_matches_source(db)
+    delete_logs(db, lambda log: True)
+    assert_matches_source(db)
+    assert all(not any(v.values()) for v in db.tables[template_counts.TABLE].values())
+
+
+# ---------------------------------------------------------
+# health metrics
+# ---------------------------------------------------------
+def test_metric_update_moves_between_months(db):
+    metric_id = next(iter(db.metrics))
+    update_metric(db, metric_id, record_date=datetime.date(2025, 12, 20), weight_kg=Decimal("81.00"))
+    assert_matches_source(db)
+
+
+def test_latest_metric_follows_deletes_and_back_dating(db):
+    first, second = [m for m, row in db.metrics.items() if row["client_id"] == 1]
+    assert db.tables[latest_health.TABLE][(1,)]["metric_id"] == second
+
+    # back-dating the newest reading makes the older one current
+    update_metric(db, second, record_date=datetime.date(2025, 11, 1))
+    assert db.tables[latest_health.TABLE][(1,)]["metric_id"] == first
+    assert_matches_source(db)
+
+    # a same-day reading resolves to the later insert
+    third, = add_metrics(db, (1, "2025-11-30", Decimal("80.00"), None))
+    assert db.tables[latest_health.TABLE][(1,)]["metric_id"] == third
+
+    for metric_id in (third, first, second):
+        delete_metric(db, metric_id)
+        assert_matches_source(db)
+    assert (1,) not in db.tables[latest_health.TABLE]
+
+
+# ---------------------------------------------------------
+# deleting users (system_admin.delete_user)
+# ---------------------------------------------------------
+CLIENT_KEYED = [weekly_workouts.TABLE, monthly_workouts.TABLE, program_counts.TABLE,
+                monthly_health.TABLE, latest_health.TABLE]
+
+
+def test_delete_client(db):
+    # the client's logs leave the rollups before the DELETE ...
+    delete_logs(db, lambda log: log["client_id"] == 2)
+    # ... and the cascade takes their metrics and client-keyed rows
+    db.metrics = {k: m for k, m in db.metrics.items() if m["client_id"] != 2}
+    db.cascade((table, "client_id", {2}) for table in CLIENT_KEYED)
+
+    assert_matches_source(db)
+    # Template_Log_Counts has no client_id: only the deltas fixed it
+    assert db.tables[template_counts.TABLE][(10,)]["total_workouts"] == 2
+
+
+def test_delete_trainer(db):
+    # the trainer's templates 10 and 11 cascade to every client's logs of them
+    templates = {10, 11}
+    delete_logs(db, lambda log: log["workout_id"] in templates)
+    db.cascade((table, "workout_id", templates) for table in (template_counts.TABLE, program_counts.TABLE))
+
+    assert_matches_source(db)
+    # client 1 only had logs of those templates
+    assert not any(v["total_workouts"] for (client_id, _), v in db.tables[monthly_workouts.TABLE].items()
+                   if client_id == 1)
+
+
+# ---------------------------------------------------------
+# rebuild / reconcile locking
+# ---------------------------------------------------------
+class RecordingCursor:
+    rowcount = 0
+
+    def __init__(self, fail_on=None):
+        self.statements = []
+        self.fail_on = fail_on
+
+    def execute(self, sql, params=()):
+        verb = " ".join(sql.split()[:2])
+        self.statements.append(verb)
+        if self.fail_on and verb.startswith(self.fail_on):
+            raise RuntimeError("boom")
+
+    def fetchall(self):
+        return []
+
+
+def test_rebuild_runs_under_table_locks():
+    cursor = RecordingCursor()
+    rollups.rebuild_all(cursor)
+
+    assert cursor.statements[0] == "LOCK TABLES"
+    assert cursor.statements[-2:] == ["COMMIT", "UNLOCK TABLES"]
+    assert cursor.statements.count("DELETE FROM") == len(MAINTAINERS)
+
+
+def test_failed_rebuild_rolls_back_before_unlocking():
+    cursor = RecordingCursor(fail_on="INSERT INTO")
+    with pytest.raises(RuntimeError):
+        rollups.rebuild_all(cursor)
+
+    assert cursor.statements[-2:] == ["ROLLBACK", "UNLOCK TABLES"]
+    assert "COMMIT" not in cursor.statements
+
+
+def test_reconcile_locks_only_to_fix():
+    dry_run = RecordingCursor()
+    rollups.reconcile(dry_run, fix=False)
+    assert "LOCK TABLES" not in dry_run.statements
+
+    fix = RecordingCursor()
+    rollups.reconcile(fix, fix=True)
+    assert fix.statements[0] == "LOCK TABLES"
+    assert fix.statements[-2:] == ["COMMIT", "UNLOCK TABLES"]
@@ -0,0 +1,55 @@
+import re
+
+import pytest
+
+from backend.trainer.trainer_routes import PROGRESS_SORTS, trainer
+
+
+@pytest.fixture
+def client(blueprint_client, fake_db):
+    fake_db.results = lambda sql, params: [{"version": "people=1,workout_logs=1"}] if "Data_Version" in sql else []
+    return blueprint_client(trainer, "/trainer")
+
+
+def order_by(fake_db):
+    sql = next(sql for sql, _ in fake_db.statements if "Trainer_Client" in sql)
+    return re.search(r"ORDER BY (.*?)(?: LIMIT %s)?$", sql).group(1)
+
+
+EXPECTED = {
+    # only the rate can be NULL; those clients go last either way
+    ("completion_rate", "desc"): "completion_rate IS NULL, completion_rate DESC, client_id",
+    ("completion_rate", "asc"): "completion_rate IS NULL, completion_rate ASC, client_id",
+    ("total_workouts", "desc"): "total_workouts DESC, client_id",
+    ("total_workouts", "asc"): "total_workouts ASC, client_id",
+    ("completed", "desc"): "completed DESC, client_id",
+    ("completed", "asc"): "completed ASC, client_id",
+    ("client_id", "desc"): "client_id DESC",
+    ("client_id", "asc"): "client_id ASC",
+}
+
+
+def test_every_sort_is_covered():
+    assert {sort for sort, _ in EXPECTED} == set(PROGRESS_SORTS)
+
+
+@pytest.mark.parametrize("sort, order", sorted(EXPECTED))
+def test_sort_orders_by_bare_aliases(client, fake_db, sort, order):
+    response = client.get(f"/trainer/7/progress?sort={sort}&order={order}")
+
+    assert response.status_code == 200
+    assert order_by(fake_db) == EXPECTED[sort, order]
+
+
+def test_default_sort_and_limit(client, fake_db):
+    response = client.get("/trainer/7/progress?limit=5")
+
+    assert response.status_code == 200
+    assert order_by(fake_db) == EXPECTED["completion_rate", "desc"]
+    assert fake_db.statements[-1][1] == (7, 5)
+
+
+@pytest.mark.parametrize("query", ["sort=first_name", "order=sideways", "limit=0", "limit=x"])
+def test_bad_arguments(client, fake_db, query):
+    assert client.get(f"/trainer/7/progress?{query}").status_code == 400
+    assert not any("Trainer_Client" in sql for sql, _ in fake_db.statements)
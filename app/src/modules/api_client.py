@@ -0,0 +1,96 @@
+# Shared client for the FitFlow API.
+#
+# One requests.Session per Streamlit server process keeps HTTP connections
+# to the API alive between calls and reruns (instead of a new TCP connection
+# per request), applies a connect/read timeout to every call and retries
+# idempotent requests with exponential backoff when the API is briefly
+# unavailable (connection errors, 502/503/504).
+#
+#   from modules import api_client
+#   resp = api_client.get("/client/client_workout_log", params={"client_id": 1})
+#
+# fetch_all() runs the requests of independent page sections concurrently,
+# so a page waits for its slowest call rather than the sum of all of them.
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from urllib3.util.retry import Retry
+
+API_HOST = os.getenv("API_HOST", "http://web-api:4000")
+
+# (connect, read) seconds
+TIMEOUT = (3.05, 30)
+
+RETRY = Retry(
+    total=3,
+    backoff_factor=0.3,            # 0.3s, 0.6s, 1.2s
+    status_forcelist=(502, 503, 504),
+    allowed_methods=frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}),
+    raise_on_status=False,         # hand the last response back to the page
+)
+
+MAX_WORKERS = 8
+
+
+@st.cache_resource
+def session():
+    s = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS * 2, max_retries=RETRY)
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
+    return s
+
+
+@st.cache_resource
+def _executor():
+    return ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="api-client")
+
+
+def url(path):
+    """'/trainer/programs/1' -> 'http://web-api:4000/trainer/programs/1' (full URLs pass through)."""
+    if path.startswith("http://") or path.startswith("https://"):
+        return path
+    return API_HOST + path
+
+
+def request(method, path, **kwargs):
+    kwargs.setdefault("timeout", TIMEOUT)
+    return session().request(method, url(path), **kwargs)
+
+
+def get(path, **kwargs):
+    return request("GET", path, **kwargs)
+
+
+def post(path, **kwargs):
+    return request("POST", path, **kwargs)
+
+
+def put(path, **kwargs):
+    return request("PUT", path, **kwargs)
+
+
+def delete(path, **kwargs):
+    return request("DELETE", path, **kwargs)
+
+
+def fetch_all(calls):
+    """Start every call in `calls` ({name: zero-argument callable}) concurrently.
+
+    Returns {name: Future}; `.result()` waits for that call and re-raises its
+    exception, so each page section can keep its own try/except.
+    """
+    ctx = get_script_run_ctx()
+
+    def run(fn):
+        # lets the call use st.session_state / st.cache_* from the worker thread
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fn()
+
+    return {name: _executor().submit(run, fn) for name, fn in calls.items()}
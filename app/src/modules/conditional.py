@@ -0,0 +1,53 @@
+# Conditional GET helper for the API.
+#
+# Keeps the last body and validators (ETag / Last-Modified) of each URL in
+# st.session_state and sends them back on the next request, so data that
+# has not changed comes back as an empty 304 instead of the full JSON.
+
+from collections import OrderedDict
+
+import streamlit as st
+
+from modules import api_client
+
+MAX_ENTRIES = 64
+
+
+def _store():
+    if "_conditional_get" not in st.session_state:
+        st.session_state["_conditional_get"] = OrderedDict()
+    return st.session_state["_conditional_get"]
+
+
+def get_json(url, params=None):
+    """GET `url` (a path or full URL) and return its decoded JSON body, revalidating the cached copy.
+
+    Raises requests.HTTPError on a non-2xx response, like raise_for_status().
+    """
+    store = _store()
+    key = (url, tuple(sorted((params or {}).items())))
+    cached = store.get(key)
+
+    headers = {}
+    if cached is not None:
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        elif cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    response = api_client.get(url, params=params, headers=headers)
+    if response.status_code == 304 and cached is not None:
+        store.move_to_end(key)
+        return cached["body"]
+
+    response.raise_for_status()
+    body = response.json()
+
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified:
+        store[key] = {"etag": etag, "last_modified": last_modified, "body": body}
+        store.move_to_end(key)
+        while len(store) > MAX_ENTRIES:
+            store.popitem(last=False)
+    return body
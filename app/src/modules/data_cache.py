@@ -0,0 +1,97 @@
+# Cached API reads for the Streamlit pages.
+#
+# Streamlit reruns the whole page script on every click, so without a cache
+# every widget change re-requests every view from the API. cached_get()
+# keeps decoded responses in st.cache_data for `ttl` seconds, keyed by the
+# path, query, current persona (role + client_id) and the generation of each
+# tag the view depends on:
+#
+#   logs = data_cache.cached_get("/client/client_workout_log",
+#                                params={"client_id": cid},
+#                                tags=[f"client:{cid}:logs"])
+#
+# After a write, invalidate(f"client:{cid}:logs") bumps that tag's generation,
+# so exactly the views built on it miss on the next read - in every session
+# of this Streamlit server, not just the one that wrote. Per-session hit/miss
+# counts are shown by debug_sidebar().
+
+import threading
+
+import streamlit as st
+
+from modules.conditional import get_json
+
+DEFAULT_TTL = 60
+
+_loaded = threading.local()
+
+
+@st.cache_resource
+def _generations():
+    # shared by all sessions: {tag: generation}, guarded by the lock
+    return {}, threading.Lock()
+
+
+def _generation(tag):
+    generations, lock = _generations()
+    with lock:
+        return generations.get(tag, 0)
+
+
+def invalidate(*tags):
+    """Drop every cached view that depends on any of `tags`."""
+    generations, lock = _generations()
+    with lock:
+        for tag in tags:
+            generations[tag] = generations.get(tag, 0) + 1
+
+
+def _load(path, params, persona, generations, epoch):
+    # runs only on a cache miss; persona/generations/epoch are part of the key only
+    _loaded.miss = True
+    return get_json(path, params=dict(params) if params else None)
+
+
+_cached_loaders = {}
+
+
+def _loader(ttl):
+    # st.cache_data fixes ttl at decoration time, so keep one loader per ttl
+    if ttl not in _cached_loaders:
+        _cached_loaders[ttl] = st.cache_data(ttl=ttl, show_spinner=False, max_entries=512)(_load)
+    return _cached_loaders[ttl]
+
+
+def _stats():
+    if "_data_cache_stats" not in st.session_state:
+        st.session_state["_data_cache_stats"] = {"hits": 0, "misses": 0}
+    return st.session_state["_data_cache_stats"]
+
+
+def cached_get(path, params=None, tags=(), ttl=DEFAULT_TTL):
+    """GET `path` through the cache; raises requests.HTTPError like get_json()."""
+    persona = (st.session_state.get("role"), st.session_state.get("client_id"))
+    key_params = tuple(sorted((params or {}).items()))
+    generations = tuple((tag, _generation(tag)) for tag in tags)
+
+    # bumped by this session's "Clear cache" button
+    epoch = st.session_state.get("_data_cache_epoch", 0)
+
+    _loaded.miss = False
+    data = _loader(ttl)(path, key_params, persona, generations, epoch)
+
+    stats = _stats()
+    stats["misses" if _loaded.miss else "hits"] += 1
+    return data
+
+
+def debug_sidebar():
+    stats = _stats()
+    lookups = stats["hits"] + stats["misses"]
+    with st.sidebar.expander("🔧 Data cache"):
+        st.write(f"Hits: {stats['hits']}  ·  Misses: {stats['misses']}")
+        st.write(f"Hit rate: {stats['hits'] / lookups:.0%}" if lookups else "Hit rate: –")
+        if st.button("Clear cache", key="_data_cache_clear"):
+            # only this session rereads; other sessions and other cached functions keep theirs
+            st.session_state["_data_cache_epoch"] = st.session_state.get("_data_cache_epoch", 0) + 1
+            st.session_state["_data_cache_stats"] = {"hits": 0, "misses": 0}
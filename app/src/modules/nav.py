@@ -166,6 +166,10 @@ def SideBarLinks(show_home=False):
     # Always show About page
     AboutPageNav()
 
+    # cache hit/miss counters for this session
+    from modules.data_cache import debug_sidebar
+    debug_sidebar()
+
     # Logout button
     if st.session_state.get("authenticated"):
         if st.sidebar.button("Logout"):
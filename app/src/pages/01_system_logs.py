@@ -1,27 +1,43 @@
 import streamlit as st
-import requests
+from modules import api_client
 import logging
 logger = logging.getLogger(__name__)
 
-API_BASE = "http://web-api:4000/system_admin"
+API_BASE = "/system_admin"
+PAGE_SIZE = 100
 
 st.title("System Logs")
 
 action_filter = st.text_input("Filter by action_type (optional): e.g., EXERCISE_FLAGGED")
 
+
+def load_page(url, params=None):
+    # each response holds one page plus a "next" link to the following one
+    response = api_client.get(url, params=params)
+    if response.status_code != 200:
+        st.error("Failed to load logs.")
+        return
+    page = response.json()
+    st.session_state["system_logs_rows"].extend(page["items"])
+    st.session_state["system_logs_next"] = page["next"]
+
+
 if st.button("Load Logs"):
     if action_filter:
         url = f"{API_BASE}/system_logs/{action_filter}"
     else:
         url = f"{API_BASE}/system_logs"
 
-    response = requests.get(url)
+    st.session_state["system_logs_rows"] = []
+    st.session_state["system_logs_next"] = None
+    load_page(url, params={"limit": PAGE_SIZE})
 
-    if response.status_code == 200:
-        logs = response.json()
-        st.dataframe(logs)
-    else:
-        st.error("Failed to load logs.")
+if "system_logs_rows" in st.session_state:
+    if st.session_state.get("system_logs_next") and st.button("Load more"):
+        load_page(st.session_state["system_logs_next"])
+
+    st.caption(f"{len(st.session_state['system_logs_rows'])} logs loaded")
+    st.dataframe(st.session_state["system_logs_rows"])
 
 if st.button("⬅ Back to Admin Home"):
     st.switch_page("pages/00_Sys_Admin_home.py")
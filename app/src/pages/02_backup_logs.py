@@ -1,21 +1,22 @@
 import streamlit as st
-import requests
+from modules import api_client
 import logging
 logger = logging.getLogger(__name__)
 
-API_BASE = "http://web-api:4000/system_admin"
+API_BASE = "/system_admin"
 
 st.title("Backup Logs")
 
-if st.button("View All Backups"):
-    resp = requests.get(f"{API_BASE}/backup_logs")
-    st.dataframe(resp.json())
+if st.button("View Recent Backups"):
+    # newest 100 backups; the response also carries a "next" link for older ones
+    resp = api_client.get(f"{API_BASE}/backup_logs", params={"limit": 100})
+    st.dataframe(resp.json()["items"])
 
 st.write("---")
 st.subheader("Backup Status (Is Backup Due?)")
 
 if st.button("Check Backup Status"):
-    resp = requests.get(f"{API_BASE}/backup_logs/status")
+    resp = api_client.get(f"{API_BASE}/backup_logs/status")
     st.json(resp.json())
 
 if st.button("⬅ Back to Admin Home"):
@@ -1,9 +1,9 @@
 import streamlit as st
-import requests
+from modules import api_client
 import logging
 logger = logging.getLogger(__name__)
 
-API_BASE = "http://web-api:4000/system_admin"
+API_BASE = "/system_admin"
 
 st.title("Create User Account")
 
@@ -22,7 +22,7 @@ if st.button("Create User"):
         "created_by": created_by
     }
 
-    resp = requests.post(f"{API_BASE}/user", json=payload)
+    resp = api_client.post(f"{API_BASE}/user", json=payload)
 
     if resp.status_code == 201:
         st.success("User created!")
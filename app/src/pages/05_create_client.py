@@ -1,9 +1,9 @@
 import streamlit as st
-import requests
+from modules import api_client
 import logging
 logger = logging.getLogger(__name__)
 
-API_BASE = "http://web-api:4000/system_admin"
+API_BASE = "/system_admin"
 
 st.title("Create Client Profile")
 
@@ -24,7 +24,7 @@ if st.button("Create Client"):
         "goals": goals
     }
 
-    resp = requests.post(f"{API_BASE}/client", json=payload)
+    resp = api_client.post(f"{API_BASE}/client", json=payload)
 
     if resp.status_code == 201:
         st.success("Client profile created!")
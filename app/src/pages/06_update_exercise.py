@@ -1,9 +1,9 @@
 import streamlit as st
-import requests
+from modules import api_client
 import logging
 logger = logging.getLogger(__name__)
 
-API_BASE = "http://web-api:4000/system_admin"
+API_BASE = "/system_admin"
 
 st.title("Update Exercise")
 
@@ -19,7 +19,7 @@ if st.button("Update Exercise"):
     if desc: payload["description"] = desc
     if cat: payload["category"] = cat
 
-    resp = requests.put(f"{API_BASE}/exercise/{exercise_id}", json=payload)
+    resp = api_client.put(f"{API_BASE}/exercise/{exercise_id}", json=payload)
 
     if resp.status_code == 200:
         st.success("Exercise updated!")
@@ -1,14 +1,14 @@
 import streamlit as st
-import requests
+from modules import api_client
 
-API_BASE = "http://web-api:4000/system_admin"
+API_BASE = "/system_admin"
 
 st.title("Delete Exercise")
 
 exercise_id = st.number_input("Exercise ID", min_value=1)
 
 if st.button("Delete Exercise"):
-    resp = requests.delete(f"{API_BASE}/exercise/{exercise_id}")
+    resp = api_client.delete(f"{API_BASE}/exercise/{exercise_id}")
 
     try:
         data = resp.json()
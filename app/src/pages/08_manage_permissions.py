@@ -1,9 +1,9 @@
 import streamlit as st
-import requests
+from modules import api_client
 import logging
 logger = logging.getLogger(__name__)
 
-API_BASE = "http://web-api:4000/system_admin"
+API_BASE = "/system_admin"
 
 st.title("Manage Permissions for User Roles")
 
@@ -16,7 +16,7 @@ if st.button("Update Permissions"):
         "new_permissions": new_permissions,
     }
 
-    resp = requests.put(f"{API_BASE}/user/permissions", json=payload)
+    resp = api_client.put(f"{API_BASE}/user/permissions", json=payload)
 
     if resp.status_code == 200:
         st.success(f"Permissions updated for all {role} users.")
@@ -1,5 +1,5 @@
 import streamlit as st
-import requests
+from modules import api_client
 from modules.nav import SideBarLinks
 import logging
 logger = logging.getLogger(__name__)
@@ -10,20 +10,31 @@ SideBarLinks()
 st.title("Average Workout Duration")
 
 with st.form("duration_form"):
-    year = st.text_input("Filter by Year (optional)")
-    week = st.text_input("Filter by Week # (optional)")
+    col1, col2 = st.columns(2)
+    week_from = col1.text_input("From ISO Week, e.g. 2025-W50 (optional)")
+    week_to = col2.text_input("To ISO Week, e.g. 2026-W03 (optional)")
+    client_ids = st.text_input("Client IDs, comma-separated (optional)")
+    fitness_level = st.selectbox("Fitness Level", ["Any", "Beginner", "Intermediate", "Advanced"])
+    limit = st.number_input("Max rows", min_value=1, value=500, step=100)
     submitted = st.form_submit_button("Submit")
 
 if submitted:
-    params = {}
-    if year:
-        params["year"] = year
-    if week:
-        params["week"] = week
+    # filtering happens on the server so only the matching rows are sent
+    params = {"limit": int(limit)}
+    if week_from:
+        params["from"] = week_from
+    if week_to:
+        params["to"] = week_to
+    if client_ids:
+        params["client_ids"] = client_ids
+    if fitness_level != "Any":
+        params["fitness_level"] = fitness_level
 
-    resp = requests.get("http://web-api:4000/health_analyst/avg_duration", params=params)
+    resp = api_client.get("/health_analyst/avg_duration", params=params)
 
     if resp.status_code == 200:
         st.dataframe(resp.json())
+    elif resp.status_code == 400:
+        st.error(resp.json().get("error", "Invalid filter."))
     else:
-        st.error("Error retrieving data.")
\ No newline at end of file
+        st.error("Error retrieving data.")
@@ -1,5 +1,5 @@
 import streamlit as st
-import requests
+from modules import api_client
 from modules.nav import SideBarLinks
 import logging
 logger = logging.getLogger(__name__)
@@ -9,9 +9,17 @@ SideBarLinks()
 
 st.title("Client Background Information")
 
-resp = requests.get("http://web-api:4000/health_analyst/client_info")
-
-if resp.status_code == 200:
-    st.dataframe(resp.json())
+# fetch the client list a page at a time, following the "next" links
+clients = []
+url, params = "/health_analyst/client_info", {"limit": 500}
+while url:
+    resp = api_client.get(url, params=params)
+    if resp.status_code != 200:
+        st.error("Could not fetch client info.")
+        break
+    page = resp.json()
+    clients.extend(page["items"])
+    url = page["next"]
+    params = None
 else:
-    st.error("Could not fetch client info.")
+    st.dataframe(clients)
@@ -1,5 +1,5 @@
 import streamlit as st
-import requests
+from modules import api_client
 from modules.nav import SideBarLinks
 import logging
 logger = logging.getLogger(__name__)
@@ -15,8 +15,8 @@ if st.button("Submit"):
     if not client_id:
         st.warning("Please enter a Client ID.")
     else:
-        url = f"http://web-api:4000/health_analyst/health_progression/{client_id}"
-        resp = requests.get(url)
+        url = f"/health_analyst/health_progression/{client_id}"
+        resp = api_client.get(url)
 
         if resp.status_code == 200:
             st.dataframe(resp.json())
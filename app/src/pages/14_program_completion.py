@@ -1,5 +1,5 @@
 import streamlit as st
-import requests
+from modules import api_client
 from modules.nav import SideBarLinks
 import logging
 logger = logging.getLogger(__name__)
@@ -9,7 +9,7 @@ SideBarLinks()
 
 st.title("Workout Program Completion Rates")
 
-resp = requests.get("http://web-api:4000/health_analyst/completion_rate")
+resp = api_client.get("/health_analyst/completion_rate")
 
 if resp.status_code == 200:
     st.dataframe(resp.json())
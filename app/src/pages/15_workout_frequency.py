@@ -1,5 +1,5 @@
 import streamlit as st
-import requests
+from modules import api_client
 from modules.nav import SideBarLinks
 import logging
 logger = logging.getLogger(__name__)
@@ -9,7 +9,7 @@ SideBarLinks()
 
 st.title("Workout Template Usage Frequency")
 
-resp = requests.get("http://web-api:4000/health_analyst/frequency")
+resp = api_client.get("/health_analyst/frequency")
 
 if resp.status_code == 200:
     st.dataframe(resp.json())
@@ -1,10 +1,10 @@
 import streamlit as st
-import requests
+from modules import api_client, data_cache
 from modules.nav import SideBarLinks
 
 SideBarLinks()
 
-API = "http://web-api:4000/trainer"
+API = "/trainer"
 
 st.title("Create Workout-Specific Exercise")
 
@@ -25,9 +25,11 @@ if submitted:
         "reps": reps,
         "rest_period": rest_period
     }
-    resp = requests.post(f"{API}/create-workout-exercises", json=data)
+    resp = api_client.post(f"{API}/create-workout-exercises", json=data)
 
     if resp.status_code == 201:
+        # the template's exercise list shows up in its clients' programs
+        data_cache.invalidate("templates")
         st.success("Workout-Specific Exercise Created!")
     else:
         st.error(resp.text)
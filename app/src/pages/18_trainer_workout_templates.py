@@ -1,11 +1,13 @@
 import streamlit as st
 import requests
+from modules import api_client, data_cache
 from modules.nav import SideBarLinks
 
 SideBarLinks()
 
-API = "http://web-api:4000/trainer"
+API = "/trainer"
 TRAINER_ID = 1   # mock persona
+TEMPLATES_TAG = f"trainer:{TRAINER_ID}:templates"
 
 st.title("Workout Templates")
 
@@ -29,8 +31,9 @@ if submitted:
         "duration_minutes": duration,
         "difficulty": difficulty
     }
-    resp = requests.post(f"{API}/create-templates/{TRAINER_ID}", json=data)
+    resp = api_client.post(f"{API}/create-templates/{TRAINER_ID}", json=data)
     if resp.status_code == 201:
+        data_cache.invalidate(TEMPLATES_TAG)
         st.success("Template Created!")
     else:
         st.error(resp.text)
@@ -41,9 +44,12 @@ if submitted:
 # ---------------------------------------
 st.subheader("📋 Your Templates")
 
-resp = requests.get(f"{API}/view-all-templates/{TRAINER_ID}")
-if resp.status_code == 200:
-    templates = resp.json()
+try:
+    templates = data_cache.cached_get(f"{API}/view-all-templates/{TRAINER_ID}", tags=[TEMPLATES_TAG])
+except requests.RequestException:
+    templates = None
+
+if templates is not None:
     for t in templates:
         with st.expander(f"{t['name']} (ID: {t['workout_id']})"):
 
@@ -72,9 +78,11 @@ if resp.status_code == 200:
                         "difficulty": new_diff,
                         "duration_minutes": new_dur
                     }
-                    r = requests.put(f"{API}/update-template/{t['template_id']}",
+                    r = api_client.put(f"{API}/update-template/{t['workout_id']}",
                                      json=update_data)
                     if r.status_code == 200:
+                        # client programs show template details too
+                        data_cache.invalidate(TEMPLATES_TAG, "templates")
                         st.success("Updated!")
                         st.rerun()
                     else:
@@ -83,8 +91,9 @@ if resp.status_code == 200:
             # DELETE BUTTON
             with col2:
                 if st.button("❌ Delete", key=f"del_{t['workout_id']}"):
-                    r = requests.delete(f"{API}/delete-template/{t['template_id']}")
+                    r = api_client.delete(f"{API}/delete-template/{t['workout_id']}")
                     if r.status_code == 200:
+                        data_cache.invalidate(TEMPLATES_TAG, "templates")
                         st.success("Template Deleted!")
                         st.rerun()
                     else:
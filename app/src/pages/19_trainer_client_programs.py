@@ -1,10 +1,10 @@
 import streamlit as st
-import requests
+from modules import api_client, data_cache
 from modules.nav import SideBarLinks
 
 SideBarLinks()
 
-API = "http://web-api:4000/trainer"
+API = "/trainer"
 TRAINER_ID = 1
 
 st.title("Client Programs")
@@ -29,9 +29,10 @@ if submitted:
         "name": name,
         "description": description
     }
-    resp = requests.post(f"{API}/client-programs/{TRAINER_ID}", json=data)
+    resp = api_client.post(f"{API}/client-programs/{TRAINER_ID}", json=data)
 
     if resp.status_code == 201:
+        data_cache.invalidate(f"client:{client_id}:program")
         st.success("Assigned!")
     else:
         st.error(resp.text)
@@ -42,7 +43,7 @@ if submitted:
 # ------------------------------------
 st.subheader("📋 Assigned Programs")
 
-resp = requests.get(f"{API}/client-programs/{TRAINER_ID}")
+resp = api_client.get(f"{API}/client-programs/{TRAINER_ID}")
 if resp.status_code == 200:
     programs = resp.json()
 
@@ -63,8 +64,9 @@ if resp.status_code == 200:
 
                 if upd:
                     update_data = {"name": new_name, "description": new_desc}
-                    r = requests.put(f"{API}/client-program/{p['program_id']}", json=update_data)
+                    r = api_client.put(f"{API}/client-program/{p['program_id']}", json=update_data)
                     if r.status_code == 200:
+                        data_cache.invalidate(f"client:{p['client_id']}:program")
                         st.success("Updated!")
                         st.rerun()
                     else:
@@ -73,8 +75,9 @@ if resp.status_code == 200:
             # DELETE
             with col2:
                 if st.button("❌ Remove", key=f"del_{p['program_id']}"):
-                    r = requests.delete(f"{API}/client-program/{p['program_id']}")
+                    r = api_client.delete(f"{API}/client-program/{p['program_id']}")
                     if r.status_code == 200:
+                        data_cache.invalidate(f"client:{p['client_id']}:program")
                         st.success("Program removed!")
                         st.rerun()
                     else:
@@ -1,17 +1,45 @@
 import streamlit as st
-import requests
+from modules import api_client
 from modules.nav import SideBarLinks
 
 SideBarLinks()
 
-API = "http://web-api:4000/trainer"
+API = "/trainer"
+PAGE_SIZE = 25
+FEEDBACK_BATCH = 1000   # log ids per /trainer/feedback request (API maximum)
 
 st.title("Client Workout Logs & Feedback")
 
-resp = requests.get(f"{API}/client-logs")
+# logs are paged newest first; keep what has been loaded so far and
+# only fetch the next page when asked
+if st.button("🔄 Refresh logs"):
+    st.session_state.pop("trainer_logs", None)
+    st.session_state.pop("trainer_logs_next", None)
 
-if resp.status_code == 200:
-    logs = resp.json()
+if "trainer_logs" not in st.session_state:
+    resp = api_client.get(f"{API}/client-logs", params={"limit": PAGE_SIZE})
+    if resp.status_code == 200:
+        page = resp.json()
+        st.session_state["trainer_logs"] = page["items"]
+        st.session_state["trainer_logs_next"] = page["next"]
+
+
+def load_feedback(log_ids):
+    """Feedback for all `log_ids`, grouped by log id, in one request per batch."""
+    grouped = {}
+    for start in range(0, len(log_ids), FEEDBACK_BATCH):
+        batch = log_ids[start:start + FEEDBACK_BATCH]
+        resp = api_client.get(f"{API}/feedback", params={"log_ids": ",".join(map(str, batch))})
+        if resp.status_code == 200:
+            grouped.update(resp.json())
+        else:
+            st.error("Cannot load feedback.")
+    return grouped
+
+
+if "trainer_logs" in st.session_state:
+    logs = st.session_state["trainer_logs"]
+    feedback_by_log = load_feedback([log["log_id"] for log in logs])
 
     for log in logs:
         with st.expander(f"{log['client_id']} — {log['workout_date']}"):
@@ -19,25 +47,22 @@ if resp.status_code == 200:
             st.write(f"Status: **{log['completion_status']}**")
             st.write(f"Duration: {log['duration_minutes']} min")
 
-            # EXISTING FEEDBACK
-            fb_resp = requests.get(f"{API}/getfeedback/{log['log_id']}")
-            if fb_resp.status_code == 200:
-                feedbacks = fb_resp.json()
-                for fb in feedbacks:
-                    st.markdown(f"""
-                        <div style='padding:10px;border-radius:8px;background:#111;border:1px solid #444;margin-bottom:8px'>
-                            <b style='color:#FF1A1A'>Trainer Feedback:</b>
-                            <p style='color:white'>{fb['feedback_text']}</p>
-                        </div>
-                    """, unsafe_allow_html=True)
-
-                    if st.button("🗑 Delete Feedback", key=f"delfb{fb['feedback_id']}"):
-                        r = requests.delete(f"{API}/deletefeedback/{fb['feedback_id']}")
-                        if r.status_code == 200:
-                            st.success("Feedback deleted!")
-                            st.rerun()
-                        else:
-                            st.error(r.text)
+            # EXISTING FEEDBACK (loaded for every log above in one batch)
+            for fb in feedback_by_log.get(str(log["log_id"]), []):
+                st.markdown(f"""
+                    <div style='padding:10px;border-radius:8px;background:#111;border:1px solid #444;margin-bottom:8px'>
+                        <b style='color:#FF1A1A'>Trainer Feedback:</b>
+                        <p style='color:white'>{fb['comment']}</p>
+                    </div>
+                """, unsafe_allow_html=True)
+
+                if st.button("🗑 Delete Feedback", key=f"delfb{fb['feedback_id']}"):
+                    r = api_client.delete(f"{API}/deletefeedback/{fb['feedback_id']}")
+                    if r.status_code == 200:
+                        st.success("Feedback deleted!")
+                        st.rerun()
+                    else:
+                        st.error(r.text)
 
             # ADD NEW FEEDBACK
             st.subheader("Add Feedback:")
@@ -45,14 +70,25 @@ if resp.status_code == 200:
                                     key=f"fbbox{log['log_id']}")
 
             if st.button("Submit Feedback", key=f"submitfb{log['log_id']}"):
-                data = {"log_id": log["log_id"], "trainer_id": 1, "feedback_text": feedback}
-                r = requests.post(f"{API}/createfeedback", json=data)
+                data = {"trainer_id": 1, "comment": feedback}
+                r = api_client.post(f"{API}/createfeedback/{log['log_id']}", json=data)
                 if r.status_code == 201:
                     st.success("Feedback added!")
                     st.rerun()
                 else:
                     st.error(r.text)
 
+    if st.session_state.get("trainer_logs_next"):
+        if st.button("Load more logs"):
+            resp = api_client.get(st.session_state["trainer_logs_next"])
+            if resp.status_code == 200:
+                page = resp.json()
+                st.session_state["trainer_logs"].extend(page["items"])
+                st.session_state["trainer_logs_next"] = page["next"]
+                st.rerun()
+            else:
+                st.error("Cannot load more logs.")
+
 else:
     st.error("Cannot load logs.")
 
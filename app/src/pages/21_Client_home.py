@@ -2,6 +2,7 @@ import logging
 logger = logging.getLogger(__name__)
 import streamlit as st
 import requests
+from modules import data_cache
 import pandas as pd
 from pathlib import Path
 from modules.nav import SideBarLinks
@@ -65,24 +66,22 @@ with col2:
     
     # Fetch quick stats from API
     try:
-        response = requests.get(
-            f"http://web-api:4000/client/client_workout_log",
-            params={"client_id": st.session_state.client_id}
+        logs = data_cache.cached_get(
+            "/client/client_workout_log",
+            params={"client_id": st.session_state.client_id},
+            tags=[f"client:{st.session_state.client_id}:logs"]
         )
-        
-        if response.status_code == 200:
-            logs = response.json()
-            
-            st.metric("Total Workouts Logged", len(logs))
-            
-            if logs:
-                df = pd.DataFrame(logs)
-                avg_duration = df['duration_minutes'].mean()
-                st.metric("Avg Workout Duration", f"{avg_duration:.0f} min")
-            else:
-                st.metric("Avg Workout Duration", "0 min")
+
+        st.metric("Total Workouts Logged", len(logs))
+
+        if logs:
+            df = pd.DataFrame(logs)
+            avg_duration = df['duration_minutes'].mean()
+            st.metric("Avg Workout Duration", f"{avg_duration:.0f} min")
         else:
-            st.warning("Unable to load stats")
+            st.metric("Avg Workout Duration", "0 min")
+    except requests.HTTPError:
+        st.warning("Unable to load stats")
     except:
         st.warning("API connection unavailable")
 
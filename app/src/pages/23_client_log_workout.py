@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+from modules import api_client, data_cache
 import pandas as pd
 from datetime import datetime
 from modules.nav import SideBarLinks
@@ -12,7 +13,8 @@ SideBarLinks()
 if 'client_id' not in st.session_state:
     st.session_state.client_id = 1
 
-BASE_URL = "http://web-api:4000"
+# every view built from this client's logs (home stats, dashboard, list below)
+LOGS_TAG = f"client:{st.session_state.client_id}:logs"
 
 st.markdown(
     """
@@ -140,12 +142,13 @@ with st.form("workout_log_form", clear_on_submit=True):
         }
         
         try:
-            response = requests.post(
-                f"{BASE_URL}/client/client_workout_log",
+            response = api_client.post(
+                "/client/client_workout_log",
                 json=workout_data
             )
             
             if response.status_code == 201:
+                data_cache.invalidate(LOGS_TAG)
                 result = response.json()
                 st.success(f"✅ Workout logged successfully! Log ID: {result.get('log_id')}")
                 st.balloons()
@@ -160,35 +163,35 @@ st.markdown("---")
 st.subheader("📋 Recently Logged Workouts")
 
 try:
-    response = requests.get(
-        f"{BASE_URL}/client/client_workout_log",
-        params={"client_id": st.session_state.client_id}
+    logs = data_cache.cached_get(
+        "/client/client_workout_log",
+        params={"client_id": st.session_state.client_id},
+        tags=[LOGS_TAG]
     )
-    
-    if response.status_code == 200:
-        logs = response.json()
+
+    if logs:
+        df = pd.DataFrame(logs)
+        if 'workout_date' in df.columns:
+            df['workout_date'] = pd.to_datetime(df['workout_date']).dt.strftime('%Y-%m-%d')
+        if 'notes' not in df.columns:
+            df['notes'] = ""
         
-        if logs:
-            df = pd.DataFrame(logs)
-            if 'workout_date' in df.columns:
-                df['workout_date'] = pd.to_datetime(df['workout_date']).dt.strftime('%Y-%m-%d')
-            if 'notes' not in df.columns:
-                df['notes'] = ""
-            
-            st.dataframe(
-                df.head(5)[['workout_date', 'workout_name', 'duration_minutes', 'completion_status', 'notes']],
-                use_container_width=True,
-                hide_index=True,
-                column_config={
-                    "workout_date": "Date",
-                    "workout_name": "Workout",
-                    "duration_minutes": "Duration (min)",
-                    "completion_status": "Status",
-                    "notes": "Notes"
-                }
-            )
-        else:
-            st.info("No workouts logged yet. Log your first workout above!")
+        st.dataframe(
+            df.head(5)[['workout_date', 'workout_name', 'duration_minutes', 'completion_status', 'notes']],
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "workout_date": "Date",
+                "workout_name": "Workout",
+                "duration_minutes": "Duration (min)",
+                "completion_status": "Status",
+                "notes": "Notes"
+            }
+        )
+    else:
+        st.info("No workouts logged yet. Log your first workout above!")
+except requests.HTTPError:
+    st.error("Could not load recent workouts.")
 except Exception as e:
     st.error(f"Error loading recent workouts: {str(e)}")
 
@@ -210,8 +213,8 @@ col1, col2, col3 = st.columns([1, 1, 2])
 with col1:
     if st.button("🗑️ Delete Incomplete Logs", type="secondary", use_container_width=True):
         try:
-            response = requests.delete(
-                f"{BASE_URL}/client/client_workout_log",
+            response = api_client.delete(
+                "/client/client_workout_log",
                 params={"client_id": st.session_state.client_id}
             )
             
@@ -220,6 +223,7 @@ with col1:
                 rows_deleted = result.get('rows_deleted', 0)
                 
                 if rows_deleted > 0:
+                    data_cache.invalidate(LOGS_TAG)
                     st.success(f"✅ Deleted {rows_deleted} incomplete workout log(s)!")
                     st.rerun()
                 else: